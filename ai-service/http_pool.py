@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Pooled keep-alive HTTP clients for the LLM providers.
+Each provider gets one requests.Session whose connections stay open between
+prompts, so only the first call pays the TCP and TLS handshakes. Failed
+connects and 429/5xx responses are retried with exponential backoff, and
+connection and reuse counts are exposed through stats().
+AsyncPooledHTTPClient is the httpx-based counterpart used by the async
+LlamaService methods and by streamed completions; it needs the optional
+httpx package.
+"""
+
+import os
+import asyncio
+import threading
+import contextlib
+from typing import Any, AsyncIterator, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # async callers fall back to worker threads
+    httpx = None
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+# Rate limiting and transient server errors; anything else is returned as is
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Longest wait between two retries, as urllib3's Retry.DEFAULT_BACKOFF_MAX
+BACKOFF_MAX = 120.0
+
+
+class PooledHTTPClient:
+    """requests.Session with a bounded keep-alive pool, timeouts and retries."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 keep_alive: bool = True,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+        # Read errors are not retried: the prompt may already be generating
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def post(self, url: str, read_timeout: Optional[float] = None, **kwargs: Any) -> requests.Response:
+        """POST through the pool; read_timeout overrides the default for this call."""
+        timeout = (self.connect_timeout, self.read_timeout if read_timeout is None else read_timeout)
+        response = self.session.post(url, timeout=timeout, **kwargs)
+        history = getattr(getattr(response.raw, "retries", None), "history", ())
+        with self._lock:
+            self.requests += 1
+            self.retries += len(history)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests, retries, opened connections and the share of requests
+        served on an already open connection."""
+        pools = self._adapter.poolmanager.pools
+        connections = sent = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+                sent += pool.num_requests
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "connections": connections,
+            "reuse_ratio": round(1 - connections / sent, 3) if sent else 0.0,
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncPooledHTTPClient:
+    """httpx.AsyncClient with the pool, timeouts and retry policy of PooledHTTPClient."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 keep_alive: bool = True,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF,
+                 verify: Any = True):
+        if httpx is None:
+            raise ImportError("httpx is not installed. Run: pip install httpx")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = retries
+        self.backoff = backoff
+        self.requests = 0
+        self.retries = 0
+        self.connections = 0
+        # httpx takes TLS verification (True or a CA bundle path) per client
+        self.client = httpx.AsyncClient(verify=verify, limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size if keep_alive else 0,
+        ))
+
+    async def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            self.connections += 1
+
+    def _retry_delay(self, attempt: int, response: Optional["httpx.Response"]) -> float:
+        """Retry-After when the server sent one, else urllib3's exponential backoff."""
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            return min(BACKOFF_MAX, float(retry_after))
+        return min(BACKOFF_MAX, self.backoff * 2 ** attempt) if attempt else 0.0
+
+    async def post(self, url: str, read_timeout: Optional[float] = None, **kwargs: Any) -> "httpx.Response":
+        """POST through the pool; read_timeout overrides the default for this call.
+        
+        Like the sync client, failed connects and RETRY_STATUSES responses are
+        retried, read timeouts are raised, and the last response is returned.
+        """
+        timeout = httpx.Timeout(self.read_timeout if read_timeout is None else read_timeout,
+                                connect=self.connect_timeout)
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self.client.post(url, timeout=timeout, extensions={"trace": self._trace}, **kwargs)
+            except httpx.ConnectError:
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    self.requests += 1
+                    return response
+            self.retries += 1
+            await asyncio.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    @contextlib.asynccontextmanager
+    async def stream_post(self, url: str, read_timeout: Optional[float] = None,
+                          **kwargs: Any) -> AsyncIterator["httpx.Response"]:
+        """POST through the pool and yield the response before its body is read.
+        
+        Failed connects and RETRY_STATUSES responses are retried as in post();
+        once a response is yielded nothing is retried, since its body may
+        already have been consumed. The response is closed on exit.
+        """
+        timeout = httpx.Timeout(self.read_timeout if read_timeout is None else read_timeout,
+                                connect=self.connect_timeout)
+        request = self.client.build_request("POST", url, timeout=timeout, extensions={"trace": self._trace}, **kwargs)
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self.client.send(request, stream=True)
+            except httpx.ConnectError:
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    break
+                await response.aclose()
+            self.retries += 1
+            await asyncio.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+        
+        self.requests += 1
+        try:
+            yield response
+        finally:
+            await response.aclose()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Same fields as PooledHTTPClient.stats()."""
+        sent = self.requests + self.retries
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "connections": self.connections,
+            "reuse_ratio": round(1 - self.connections / sent, 3) if sent else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def _options_from_env() -> Dict[str, Any]:
+    return {
+        "pool_size": int(os.getenv("LLM_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        "keep_alive": os.getenv("LLM_HTTP_KEEP_ALIVE", "1").lower() not in ("0", "false", "no"),
+        "connect_timeout": float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)),
+        "read_timeout": float(os.getenv("LLM_HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)),
+        "retries": int(os.getenv("LLM_HTTP_RETRIES", DEFAULT_RETRIES)),
+        "backoff": float(os.getenv("LLM_HTTP_BACKOFF", DEFAULT_BACKOFF)),
+    }
+
+
+def http_client_from_env() -> PooledHTTPClient:
+    """Client configured from LLM_HTTP_POOL_SIZE, LLM_HTTP_KEEP_ALIVE,
+    LLM_HTTP_CONNECT_TIMEOUT, LLM_HTTP_READ_TIMEOUT, LLM_HTTP_RETRIES and
+    LLM_HTTP_BACKOFF."""
+    return PooledHTTPClient(**_options_from_env())
+
+
+def async_http_client_from_env() -> Optional[AsyncPooledHTTPClient]:
+    """AsyncPooledHTTPClient configured like http_client_from_env, or None
+    without httpx."""
+    if httpx is None:
+        return None
+    return AsyncPooledHTTPClient(**_options_from_env())
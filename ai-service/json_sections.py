@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Incremental parsing of a streamed JSON object.
+JSONSectionParser is fed the text of an LLM response as it arrives and
+returns each top-level member of the object ("contact_info", "skills", ...)
+as soon as its value closes, so callers can forward sections long before the
+response is complete. Text before the opening brace (a "```json" fence,
+a sentence) is skipped; members whose value does not parse are dropped and
+left to the parse of the complete response.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class JSONSectionParser:
+    """Emits (key, value) for each top-level member of a streamed JSON object."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Add text to the buffer and return the members completed by it."""
+        self.buffer += text
+        sections: List[Tuple[str, Any]] = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            if self.done:
+                break
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = self._decode(buffer[self._key_start:i + 1])
+                        self._key_start = None
+                continue
+
+            if self._depth == 0:
+                # Anything before the object starts is not JSON
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = i
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_member(buffer, i, sections)
+                    self.done = True
+            elif char == ":" and self._depth == 1 and self._value_start is None:
+                self._value_start = i + 1
+            elif char == "," and self._depth == 1:
+                self._close_member(buffer, i, sections)
+        self._pos = len(buffer)
+        return sections
+
+    def _close_member(self, buffer: str, end: int, sections: List[Tuple[str, Any]]) -> None:
+        if self._key is not None and self._value_start is not None:
+            value = self._decode(buffer[self._value_start:end])
+            if value is not None:
+                sections.append((self._key, value))
+        self._key = None
+        self._value_start = None
+
+    @staticmethod
+    def _decode(text: str) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
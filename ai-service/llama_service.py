@@ -1,9 +1,13 @@
 import os
 import json
 import re
-import torch
-import requests
-from typing import List, Dict, Any, Optional
+import time
+import asyncio
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,8 +16,92 @@ load_dotenv()
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 from cv_extractor_cli import CVExtractor
+import cv_patterns as patterns
+from http_pool import http_client_from_env, async_http_client_from_env
+from llm_cache import LLMResponseCache, llm_cache_from_env, translation_memo_from_env
+from json_sections import JSONSectionParser
+from provider_router import router_from_env
+from singleflight import SingleFlight
+from micro_batcher import batcher_from_env
+from prefix_cache import PrefixKVCache
+from tolerant_json import parse_first_json
+
+LOCAL_MODEL = "huggyllama/llama-7b"
+PROBE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "provider_probe.json")
+DEFAULT_REPROBE_SECONDS = 900
+DEFAULT_PROBE_WAIT_SECONDS = 30
+# Long CVs are structured in chunks of about this many prompt tokens
+DEFAULT_STRUCTURE_CHUNK_TOKENS = 1500
+DEFAULT_STRUCTURE_CONCURRENCY = 4
+# Rough size of a token in CV text, used to budget chunks without a tokenizer
+CHARS_PER_TOKEN = 4
+TOGETHER_SYSTEM_PROMPT = "You are a helpful assistant that provides job recommendations based on CV data. Always respond with valid JSON format."
+# Fixed start of every CV structuring prompt; the local provider keeps its
+# key/value cache instead of encoding it for each CV
+CV_STRUCTURING_INSTRUCTIONS = """You are an expert CV parser. Your task is to extract and structure EVERY SINGLE piece of information from the CV text below into a JSON format. NOTHING should be omitted, summarized, or discarded.
+
+CRITICAL REQUIREMENTS:
+- Extract 100% of the content - every word, every detail, every piece of information
+- If content doesn't fit perfectly into a category, still include it in the most appropriate section
+- Preserve exact wording, dates, names, and all details
+- Include all bullet points, descriptions, and additional information
+- Extract the candidate's name and include it in contact_info or professional_summary
+
+STRUCTURE THE CONTENT INTO THESE SECTIONS:
+
+1. contact_info: 
+   - emails: [array of all email addresses found]
+   - phones: [array of all phone numbers found] 
+   - linkedin: [LinkedIn URL if present]
+   - address: [full address if present]
+   - name: [candidate's full name - extract from anywhere in the text]
+
+2. professional_summary: [array of all summary/profile text - include everything that describes the candidate]
+
+3. skills: [array of ALL skills, technologies, tools, competencies mentioned - extract every single one]
+
+4. languages: [array of objects with "language" and "level" - include all languages mentioned]
+
+5. education: [array of education entries with ALL details including:
+   - date_range: [exact dates as written]
+   - degree: [full degree name]
+   - institution: [full institution name]
+   - details: [array of ALL additional details, coursework, achievements, descriptions]
+   - location: [if mentioned]]
+
+6. experience: [array of work experience with ALL details including:
+   - date_range: [exact dates as written]
+   - company: [full company name]
+   - role: [full job title/role]
+   - details: [array of ALL job descriptions, responsibilities, achievements]
+   - location: [if mentioned]]
+
+7. projects: [array of ALL projects, activities, achievements with:
+   - title: [project/activity name]
+   - description: [full description including all details]]
+
+8. additional_info: [array of any other information that doesn't fit above categories - include everything else]
+
+FORMAT REQUIREMENTS:
+- For contact_info: {"emails": ["email1", "email2"], "phones": ["phone1", "phone2"], "linkedin": "url", "address": "address", "name": "Full Name"}
+- For languages: [{"language": "Language Name", "level": "Proficiency Level"}]
+- For education/experience: Include ALL details in the "details" array - don't summarize
+- For projects: Include full descriptions, don't abbreviate
+- Return ONLY valid JSON, no explanations
+
+"""
+# Turn markers of the local model's prompt format
+LOCAL_PROMPT_START = "### Human: "
+LOCAL_PROMPT_END = "\n### Assistant:"
 
 class LlamaService:
+    # Sampling parameters sent to each provider; part of the response cache key
+    SAMPLING = {
+        "together": {"max_tokens": 1000, "temperature": 0.7, "top_p": 0.9},
+        "huggingface": {"max_new_tokens": 512, "temperature": 0.7, "do_sample": True},
+        "local": {"max_new_tokens": 512, "temperature": 0.7, "do_sample": True},
+    }
+    
     def __init__(self):
         # Together AI Configuration
         self.together_api_key = os.getenv("TOGETHER_API_KEY", "5752d15c55df315184a82fdca124ecbad6e08be30ca5bb5bd578e68a95426a49")
@@ -24,15 +112,174 @@ class LlamaService:
         self.hf_api_key = os.getenv("HF_API_KEY", "")
         self.hf_model = os.getenv("HF_MODEL", "tiiuae/falcon-7b-instruct")
         
-        # Local LLaMA Configuration
+        # Local LLaMA Configuration; the device is detected (importing torch)
+        # only when the local model is considered, unless LLM_DEVICE sets it
         self.local_pipeline = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = os.getenv("LLM_DEVICE") or None
+        # Concurrent local prompts are generated together in padded batches
+        self.local_batcher = batcher_from_env(self._run_local_batch)
+        # Key/value cache of the structuring instructions, built on first use
+        # (LLM_LOCAL_PREFIX_CACHE=0 disables it)
+        self.local_prefix_cache: Optional[PrefixKVCache] = None
+        self.local_prefix_cache_enabled = os.getenv("LLM_LOCAL_PREFIX_CACHE", "1") != "0"
+        
+        # One keep-alive connection pool per HTTP provider
+        self.http = {
+            "together": http_client_from_env(),
+            "huggingface": http_client_from_env(),
+        }
+        # Async counterparts, created on first use inside the event loop
+        self.async_http: Dict[str, Any] = {}
+        
+        # Routes each call to the healthiest provider; configured by the probe
+        self.router = router_from_env()
+        # Identical prompts generated concurrently share one provider call
+        self.inflight = SingleFlight()
         
-        # Initialize the best available provider
-        self.provider = self._initialize_provider()
+        # Persistent cache of provider responses (None when disabled)
+        self.response_cache = llm_cache_from_env()
+        # French translations of recommendation texts, keyed by source string
+        self.translation_memo = translation_memo_from_env()
+        
+        # Chunked structuring of long CVs (LLM_STRUCTURE_CHUNK_TOKENS=0 disables it)
+        self.structure_chunk_tokens = int(os.getenv("LLM_STRUCTURE_CHUNK_TOKENS", DEFAULT_STRUCTURE_CHUNK_TOKENS))
+        self.structure_concurrency = max(1, int(os.getenv("LLM_STRUCTURE_CONCURRENCY", DEFAULT_STRUCTURE_CONCURRENCY)))
         
         # Initialize CVExtractor for fallback
         self.cv_extractor = CVExtractor()
+        
+        # Provider selection runs in a background probe; until it finishes the
+        # service reports the CLI parser and calls wait for the probe
+        self.reprobe_seconds = float(os.getenv("LLM_PROVIDER_REPROBE_SECONDS", DEFAULT_REPROBE_SECONDS))
+        self.probe_wait_seconds = float(os.getenv("LLM_PROVIDER_PROBE_WAIT_SECONDS", DEFAULT_PROBE_WAIT_SECONDS))
+        self.probe_cache_path = os.getenv("LLM_PROVIDER_PROBE_CACHE", PROBE_CACHE_PATH)
+        self._provider = "cli"
+        self._probed_at = 0.0
+        self._probe_thread: Optional[threading.Thread] = None
+        self._probe_lock = threading.Lock()
+        self._probe_done = threading.Event()
+        
+        cached = self._load_probe_result()
+        if cached is not None:
+            self._provider, self._probed_at = cached
+            self.router.configure(self._routable_providers(self._provider))
+            self._probe_done.set()
+            print(f"✓ Using cached provider probe result: {self._provider}")
+        else:
+            self.start_provider_probe()
+    
+    @property
+    def provider(self) -> str:
+        """Current provider; waits for the first probe while it is running.
+        
+        A probe older than reprobe_seconds starts a new one in the background
+        and the current provider is kept until it finishes.
+        """
+        if not self._probe_done.is_set():
+            self._probe_done.wait(self.probe_wait_seconds)
+        elif time.time() - self._probed_at > self.reprobe_seconds:
+            self.start_provider_probe()
+        return self._provider
+    
+    async def wait_for_provider_async(self) -> str:
+        """provider, waiting for the first probe in a worker thread so the
+        event loop is not blocked."""
+        if not self._probe_done.is_set():
+            await asyncio.to_thread(self._probe_done.wait, self.probe_wait_seconds)
+        return self.provider
+    
+    def provider_status(self) -> Dict[str, Any]:
+        """Current provider and probe state, without waiting."""
+        return {
+            "provider": self._provider,
+            "probing": self._probe_thread is not None,
+            "probed_at": self._probed_at or None,
+        }
+    
+    def start_provider_probe(self) -> bool:
+        """Probe the providers in a background thread unless a probe is running.
+        
+        Returns True when a new probe was started.
+        """
+        with self._probe_lock:
+            if self._probe_thread is not None:
+                return False
+            self._probe_thread = threading.Thread(target=self._run_provider_probe, name="llm-provider-probe", daemon=True)
+            self._probe_thread.start()
+            return True
+    
+    def _run_provider_probe(self) -> None:
+        try:
+            provider = self._initialize_provider()
+        except Exception as e:
+            print(f"⚠️  Provider probe failed: {e}")
+            provider = "cli"
+        self._provider = provider
+        self.router.configure(self._routable_providers(provider))
+        self._probed_at = time.time()
+        self._save_probe_result(provider)
+        self._probe_done.set()
+        with self._probe_lock:
+            self._probe_thread = None
+    
+    def _routable_providers(self, provider: str) -> List[str]:
+        """Providers the router may use, the probed one first: the HTTP
+        providers with an API key, and the local model once loaded."""
+        if provider == "cli":
+            return []
+        providers = [provider]
+        if self.together_api_key not in ("", "your_together_api_key_here") and provider != "together":
+            providers.append("together")
+        if self.hf_api_key not in ("", "hf_your_hf_api_key_here") and provider != "huggingface":
+            providers.append("huggingface")
+        if self.local_pipeline is not None and provider != "local":
+            providers.append("local")
+        return providers
+    
+    def _probe_key(self) -> str:
+        """Identifies the provider configuration a probe result applies to."""
+        config = [self.together_api_url, self.together_model, self.together_api_key,
+                  self.hf_model, self.hf_api_key, os.getenv("LLM_DEVICE", "")]
+        return hashlib.sha256(json.dumps(config).encode("utf-8")).hexdigest()[:16]
+    
+    def _load_probe_result(self) -> Optional[tuple]:
+        """(provider, probed_at) of a recent probe with the same configuration.
+        
+        A "local" result is never reused: the model has to be loaded by a probe.
+        """
+        if not self.probe_cache_path:
+            return None
+        try:
+            with open(self.probe_cache_path, "r", encoding="utf-8") as f:
+                entry = json.load(f).get(self._probe_key())
+        except (OSError, ValueError, AttributeError):
+            return None
+        if not entry or entry.get("provider") not in ("together", "huggingface", "cli"):
+            return None
+        if time.time() - entry.get("probed_at", 0) > self.reprobe_seconds:
+            return None
+        return entry["provider"], entry["probed_at"]
+    
+    def _save_probe_result(self, provider: str) -> None:
+        """Record the probe result for other workers and restarts."""
+        if not self.probe_cache_path:
+            return
+        try:
+            with open(self.probe_cache_path, "r", encoding="utf-8") as f:
+                results = json.load(f)
+        except (OSError, ValueError):
+            results = {}
+        results[self._probe_key()] = {"provider": provider, "probed_at": self._probed_at}
+        
+        try:
+            directory = os.path.dirname(self.probe_cache_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".probe-", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(results, f)
+            os.replace(tmp_path, self.probe_cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not save provider probe result: {e}")
     
     def _initialize_provider(self) -> str:
         """Initialize the best available LLaMA provider."""
@@ -57,9 +304,10 @@ class LlamaService:
                 print(f"⚠️  Hugging Face API failed: {e}")
         
         # Try local HuggyLLaMA if GPU is available
-        if self.device == "cuda":
+        if self._detect_device() == "cuda":
             try:
-                self._initialize_local_llama()
+                if self.local_pipeline is None:
+                    self._initialize_local_llama()
                 print("✓ Using local HuggyLLaMA on GPU")
                 return "local"
             except Exception as e:
@@ -69,6 +317,17 @@ class LlamaService:
         print("⚠️  Using CLI parser fallback (no API key or GPU available)")
         return "cli"
     
+    def _detect_device(self) -> str:
+        """Detect "cuda" or "cpu". Imports torch, so it only runs once both
+        HTTP providers have failed."""
+        if self.device is None:
+            try:
+                import torch
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            except ImportError:
+                self.device = "cpu"
+        return self.device
+    
     def _test_together_connection(self):
         """Test Together AI API connection."""
         headers = {
@@ -80,11 +339,11 @@ class LlamaService:
             "messages": [{"role": "user", "content": "test"}],
             "max_tokens": 10
         }
-        response = requests.post(
+        response = self.http["together"].post(
             self.together_api_url,
             headers=headers,
             json=payload,
-            timeout=10
+            read_timeout=10
         )
         if response.status_code != 200:
             raise Exception(f"Together AI test failed: {response.status_code} - {response.text}")
@@ -92,11 +351,11 @@ class LlamaService:
     def _test_hf_connection(self):
         """Test Hugging Face API connection."""
         headers = {"Authorization": f"Bearer {self.hf_api_key}"}
-        response = requests.post(
+        response = self.http["huggingface"].post(
             f"https://api-inference.huggingface.co/models/{self.hf_model}",
             headers=headers,
             json={"inputs": "test", "parameters": {"max_new_tokens": 10}},
-            timeout=10
+            read_timeout=10
         )
         if response.status_code != 200:
             raise Exception(f"HF API test failed: {response.status_code}")
@@ -104,15 +363,19 @@ class LlamaService:
     def _initialize_local_llama(self):
         """Initialize local HuggyLLaMA model."""
         try:
+            import torch
             from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
             
-            model_name = "huggyllama/llama-7b"
+            model_name = LOCAL_MODEL
             print(f"Loading {model_name} locally...")
             
             # Load tokenizer
             tokenizer = AutoTokenizer.from_pretrained(model_name)
             if tokenizer.pad_token is None:
                 tokenizer.pad_token = tokenizer.eos_token
+            # Batched generation pads on the left so every prompt ends where
+            # its continuation starts
+            tokenizer.padding_side = "left"
             
             # Load model with memory optimization
             model = AutoModelForCausalLM.from_pretrained(
@@ -140,8 +403,8 @@ class LlamaService:
         except Exception as e:
             raise Exception(f"Failed to load local LLaMA: {e}")
     
-    def _call_together_api(self, prompt: str) -> str:
-        """Call Together AI API."""
+    def _together_request(self, prompt: str) -> Dict[str, Any]:
+        """Headers and payload of a Together AI chat completion."""
         headers = {
             "Authorization": f"Bearer {self.together_api_key}",
             "Content-Type": "application/json"
@@ -152,25 +415,19 @@ class LlamaService:
             "messages": [
                 {
                     "role": "system",
-                    "content": "You are a helpful assistant that provides job recommendations based on CV data. Always respond with valid JSON format."
+                    "content": TOGETHER_SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
                     "content": prompt
                 }
             ],
-            "max_tokens": 1000,
-            "temperature": 0.7,
-            "top_p": 0.9
+            **self.SAMPLING["together"]
         }
-        
-        response = requests.post(
-            self.together_api_url,
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        
+        return {"headers": headers, "json": payload}
+    
+    def _read_together_response(self, response) -> str:
+        """Completion text of a Together AI response (requests or httpx)."""
         if response.status_code != 200:
             raise Exception(f"Together AI error: {response.status_code} - {response.text}")
         
@@ -179,28 +436,27 @@ class LlamaService:
             return result["choices"][0]["message"]["content"]
         else:
             raise Exception(f"Unexpected Together AI response: {result}")
+    
+    def _call_together_api(self, prompt: str) -> str:
+        """Call Together AI API."""
+        response = self.http["together"].post(self.together_api_url, **self._together_request(prompt))
+        return self._read_together_response(response)
 
-    def _call_huggingface_api(self, prompt: str) -> str:
-        """Call Hugging Face Inference API."""
+    def _huggingface_request(self, prompt: str) -> Dict[str, Any]:
+        """Headers and payload of a Hugging Face Inference API call."""
         headers = {"Authorization": f"Bearer {self.hf_api_key}"}
         
         payload = {
             "inputs": prompt,
             "parameters": {
-                "max_new_tokens": 512,
-                "temperature": 0.7,
-                "do_sample": True,
+                **self.SAMPLING["huggingface"],
                 "return_full_text": False
             }
         }
-        
-        response = requests.post(
-            f"https://api-inference.huggingface.co/models/{self.hf_model}",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        
+        return {"headers": headers, "json": payload}
+    
+    def _read_huggingface_response(self, response) -> str:
+        """Generated text of a Hugging Face response (requests or httpx)."""
         if response.status_code != 200:
             raise Exception(f"HF API error: {response.status_code} - {response.text}")
         
@@ -210,92 +466,325 @@ class LlamaService:
         else:
             raise Exception(f"Unexpected HF API response: {result}")
     
+    def _call_huggingface_api(self, prompt: str) -> str:
+        """Call Hugging Face Inference API."""
+        response = self.http["huggingface"].post(
+            f"https://api-inference.huggingface.co/models/{self.hf_model}",
+            **self._huggingface_request(prompt)
+        )
+        return self._read_huggingface_response(response)
+    
     def _call_local_llama(self, prompt: str) -> str:
-        """Call local HuggyLLaMA model."""
+        """Call local HuggyLLaMA model. Prompts submitted concurrently are
+        generated in one batch (LLM_LOCAL_BATCH_SIZE, LLM_LOCAL_BATCH_WAIT_MS)."""
+        if not self.local_pipeline:
+            raise Exception("Local LLaMA pipeline not initialized")
+        return self.local_batcher.submit(prompt)
+    
+    def _run_local_batch(self, prompts: List[str]) -> List[Any]:
+        """Generate the responses of prompts; a prompt without output gets an
+        exception instead of a response.
+        
+        Prompts starting with the structuring instructions are generated
+        together from their cached prefill; the others in one padded pipeline call.
+        """
         if not self.local_pipeline:
             raise Exception("Local LLaMA pipeline not initialized")
         
-        # Format prompt for LLaMA
-        formatted_prompt = f"### Human: {prompt}\n### Assistant:"
+        # Format prompts for LLaMA
+        formatted_prompts = [f"{LOCAL_PROMPT_START}{prompt}{LOCAL_PROMPT_END}" for prompt in prompts]
+        sampling = dict(self.SAMPLING["local"], pad_token_id=self.local_pipeline.tokenizer.eos_token_id)
+        responses: List[Any] = [None] * len(prompts)
+        
+        prefix_cache = self._local_prefix_cache()
+        if prefix_cache is not None:
+            try:
+                for i, response in enumerate(prefix_cache.generate_batch(formatted_prompts, **sampling)):
+                    if response is not None:
+                        responses[i] = response.strip()
+            except Exception as e:
+                # Left to the pipeline
+                print(f"⚠️  Local prefix cache disabled: {e}")
+                self.local_prefix_cache_enabled = False
+                self.local_prefix_cache = None
+        
+        pending = [i for i, response in enumerate(responses) if response is None]
+        if not pending:
+            return responses
         
-        # Generate response
-        result = self.local_pipeline(
-            formatted_prompt,
-            max_new_tokens=512,
-            temperature=0.7,
-            do_sample=True,
-            pad_token_id=self.local_pipeline.tokenizer.eos_token_id
+        # Generate the remaining responses in one batch
+        results = self.local_pipeline(
+            [formatted_prompts[i] for i in pending],
+            batch_size=len(pending),
+            **sampling
         )
         
-        if isinstance(result, list) and len(result) > 0:
-            generated_text = result[0].get("generated_text", "")
-            # Extract only the assistant's response
-            if "### Assistant:" in generated_text:
-                return generated_text.split("### Assistant:")[-1].strip()
-            return generated_text.strip()
-        else:
-            raise Exception("No response generated from local LLaMA")
+        for i, result in zip(pending, results):
+            if isinstance(result, list) and len(result) > 0:
+                generated_text = result[0].get("generated_text", "")
+                # Extract only the assistant's response
+                if "### Assistant:" in generated_text:
+                    responses[i] = generated_text.split("### Assistant:")[-1].strip()
+                else:
+                    responses[i] = generated_text.strip()
+            else:
+                responses[i] = Exception("No response generated from local LLaMA")
+        return responses
+    
+    def _local_prefix_cache(self) -> Optional[PrefixKVCache]:
+        """Prefix cache of the local model, or None when disabled or the
+        pipeline exposes no model."""
+        if self.local_prefix_cache is None and self.local_prefix_cache_enabled:
+            model = getattr(self.local_pipeline, "model", None)
+            if model is not None:
+                self.local_prefix_cache = PrefixKVCache(
+                    model, self.local_pipeline.tokenizer, [LOCAL_PROMPT_START + CV_STRUCTURING_INSTRUCTIONS]
+                )
+        return self.local_prefix_cache
+    
+    def _response_cache_key(self, prompt: str, provider: str) -> Optional[str]:
+        """Cache key of prompt for provider, or None when not cached."""
+        if self.response_cache is None or provider not in self.SAMPLING:
+            return None
+        model = {"together": self.together_model, "huggingface": self.hf_model}.get(provider, LOCAL_MODEL)
+        params = dict(self.SAMPLING[provider])
+        if provider == "together":
+            params["system"] = TOGETHER_SYSTEM_PROMPT
+        return self.response_cache.key(provider, model, params, prompt)
+    
+    def _preferred_provider(self) -> str:
+        """Provider the router would call first."""
+        order = self.router.order()
+        return order[0] if order else self.provider
+    
+    def _cache_response(self, prompt: str, provider: str, response: str) -> None:
+        cache_key = self._response_cache_key(prompt, provider)
+        if cache_key is not None:
+            self.response_cache.put(cache_key, response)
+    
+    def generate_llama_content(self, prompt: str, use_cache: bool = True) -> str:
+        """Generate content using the best available LLaMA provider.
+        
+        Responses are served from and stored in the response cache unless
+        use_cache is False. Concurrent calls with the same prompt share a
+        single provider call.
+        """
+        cache_key = self._response_cache_key(prompt, self._preferred_provider()) if use_cache else None
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        def generate() -> str:
+            provider, response = self._generate(prompt)
+            if use_cache:
+                self._cache_response(prompt, provider, response)
+            return response
+        
+        return self.inflight.do(self._inflight_key(prompt), generate)
     
-    def generate_llama_content(self, prompt: str) -> str:
-        """Generate content using the best available LLaMA provider."""
-        if self.provider == "together":
+    def _inflight_key(self, prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    
+    def _generate(self, prompt: str) -> Tuple[str, str]:
+        """Call the healthiest provider, moving on to the next one when a call
+        fails. Returns the provider that answered and its response."""
+        errors = []
+        for provider in self.router.order():
+            if not self.router.acquire(provider):
+                continue
+            start = time.perf_counter()
+            try:
+                response = self._call_provider(provider, prompt)
+            except Exception as e:
+                self.router.record(provider, time.perf_counter() - start, False)
+                print(f"⚠️  {provider} call failed: {e}")
+                errors.append(f"{provider}: {e}")
+                continue
+            self.router.record(provider, time.perf_counter() - start, True)
+            return provider, response
+        
+        self.router.record_fallback()
+        raise Exception("No LLaMA provider available" + (f" ({'; '.join(errors)})" if errors else ""))
+    
+    def _call_provider(self, provider: str, prompt: str) -> str:
+        if provider == "together":
             return self._call_together_api(prompt)
-        elif self.provider == "huggingface":
+        elif provider == "huggingface":
             return self._call_huggingface_api(prompt)
-        elif self.provider == "local":
+        elif provider == "local":
             return self._call_local_llama(prompt)
         else:
             raise Exception("No LLaMA provider available")
     
-    def _repair_json(self, json_str: str) -> str:
+    def _async_client(self, provider: str):
+        """Async HTTP client of provider, or None when httpx is missing."""
+        if provider not in self.async_http:
+            self.async_http[provider] = async_http_client_from_env()
+        return self.async_http[provider]
+    
+    async def generate_llama_content_async(self, prompt: str, use_cache: bool = True) -> str:
+        """Awaitable generate_llama_content.
+        
+        HTTP providers are called through the async client so the event loop
+        keeps serving other requests; the local model, and every provider
+        when httpx is not installed, runs in a worker thread.
         """
-        Attempt to repair malformed JSON from LLaMA responses.
-        Handles common issues like trailing commas, missing brackets, etc.
+        await self.wait_for_provider_async()
+        cache_key = self._response_cache_key(prompt, self._preferred_provider()) if use_cache else None
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        async def generate() -> str:
+            provider, response = await self._generate_async(prompt)
+            if use_cache:
+                self._cache_response(prompt, provider, response)
+            return response
+        
+        return await self.inflight.do_async(self._inflight_key(prompt), generate)
+    
+    async def _generate_async(self, prompt: str) -> Tuple[str, str]:
+        """_generate without blocking the event loop."""
+        errors = []
+        for provider in self.router.order():
+            if not self.router.acquire(provider):
+                continue
+            start = time.perf_counter()
+            try:
+                response = await self._call_provider_async(provider, prompt)
+            except Exception as e:
+                self.router.record(provider, time.perf_counter() - start, False)
+                print(f"⚠️  {provider} call failed: {e}")
+                errors.append(f"{provider}: {e}")
+                continue
+            self.router.record(provider, time.perf_counter() - start, True)
+            return provider, response
+        
+        self.router.record_fallback()
+        raise Exception("No LLaMA provider available" + (f" ({'; '.join(errors)})" if errors else ""))
+    
+    async def _call_provider_async(self, provider: str, prompt: str) -> str:
+        client = self._async_client(provider) if provider in self.http else None
+        if client is None:
+            return await asyncio.to_thread(self._call_provider, provider, prompt)
+        
+        if provider == "together":
+            response = await client.post(self.together_api_url, **self._together_request(prompt))
+            return self._read_together_response(response)
+        response = await client.post(
+            f"https://api-inference.huggingface.co/models/{self.hf_model}",
+            **self._huggingface_request(prompt)
+        )
+        return self._read_huggingface_response(response)
+    
+    async def generate_llama_content_stream(self, prompt: str, use_cache: bool = True) -> AsyncIterator[str]:
+        """Pieces of the generated text as the provider produces them.
+        
+        Together AI completions are streamed; cached responses, the other
+        providers and setups without httpx yield the whole text at once, as
+        does the next provider when a stream fails before its first piece.
+        The complete text is cached as in generate_llama_content.
         """
-        try:
-            # First try to parse as-is
-            json.loads(json_str)
-            return json_str
-        except json.JSONDecodeError:
-            pass
-        
-        # Try to repair common issues
-        repaired = json_str.strip()
-        
-        # Remove text before/after JSON
-        if '{' in repaired:
-            repaired = repaired[repaired.find('{'):]
-        elif '[' in repaired:
-            repaired = repaired[repaired.find('['):]
-        
-        if '}' in repaired:
-            repaired = repaired[:repaired.rfind('}') + 1]
-        elif ']' in repaired:
-            repaired = repaired[:repaired.rfind(']') + 1]
-        
-        # Remove trailing commas before closing brackets/braces
-        repaired = re.sub(r',(\s*[}\]])', r'\1', repaired)
-        
-        # Try to balance brackets/braces
-        open_braces = repaired.count('{')
-        close_braces = repaired.count('}')
-        open_brackets = repaired.count('[')
-        close_brackets = repaired.count(']')
-        
-        if open_braces > close_braces:
-            repaired += '}' * (open_braces - close_braces)
-        if open_brackets > close_brackets:
-            repaired += ']' * (open_brackets - close_brackets)
+        await self.wait_for_provider_async()
+        provider = self._preferred_provider()
+        cache_key = self._response_cache_key(prompt, provider) if use_cache else None
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
         
-        try:
-            json.loads(repaired)
-            print(f"✓ JSON repair successful")
-            return repaired
-        except json.JSONDecodeError as e:
-            print(f"⚠️  JSON repair failed: {e}")
-            return json_str
+        client = self._async_client("together") if provider == "together" else None
+        pieces = []
+        if client is not None and self.router.acquire("together"):
+            start = time.perf_counter()
+            ok = True
+            try:
+                async for piece in self._stream_together(client, prompt):
+                    pieces.append(piece)
+                    yield piece
+            except Exception as e:
+                ok = False
+                # Text already sent cannot be taken back; otherwise try the other providers
+                if pieces:
+                    raise
+                print(f"⚠️  together stream failed: {e}")
+            finally:
+                # A stream the caller abandons is not held against the provider
+                self.router.record("together", time.perf_counter() - start, ok)
+            response = "".join(pieces)
+        if not pieces:
+            provider, response = await self._generate_async(prompt)
+            yield response
+        if use_cache:
+            self._cache_response(prompt, provider, response)
+    
+    async def _stream_together(self, client, prompt: str) -> AsyncIterator[str]:
+        """Content deltas of a streamed Together AI chat completion (server-sent events)."""
+        request = self._together_request(prompt)
+        request["json"]["stream"] = True
+        async with client.stream_post(self.together_api_url, **request) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Together AI error: {response.status_code} - {response.text}")
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                piece = choices[0].get("delta", {}).get("content") if choices else None
+                if piece:
+                    yield piece
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP clients."""
+        for client in self.async_http.values():
+            if client is not None:
+                await client.aclose()
+        self.async_http.clear()
+    
+    def http_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Connection pool statistics of each HTTP provider."""
+        stats = {name: client.stats() for name, client in self.http.items()}
+        for name, client in self.async_http.items():
+            if client is not None:
+                stats[f"{name}_async"] = client.stats()
+        return stats
+    
+    def router_stats(self) -> Dict[str, Any]:
+        """Provider routing order, circuit states and latency statistics."""
+        return self.router.stats()
+    
+    def local_batch_stats(self) -> Dict[str, Any]:
+        """Batch sizes and queue waits of the local model's micro-batching, and
+        the tokens its structuring prefix cache saved from prefill."""
+        prefix_cache = self.local_prefix_cache.stats() if self.local_prefix_cache is not None else None
+        return {"loaded": self.local_pipeline is not None, **self.local_batcher.stats(), "prefix_cache": prefix_cache}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Response cache counters ({"enabled": False} when caching is off) and
+        the coalescing of identical in-flight prompts."""
+        if self.response_cache is None:
+            return {"enabled": False, "inflight": self.inflight.stats()}
+        return {"enabled": True, **self.response_cache.stats(), "inflight": self.inflight.stats()}
+    
+    def _parse_json(self, response: str, openers: str) -> Any:
+        """
+        First JSON value opened by one of openers in a LLaMA response, or None.
+        Malformed JSON (trailing commas, missing brackets, truncated output...)
+        is repaired in the same pass and the repairs are logged.
+        """
+        value, repairs = parse_first_json(response, openers)
+        if repairs:
+            print(f"✓ JSON repaired: {'; '.join(repairs[:5])}" + (f" (+{len(repairs) - 5} more)" if len(repairs) > 5 else ""))
+        return value
 
-    def generate_recommendations(self, candidate_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    def generate_recommendations(self, candidate_data: Dict[str, Any], use_cache: bool = True) -> List[Dict[str, str]]:
         """
         Generate job recommendations using the best available LLaMA provider or fallback to CLI parser.
         """
@@ -307,7 +796,7 @@ class LlamaService:
             prompt = self._create_prompt(candidate_data)
             
             # Call the appropriate LLaMA provider
-            response = self.generate_llama_content(prompt)
+            response = self.generate_llama_content(prompt, use_cache)
             
             # Parse the response
             return self._parse_response(response)
@@ -317,6 +806,22 @@ class LlamaService:
             print("⚠️  Falling back to CLI parser")
             return self._generate_cli_based_recommendations(candidate_data)
     
+    async def generate_recommendations_async(self, candidate_data: Dict[str, Any], use_cache: bool = True) -> List[Dict[str, str]]:
+        """Awaitable generate_recommendations."""
+        await self.wait_for_provider_async()
+        if self.provider == "cli":
+            return self._generate_cli_based_recommendations(candidate_data)
+        
+        try:
+            prompt = self._create_prompt(candidate_data)
+            response = await self.generate_llama_content_async(prompt, use_cache)
+            return await self._parse_response_async(response)
+            
+        except Exception as e:
+            print(f"Error calling LLaMA provider ({self.provider}): {e}")
+            print("⚠️  Falling back to CLI parser")
+            return self._generate_cli_based_recommendations(candidate_data)
+    
     def _create_prompt(self, candidate_data: Dict[str, Any]) -> str:
         """Create a prompt for LLaMA based on candidate data."""
         prompt = f"""Réponds uniquement en français, donne-moi 5 intitulés de postes adaptés au profil du candidat.
@@ -339,100 +844,147 @@ IMPORTANT: Tous les intitulés de postes et explications doivent être en franç
         return prompt
     
     
-    def _parse_response(self, response: str) -> List[Dict[str, str]]:
-        """Parse the LLaMA response into structured recommendations with JSON repair and French validation."""
+    def _parse_recommendations(self, response: str) -> Optional[List[Dict[str, str]]]:
+        """Title/reason pairs of the LLaMA response with JSON repair, or None."""
         try:
-            # Try to extract JSON from the response
-            json_match = re.search(r'\[.*\]', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                repaired_json = self._repair_json(json_str)
-                try:
-                    recommendations = json.loads(repaired_json)
-                    if isinstance(recommendations, list):
-                        print("✓ LLaMA recommendations JSON parsing successful")
-                        
-                        # Process recommendations and ensure they are in French
-                        processed_recommendations = []
-                        for rec in recommendations:
-                            if isinstance(rec, dict):
-                                title = rec.get("title", "Poste Inconnu")
-                                reason = rec.get("reason", "Aucune raison fournie")
-                                
-                                # Check if title/reason are in French, if not translate them
-                                title = self._ensure_french_text(title)
-                                reason = self._ensure_french_text(reason)
-                                
-                                processed_recommendations.append({
-                                    "title": title,
-                                    "reason": reason
-                                })
-                        
-                        return processed_recommendations
-                except json.JSONDecodeError as e:
-                    print(f"⚠️  JSON parsing failed even after repair: {e}")
+            # Parse the first JSON array of the response
+            recommendations = self._parse_json(response, "[")
+            if isinstance(recommendations, list):
+                print("✓ LLaMA recommendations JSON parsing successful")
+                return [
+                    {
+                        "title": rec.get("title", "Poste Inconnu"),
+                        "reason": rec.get("reason", "Aucune raison fournie"),
+                    }
+                    for rec in recommendations if isinstance(rec, dict)
+                ]
         except Exception as e:
             print(f"Error parsing LLaMA response: {e}")
         
         print("⚠️  LLaMA response parsing failed, using CLI parser-based recommendations")
-        return self._generate_cli_based_recommendations({})
+        return None
+    
+    def _parse_response(self, response: str) -> List[Dict[str, str]]:
+        """Parse the LLaMA response into structured recommendations with JSON repair and French validation."""
+        recommendations = self._parse_recommendations(response)
+        if recommendations is None:
+            return self._generate_cli_based_recommendations({})
+        
+        # Check if title/reason are in French, if not translate them (one batched call)
+        texts = [text for rec in recommendations for text in (rec["title"], rec["reason"])]
+        french = self._ensure_french_texts(texts)
+        return [{"title": title, "reason": reason} for title, reason in zip(french[::2], french[1::2])]
+    
+    async def _parse_response_async(self, response: str) -> List[Dict[str, str]]:
+        """Awaitable _parse_response."""
+        recommendations = self._parse_recommendations(response)
+        if recommendations is None:
+            return self._generate_cli_based_recommendations({})
+        
+        texts = [text for rec in recommendations for text in (rec["title"], rec["reason"])]
+        french = await self._ensure_french_texts_async(texts)
+        return [{"title": title, "reason": reason} for title, reason in zip(french[::2], french[1::2])]
+    
+    def _is_english_text(self, text: str) -> bool:
+        """Simple check for common English words in job titles/reasons."""
+        english_indicators = [
+            'software engineer', 'data analyst', 'project manager', 'consultant',
+            'developer', 'manager', 'analyst', 'engineer', 'specialist',
+            'strong', 'experience', 'skills', 'background', 'suitable',
+            'programming', 'development', 'management', 'analysis'
+        ]
+        
+        text_lower = text.lower()
+        return any(indicator in text_lower for indicator in english_indicators)
     
     def _ensure_french_text(self, text: str) -> str:
         """
         Ensure text is in French. If not, attempt to translate it.
         """
-        try:
-            # Simple check for common English words in job titles/reasons
-            english_indicators = [
-                'software engineer', 'data analyst', 'project manager', 'consultant',
-                'developer', 'manager', 'analyst', 'engineer', 'specialist',
-                'strong', 'experience', 'skills', 'background', 'suitable',
-                'programming', 'development', 'management', 'analysis'
-            ]
-            
-            text_lower = text.lower()
-            is_english = any(indicator in text_lower for indicator in english_indicators)
-            
-            if is_english:
-                print(f"🔄 Detected English text, translating to French: {text[:50]}...")
-                return self._translate_to_french(text)
-            else:
-                return text
-                
-        except Exception as e:
-            print(f"Error in French text validation: {e}")
-            return text
+        return self._ensure_french_texts([text])[0]
     
-    def _translate_to_french(self, text: str) -> str:
+    def _ensure_french_texts(self, texts: List[str]) -> List[str]:
         """
-        Translate English text to French using LLaMA.
+        French version of each text. English texts missing from the translation
+        memo are translated together in a single LLaMA call.
         """
-        try:
-            if self.provider == "cli":
-                # Use fallback French translations for common terms
-                return self._get_french_fallback(text)
-            
-            # Create translation prompt
-            translation_prompt = f"""Traduis ce texte en français. Réponds uniquement avec la traduction française, sans explications.
+        translations, pending = self._plan_translations(texts)
+        if pending and self.provider == "cli":
+            # Use fallback French translations for common terms
+            translations.update((text, self._get_french_fallback(text)) for text in pending)
+        elif pending:
+            try:
+                response = self.generate_llama_content(self._batch_translation_prompt(pending))
+                translations.update(self._read_batch_translation(pending, response))
+            except Exception as e:
+                print(f"Error translating to French: {e}")
+                translations.update((text, self._get_french_fallback(text)) for text in pending)
+        return [translations[text] for text in texts]
+    
+    async def _ensure_french_texts_async(self, texts: List[str]) -> List[str]:
+        """Awaitable _ensure_french_texts."""
+        translations, pending = self._plan_translations(texts)
+        if pending and self.provider == "cli":
+            # Use fallback French translations for common terms
+            translations.update((text, self._get_french_fallback(text)) for text in pending)
+        elif pending:
+            try:
+                response = await self.generate_llama_content_async(self._batch_translation_prompt(pending))
+                translations.update(self._read_batch_translation(pending, response))
+            except Exception as e:
+                print(f"Error translating to French: {e}")
+                translations.update((text, self._get_french_fallback(text)) for text in pending)
+        return [translations[text] for text in texts]
+    
+    def _translation_key(self, text: str) -> str:
+        return LLMResponseCache.key("translation", "fr", {}, text)
+    
+    def _plan_translations(self, texts: List[str]):
+        """Translations already known for texts (French texts map to
+        themselves), and the distinct English texts still to translate."""
+        translations: Dict[str, str] = {}
+        pending: List[str] = []
+        for text in dict.fromkeys(texts):
+            if not self._is_english_text(text):
+                translations[text] = text
+                continue
+            memo = self.translation_memo.get(self._translation_key(text)) if self.translation_memo else None
+            if memo is not None:
+                translations[text] = memo
+            else:
+                pending.append(text)
+        if pending:
+            print(f"🔄 Detected {len(pending)} English text(s), translating to French")
+        return translations, pending
+    
+    def _batch_translation_prompt(self, texts: List[str]) -> str:
+        """Create a prompt for LLaMA to translate several texts to French at once."""
+        return f"""Traduis chacun de ces textes en français. Réponds uniquement avec un tableau JSON de {len(texts)} chaînes, dans le même ordre, sans explications.
 
-Texte à traduire: {text}
+Textes à traduire:
+{json.dumps(texts, ensure_ascii=False, indent=2)}
 
-Traduction française:"""
-            
-            # Call LLaMA for translation
-            translated = self.generate_llama_content(translation_prompt)
-            
-            # Clean up the response (remove any extra text)
-            translated = translated.strip()
-            if '\n' in translated:
-                translated = translated.split('\n')[0]
-            
-            print(f"✓ Translated to French: {translated[:50]}...")
-            return translated
-            
-        except Exception as e:
-            print(f"Error translating to French: {e}")
-            return self._get_french_fallback(text)
+Traductions françaises:"""
+    
+    def _read_batch_translation(self, texts: List[str], response: str) -> Dict[str, str]:
+        """Map each text to its translation in response and memoize it.
+        
+        A response that is not a JSON array with one string per text is
+        discarded and the fallback dictionary is used instead.
+        """
+        translated = self._parse_json(response, "[")
+        if (not isinstance(translated, list) or len(translated) != len(texts)
+                or not all(isinstance(item, str) and item.strip() for item in translated)):
+            print("⚠️  Batched translation unusable, using fallback French translations")
+            return {text: self._get_french_fallback(text) for text in texts}
+        
+        translations = {}
+        for text, french in zip(texts, translated):
+            translations[text] = french.strip()
+            if self.translation_memo is not None:
+                self.translation_memo.put(self._translation_key(text), translations[text])
+        print(f"✓ Translated {len(texts)} text(s) to French")
+        return translations
     
     def _get_french_fallback(self, text: str) -> str:
         """
@@ -466,7 +1018,7 @@ Traduction française:"""
         
         return result
     
-    def extract_skills_from_job_description(self, job_description: str) -> List[str]:
+    def extract_skills_from_job_description(self, job_description: str, use_cache: bool = True) -> List[str]:
         """
         Extract required skills from a job description using LLaMA or fallback to CLI parser.
         """
@@ -475,18 +1027,10 @@ Traduction française:"""
         
         try:
             # Create prompt for skill extraction
-            prompt = f"""Extract the technical skills and requirements from this job description. 
-            Return only a JSON array of skill names, no explanations.
-
-            Job Description:
-            {job_description}
-
-            Example format:
-            ["Python", "React", "PostgreSQL", "Docker", "AWS"]
-            """
+            prompt = self._create_skills_prompt(job_description)
             
             # Call the appropriate LLaMA provider
-            response = self.generate_llama_content(prompt)
+            response = self.generate_llama_content(prompt, use_cache)
             
             # Parse the response
             return self._parse_skills_response(response)
@@ -496,21 +1040,41 @@ Traduction française:"""
             print("⚠️  Falling back to CLI parser")
             return self._extract_skills_cli_fallback(job_description)
     
+    async def extract_skills_async(self, job_description: str, use_cache: bool = True) -> List[str]:
+        """Awaitable extract_skills_from_job_description."""
+        await self.wait_for_provider_async()
+        if self.provider == "cli":
+            return self._extract_skills_cli_fallback(job_description)
+        
+        try:
+            response = await self.generate_llama_content_async(self._create_skills_prompt(job_description), use_cache)
+            return self._parse_skills_response(response)
+            
+        except Exception as e:
+            print(f"Error extracting skills from job description: {e}")
+            print("⚠️  Falling back to CLI parser")
+            return self._extract_skills_cli_fallback(job_description)
+    
+    def _create_skills_prompt(self, job_description: str) -> str:
+        """Create a prompt for LLaMA to list the skills of a job description."""
+        return f"""Extract the technical skills and requirements from this job description. 
+            Return only a JSON array of skill names, no explanations.
+
+            Job Description:
+            {job_description}
+
+            Example format:
+            ["Python", "React", "PostgreSQL", "Docker", "AWS"]
+            """
+    
     def _parse_skills_response(self, response: str) -> List[str]:
         """Parse the LLaMA response to extract skills with JSON repair."""
         try:
-            # Try to extract JSON array from the response
-            json_match = re.search(r'\[.*?\]', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                repaired_json = self._repair_json(json_str)
-                try:
-                    skills = json.loads(repaired_json)
-                    if isinstance(skills, list):
-                        print("✓ LLaMA skills JSON parsing successful")
-                        return [skill.strip() for skill in skills if isinstance(skill, str)]
-                except json.JSONDecodeError as e:
-                    print(f"⚠️  JSON parsing failed even after repair: {e}")
+            # Parse the first JSON array of the response
+            skills = self._parse_json(response, "[")
+            if isinstance(skills, list):
+                print("✓ LLaMA skills JSON parsing successful")
+                return [skill.strip() for skill in skills if isinstance(skill, str)]
         except Exception as e:
             print(f"Error parsing skills response: {e}")
         
@@ -518,111 +1082,250 @@ Traduction française:"""
         return self._extract_skills_cli_fallback("")
     
     
-    def structure_cv_text(self, raw_text: str) -> Dict[str, Any]:
+    def structure_cv_text(self, raw_text: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Structure raw CV text into JSON format using LLaMA or fallback to CLI parser.
         """
         # Check if raw text is empty or too short
         if not raw_text or len(raw_text.strip()) < 10:
-            print(f"⚠️  WARNING: Raw text is empty or too short ({len(raw_text)} characters)")
-            print("   This will result in poor extraction quality")
-            print("   Raw text content:", repr(raw_text[:100]))
-            
-            # Return a structure indicating the issue
-            return {
-                "contact_info": {"emails": [], "phones": [], "linkedin": "", "address": "", "name": ""},
-                "professional_summary": [],
-                "skills": [],
-                "languages": [],
-                "education": [],
-                "experience": [],
-                "projects": [],
-                "additional_info": [f"ERROR: No content extracted from file. Raw text length: {len(raw_text)} characters"],
-                "extraction_error": "No content could be extracted from the uploaded file"
-            }
+            return self._empty_cv_structure(raw_text)
         
         if self.provider == "cli":
             return self._fallback_to_cli_parser(raw_text)
         
         try:
+            # Long CVs are structured chunk by chunk and merged
+            chunks = self._split_cv_text(raw_text)
+            if len(chunks) > 1:
+                return self._structure_cv_chunks(raw_text, chunks, use_cache)
+            
             # Create prompt for CV structuring
             prompt = self._create_cv_structuring_prompt(raw_text)
             
             # Call the appropriate LLaMA provider
-            response = self.generate_llama_content(prompt)
-            
-            # Parse the response
-            structured_data = self._parse_cv_structure_response(response)
+            response = self.generate_llama_content(prompt, use_cache)
             
-            # Verify content preservation
-            preservation_report = self.verify_content_preservation(raw_text, structured_data)
-            print(f"Content preservation score: {preservation_report['content_preservation_score']:.2f}")
+            return self._finish_cv_structure(raw_text, response)
             
-            if preservation_report['missing_content_warning']:
-                print("⚠️  Warning: Significant content might be missing from structured data")
-                print("   This might indicate an issue with the source file or extraction process")
+        except Exception as e:
+            print(f"Error structuring CV with LLaMA ({self.provider}): {e}")
+            print("⚠️  Falling back to CLI parser")
+            return self._fallback_to_cli_parser(raw_text)
+    
+    async def structure_cv_text_async(self, raw_text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Awaitable structure_cv_text."""
+        await self.wait_for_provider_async()
+        if not raw_text or len(raw_text.strip()) < 10:
+            return self._empty_cv_structure(raw_text)
+        
+        if self.provider == "cli":
+            return self._fallback_to_cli_parser(raw_text)
+        
+        try:
+            chunks = self._split_cv_text(raw_text)
+            if len(chunks) > 1:
+                return await self._structure_cv_chunks_async(raw_text, chunks, use_cache)
             
-            return structured_data
+            prompt = self._create_cv_structuring_prompt(raw_text)
+            response = await self.generate_llama_content_async(prompt, use_cache)
+            return self._finish_cv_structure(raw_text, response)
             
         except Exception as e:
             print(f"Error structuring CV with LLaMA ({self.provider}): {e}")
             print("⚠️  Falling back to CLI parser")
             return self._fallback_to_cli_parser(raw_text)
     
-    def _create_cv_structuring_prompt(self, raw_text: str) -> str:
-        """Create a prompt for LLaMA to structure CV text into JSON."""
-        prompt = f"""You are an expert CV parser. Your task is to extract and structure EVERY SINGLE piece of information from the CV text below into a JSON format. NOTHING should be omitted, summarized, or discarded.
-
-CRITICAL REQUIREMENTS:
-- Extract 100% of the content - every word, every detail, every piece of information
-- If content doesn't fit perfectly into a category, still include it in the most appropriate section
-- Preserve exact wording, dates, names, and all details
-- Include all bullet points, descriptions, and additional information
-- Extract the candidate's name and include it in contact_info or professional_summary
-
-STRUCTURE THE CONTENT INTO THESE SECTIONS:
-
-1. contact_info: 
-   - emails: [array of all email addresses found]
-   - phones: [array of all phone numbers found] 
-   - linkedin: [LinkedIn URL if present]
-   - address: [full address if present]
-   - name: [candidate's full name - extract from anywhere in the text]
-
-2. professional_summary: [array of all summary/profile text - include everything that describes the candidate]
-
-3. skills: [array of ALL skills, technologies, tools, competencies mentioned - extract every single one]
-
-4. languages: [array of objects with "language" and "level" - include all languages mentioned]
-
-5. education: [array of education entries with ALL details including:
-   - date_range: [exact dates as written]
-   - degree: [full degree name]
-   - institution: [full institution name]
-   - details: [array of ALL additional details, coursework, achievements, descriptions]
-   - location: [if mentioned]]
-
-6. experience: [array of work experience with ALL details including:
-   - date_range: [exact dates as written]
-   - company: [full company name]
-   - role: [full job title/role]
-   - details: [array of ALL job descriptions, responsibilities, achievements]
-   - location: [if mentioned]]
-
-7. projects: [array of ALL projects, activities, achievements with:
-   - title: [project/activity name]
-   - description: [full description including all details]]
-
-8. additional_info: [array of any other information that doesn't fit above categories - include everything else]
-
-FORMAT REQUIREMENTS:
-- For contact_info: {{"emails": ["email1", "email2"], "phones": ["phone1", "phone2"], "linkedin": "url", "address": "address", "name": "Full Name"}}
-- For languages: [{{"language": "Language Name", "level": "Proficiency Level"}}]
-- For education/experience: Include ALL details in the "details" array - don't summarize
-- For projects: Include full descriptions, don't abbreviate
-- Return ONLY valid JSON, no explanations
-
-CV Text to parse:
+    async def structure_cv_text_stream(self, raw_text: str, use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        structure_cv_text as a stream of events: {"section": name, "data": value}
+        as soon as the streamed response closes each top-level section, then
+        {"extracted_data": structure} with the complete, validated result.
+        Long (chunked) CVs, the CLI parser and failed streams send their
+        sections once the whole structure is known. The final structure is
+        authoritative if it differs from a section sent earlier.
+        """
+        await self.wait_for_provider_async()
+        sent = set()
+        structured_data = None
+        if (raw_text and len(raw_text.strip()) >= 10 and self.provider != "cli"
+                and len(self._split_cv_text(raw_text)) == 1):
+            try:
+                parser = JSONSectionParser()
+                pieces = []
+                prompt = self._create_cv_structuring_prompt(raw_text)
+                async for piece in self.generate_llama_content_stream(prompt, use_cache):
+                    pieces.append(piece)
+                    for name, value in parser.feed(piece):
+                        section = self._validate_cv_structure({name: value})
+                        if name in section and name not in sent:
+                            sent.add(name)
+                            yield {"section": name, "data": section[name]}
+                structured_data = self._finish_cv_structure(raw_text, "".join(pieces))
+                
+            except Exception as e:
+                print(f"Error streaming CV structure with LLaMA ({self.provider}): {e}")
+                print("⚠️  Falling back to CLI parser")
+                structured_data = self._fallback_to_cli_parser(raw_text)
+        
+        if structured_data is None:
+            structured_data = await self.structure_cv_text_async(raw_text, use_cache)
+        for name, value in structured_data.items():
+            if name not in sent:
+                yield {"section": name, "data": value}
+        yield {"extracted_data": structured_data}
+    
+    def _empty_cv_structure(self, raw_text: str) -> Dict[str, Any]:
+        """Structure returned when the raw text is empty or too short."""
+        print(f"⚠️  WARNING: Raw text is empty or too short ({len(raw_text)} characters)")
+        print("   This will result in poor extraction quality")
+        print("   Raw text content:", repr(raw_text[:100]))
+        
+        # Return a structure indicating the issue
+        return {
+            "contact_info": {"emails": [], "phones": [], "linkedin": "", "address": "", "name": ""},
+            "professional_summary": [],
+            "skills": [],
+            "languages": [],
+            "education": [],
+            "experience": [],
+            "projects": [],
+            "additional_info": [f"ERROR: No content extracted from file. Raw text length: {len(raw_text)} characters"],
+            "extraction_error": "No content could be extracted from the uploaded file"
+        }
+    
+    def _finish_cv_structure(self, raw_text: str, response: str) -> Dict[str, Any]:
+        """Parse the structuring response and report content preservation."""
+        return self._check_content_preservation(raw_text, self._parse_cv_structure_response(response))
+    
+    def _check_content_preservation(self, raw_text: str, structured_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Report how much of raw_text made it into structured_data."""
+        # Verify content preservation
+        preservation_report = self.verify_content_preservation(raw_text, structured_data)
+        print(f"Content preservation score: {preservation_report['content_preservation_score']:.2f}")
+        
+        if preservation_report['missing_content_warning']:
+            print("⚠️  Warning: Significant content might be missing from structured data")
+            print("   This might indicate an issue with the source file or extraction process")
+        
+        return structured_data
+    
+    def _split_cv_text(self, raw_text: str) -> List[str]:
+        """
+        Split raw_text into chunks of at most structure_chunk_tokens.
+        Chunks are cut before section header lines; a section over the budget
+        is cut at line breaks, and a single line over the budget is kept whole.
+        Joining the chunks with newlines gives back the text.
+        """
+        budget = self.structure_chunk_tokens * CHARS_PER_TOKEN
+        if budget <= 0 or len(raw_text) <= budget:
+            return [raw_text]
+        
+        # Sections start at lines that are only a header keyword
+        sections: List[List[str]] = [[]]
+        for line in raw_text.split("\n"):
+            if sections[-1] and patterns.classify_header(line.strip())[0] is not None:
+                sections.append([])
+            sections[-1].append(line)
+        
+        # Pieces within the budget: whole sections, or runs of lines of a long section
+        pieces: List[str] = []
+        for section in sections:
+            text = "\n".join(section)
+            if len(text) <= budget:
+                pieces.append(text)
+                continue
+            run: List[str] = []
+            size = 0
+            for line in section:
+                if run and size + len(line) > budget:
+                    pieces.append("\n".join(run))
+                    run, size = [], 0
+                run.append(line)
+                size += len(line) + 1
+            pieces.append("\n".join(run))
+        
+        # Pack consecutive pieces into chunks
+        chunks = [pieces[0]]
+        for piece in pieces[1:]:
+            if len(chunks[-1]) + 1 + len(piece) <= budget:
+                chunks[-1] += "\n" + piece
+            else:
+                chunks.append(piece)
+        return chunks
+    
+    def _structure_cv_chunk(self, chunk: str, part: int, parts: int, use_cache: bool) -> Dict[str, Any]:
+        """Structure one chunk; the CLI parser handles a chunk whose call fails."""
+        try:
+            prompt = self._create_cv_structuring_prompt(chunk, (part, parts))
+            return self._validate_cv_structure(self._parse_cv_structure_response(
+                self.generate_llama_content(prompt, use_cache)))
+        except Exception as e:
+            print(f"Error structuring CV part {part}/{parts} with LLaMA ({self.provider}): {e}")
+            return self._validate_cv_structure(self._fallback_to_cli_parser(chunk))
+    
+    def _structure_cv_chunks(self, raw_text: str, chunks: List[str], use_cache: bool) -> Dict[str, Any]:
+        """Structure chunks concurrently and merge them in document order."""
+        print(f"🔄 Structuring long CV in {len(chunks)} parts")
+        with ThreadPoolExecutor(max_workers=min(self.structure_concurrency, len(chunks))) as pool:
+            structures = list(pool.map(
+                lambda part: self._structure_cv_chunk(chunks[part], part + 1, len(chunks), use_cache),
+                range(len(chunks))
+            ))
+        return self._check_content_preservation(raw_text, self._merge_cv_structures(structures))
+    
+    async def _structure_cv_chunks_async(self, raw_text: str, chunks: List[str], use_cache: bool) -> Dict[str, Any]:
+        """Awaitable _structure_cv_chunks."""
+        print(f"🔄 Structuring long CV in {len(chunks)} parts")
+        semaphore = asyncio.Semaphore(self.structure_concurrency)
+        
+        async def structure(part: int) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    prompt = self._create_cv_structuring_prompt(chunks[part], (part + 1, len(chunks)))
+                    return self._validate_cv_structure(self._parse_cv_structure_response(
+                        await self.generate_llama_content_async(prompt, use_cache)))
+                except Exception as e:
+                    print(f"Error structuring CV part {part + 1}/{len(chunks)} with LLaMA ({self.provider}): {e}")
+                    return self._validate_cv_structure(self._fallback_to_cli_parser(chunks[part]))
+        
+        structures = await asyncio.gather(*(structure(part) for part in range(len(chunks))))
+        return self._check_content_preservation(raw_text, self._merge_cv_structures(structures))
+    
+    def _merge_cv_structures(self, structures: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge validated chunk structures in document order. Contact fields keep
+        the first non-empty value, emails and phones are combined, and section
+        lists are concatenated without exact duplicates.
+        """
+        merged = self._validate_cv_structure({})
+        contact_info = merged["contact_info"]
+        seen: Dict[str, set] = {key: set() for key in merged if key != "contact_info"}
+        for structure in structures:
+            for field in ["emails", "phones"]:
+                for value in structure["contact_info"][field]:
+                    if value not in contact_info[field]:
+                        contact_info[field].append(value)
+            for field in ["linkedin", "address", "name"]:
+                if not contact_info[field]:
+                    contact_info[field] = structure["contact_info"][field]
+            for key, items in seen.items():
+                for item in structure[key]:
+                    marker = json.dumps(item, sort_keys=True, ensure_ascii=False)
+                    if marker not in items:
+                        items.add(marker)
+                        merged[key].append(item)
+        return merged
+    
+    def _create_cv_structuring_prompt(self, raw_text: str, part: Optional[tuple] = None) -> str:
+        """Create a prompt for LLaMA to structure CV text into JSON.
+        
+        part is (index, count) when raw_text is one chunk of a longer CV.
+        """
+        scope = ""
+        if part is not None:
+            scope = (f" (part {part[0]} of {part[1]} of a longer CV; structure only what this part contains"
+                     f" and leave the other sections empty)")
+        prompt = f"""{CV_STRUCTURING_INSTRUCTIONS}CV Text to parse{scope}:
 {raw_text}
 
 Extract and structure ALL content into JSON:"""
@@ -631,19 +1334,12 @@ Extract and structure ALL content into JSON:"""
     def _parse_cv_structure_response(self, response: str) -> Dict[str, Any]:
         """Parse the LLaMA response into structured CV data with JSON repair."""
         try:
-            # Try to extract JSON from the response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                repaired_json = self._repair_json(json_str)
-                try:
-                    structured_data = json.loads(repaired_json)
-                    print("✓ LLaMA JSON parsing successful")
-                    return self._validate_cv_structure(structured_data)
-                except json.JSONDecodeError as e:
-                    print(f"⚠️  JSON parsing failed even after repair: {e}")
-                    # Try to extract partial data from the response
-                    return self._extract_partial_data_from_response(response)
+            # Parse the first JSON object of the response; a truncated one keeps
+            # every member that was complete
+            structured_data = self._parse_json(response, "{")
+            if isinstance(structured_data, dict):
+                print("✓ LLaMA JSON parsing successful")
+                return self._validate_cv_structure(structured_data)
         except Exception as e:
             print(f"Error parsing CV structure response: {e}")
         
@@ -752,56 +1448,6 @@ Extract and structure ALL content into JSON:"""
         
         return validated_data
     
-    def _extract_partial_data_from_response(self, response: str) -> Dict[str, Any]:
-        """
-        Extract partial structured data from LLaMA response when JSON parsing fails.
-        This preserves as much information as possible before falling back to CLI parser.
-        """
-        try:
-            print("Attempting to extract partial data from LLaMA response...")
-            
-            # Initialize partial data structure
-            partial_data = {
-                "contact_info": {"emails": [], "phones": [], "linkedin": "", "address": "", "name": ""},
-                "professional_summary": [],
-                "skills": [],
-                "languages": [],
-                "education": [],
-                "experience": [],
-                "projects": [],
-                "additional_info": []
-            }
-            
-            # Try to extract name
-            name_match = re.search(r'"name"\s*:\s*"([^"]+)"', response, re.IGNORECASE)
-            if name_match:
-                partial_data["contact_info"]["name"] = name_match.group(1)
-            
-            # Try to extract emails
-            email_matches = re.findall(r'"emails"\s*:\s*\[(.*?)\]', response, re.DOTALL)
-            if email_matches:
-                emails = re.findall(r'"([^"]+@[^"]+)"', email_matches[0])
-                partial_data["contact_info"]["emails"] = emails
-            
-            # Try to extract skills
-            skills_matches = re.findall(r'"skills"\s*:\s*\[(.*?)\]', response, re.DOTALL)
-            if skills_matches:
-                skills = re.findall(r'"([^"]+)"', skills_matches[0])
-                partial_data["skills"] = skills
-            
-            # Try to extract professional summary
-            summary_matches = re.findall(r'"professional_summary"\s*:\s*\[(.*?)\]', response, re.DOTALL)
-            if summary_matches:
-                summary = re.findall(r'"([^"]+)"', summary_matches[0])
-                partial_data["professional_summary"] = summary
-            
-            print(f"✓ Extracted partial data: name={partial_data['contact_info']['name']}, skills={len(partial_data['skills'])}, summary={len(partial_data['professional_summary'])}")
-            return partial_data
-            
-        except Exception as e:
-            print(f"Error extracting partial data: {e}")
-            return self._fallback_to_cli_parser("")
-    
     def _fallback_to_cli_parser(self, raw_text: str) -> Dict[str, Any]:
         """
         Enhanced CLI parser fallback that preserves ALL content.
@@ -812,7 +1458,7 @@ Extract and structure ALL content into JSON:"""
             from cv_extractor_cli import (
                 extract_contact_info, extract_summary, extract_skills, 
                 extract_languages, extract_education, extract_experience, 
-                extract_projects
+                extract_projects, SectionIndex
             )
             
             print("🔄 Starting enhanced CLI parser fallback...")
@@ -825,13 +1471,14 @@ Extract and structure ALL content into JSON:"""
             if candidate_name:
                 contact_info["name"] = candidate_name
             
-            # Extract all sections
-            professional_summary = extract_summary(raw_text)
-            skills = extract_skills(raw_text)
-            languages = extract_languages(raw_text)
-            education = extract_education(raw_text)
-            experience = extract_experience(raw_text)
-            projects = extract_projects(raw_text)
+            # Extract all sections from a single segmentation pass
+            sections = SectionIndex(raw_text)
+            professional_summary = extract_summary(raw_text, sections)
+            skills = extract_skills(raw_text, sections)
+            languages = extract_languages(raw_text, sections)
+            education = extract_education(raw_text, sections)
+            experience = extract_experience(raw_text, sections)
+            projects = extract_projects(raw_text, sections)
             
             # Create comprehensive additional_info to capture any missed content
             additional_info = self._extract_additional_content(raw_text, {
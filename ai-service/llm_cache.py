@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of LLM responses.
+Entries are keyed by the SHA-256 of the provider, model, sampling parameters
+and prompt, so a repeated prompt skips the paid provider call entirely.
+An in-process LRU tier serves repeat hits; a SQLite tier survives restarts,
+is shared by every process and expires entries after a TTL.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "llm_responses.sqlite3")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_TRANSLATION_MEMO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "translations.sqlite3")
+DEFAULT_TRANSLATION_TTL_SECONDS = 90 * 24 * 3600
+
+
+class LLMResponseCache:
+    """Two-tier LRU cache mapping prompts to LLM responses, with a TTL."""
+
+    def __init__(self, db_path: str,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # key -> (response, expiry timestamp)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        # WAL lets API workers read while one writes; NORMAL skips an fsync per commit
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+        self._db.commit()
+
+    @staticmethod
+    def key(provider: str, model: str, params: Dict[str, Any], prompt: str) -> str:
+        """Cache key of a prompt sent to model with the given sampling parameters."""
+        identity = json.dumps([provider, model, params], sort_keys=True)
+        prompt_digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{identity}:{prompt_digest}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            row = self._db.execute("SELECT response, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                self._memory.pop(key, None)
+                self.misses += 1
+                return None
+            # Refresh the access time: the SQLite tier evicts least recently used first
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store response under key in both tiers, evicting old entries if needed."""
+        now = time.time()
+        expires = now + self.ttl_seconds
+        with self._lock:
+            self._remember(key, response, expires)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires, accessed) VALUES (?, ?, ?, ?)",
+                (key, response, expires, now),
+            )
+            self._db.commit()
+        self.evict()
+
+    def _remember(self, key: str, response: str, expires: float) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (response, expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def evict(self) -> int:
+        """Delete expired entries, then least recently used ones beyond
+        max_entries. Returns the number of entries removed."""
+        with self._lock:
+            removed = self._db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),)).rowcount
+            count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                removed += self._db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+            self._db.commit()
+        return removed
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the number of stored entries."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "memory_entries": len(self._memory),
+        }
+
+
+def llm_cache_from_env() -> Optional[LLMResponseCache]:
+    """Build the cache configured by LLM_CACHE_* variables.
+
+    LLM_CACHE_PATH sets the SQLite file, LLM_CACHE_TTL_SECONDS the lifetime of
+    an entry, LLM_CACHE_MAX_ENTRIES the size of the SQLite tier and
+    LLM_CACHE_MEMORY_ENTRIES the in-process tier (0 disables it).
+    Setting LLM_CACHE_PATH to an empty string disables caching.
+    """
+    db_path = os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+    if not db_path:
+        return None
+    return LLMResponseCache(
+        db_path,
+        ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", DEFAULT_MEMORY_ENTRIES)),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+    )
+
+
+def translation_memo_from_env() -> Optional[LLMResponseCache]:
+    """Build the memo of French translations, keyed by source string.
+
+    LLM_TRANSLATION_MEMO_PATH sets the SQLite file (an empty string disables
+    the memo) and LLM_TRANSLATION_MEMO_TTL_SECONDS the lifetime of an entry;
+    the size limits are shared with the response cache.
+    """
+    db_path = os.getenv("LLM_TRANSLATION_MEMO_PATH", DEFAULT_TRANSLATION_MEMO_PATH)
+    if not db_path:
+        return None
+    return LLMResponseCache(
+        db_path,
+        ttl_seconds=float(os.getenv("LLM_TRANSLATION_MEMO_TTL_SECONDS", DEFAULT_TRANSLATION_TTL_SECONDS)),
+        memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", DEFAULT_MEMORY_ENTRIES)),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+    )
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Dynamic micro-batching of calls to a batched function.
+MicroBatcher queues items submitted from any number of threads; a worker
+thread collects them for up to max_wait_ms after the first one arrives, or
+until max_batch_size items are waiting, runs them as one batch and hands
+each caller its own result. Used by LlamaService so concurrent prompts for
+the local model share one padded generate() call instead of queuing behind
+each other.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_WAIT_MS = 20.0
+# Batch sizes and queue waits kept for the statistics
+STATS_WINDOW = 500
+
+
+class _Item:
+    def __init__(self, value: Any):
+        self.value = value
+        self.queued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """Runs run_batch(values) -> results over batches of submitted values.
+
+    An exception raised by run_batch goes to every caller of the batch; an
+    exception instance returned as one of the results goes to its caller only.
+    """
+
+    def __init__(self, run_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self._batch_sizes: Deque[int] = deque(maxlen=STATS_WINDOW)
+        self._queue_waits: Deque[float] = deque(maxlen=STATS_WINDOW)
+        self._batch_seconds: Deque[float] = deque(maxlen=STATS_WINDOW)
+        self._queue: Deque[_Item] = deque()
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, value: Any) -> Any:
+        """Queue value, wait for its batch and return its result (or raise
+        its exception)."""
+        item = _Item(value)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self._worker is None:
+                # Started on first use so services that never batch pay nothing
+                self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._worker.start()
+            self._queue.append(item)
+            self._condition.notify()
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        if isinstance(item.result, BaseException):
+            raise item.result
+        return item.result
+
+    def close(self) -> None:
+        """Stop the worker once the queued items are served."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._worker is not None:
+            self._worker.join()
+
+    def _next_batch(self) -> List[_Item]:
+        """Wait for a first item, then for more until the batch is full or
+        max_wait_ms have passed since that item was queued."""
+        with self._condition:
+            while not self._queue and not self._closed:
+                self._condition.wait()
+            if not self._queue:
+                return []
+            deadline = self._queue[0].queued_at + self.max_wait_seconds
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            count = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            start = time.perf_counter()
+            try:
+                results = self.run_batch([item.value for item in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"batch of {len(batch)} returned {len(results)} results")
+                for item, result in zip(batch, results):
+                    item.result = result
+            except BaseException as e:
+                self.failed_batches += 1
+                for item in batch:
+                    item.error = e
+            elapsed = time.perf_counter() - start
+
+            with self._condition:
+                self.batches += 1
+                self.items += len(batch)
+                self._batch_sizes.append(len(batch))
+                self._batch_seconds.append(elapsed)
+                self._queue_waits.extend(start - item.queued_at for item in batch)
+            for item in batch:
+                item.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counts, batch size distribution and queue wait percentiles
+        over the last STATS_WINDOW batches."""
+        with self._condition:
+            sizes = list(self._batch_sizes)
+            waits = sorted(self._queue_waits)
+            seconds = sorted(self._batch_seconds)
+            queued = len(self._queue)
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+            "batches": self.batches,
+            "items": self.items,
+            "failed_batches": self.failed_batches,
+            "queued": queued,
+            "mean_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else None,
+            "max_seen_batch_size": max(sizes) if sizes else None,
+            "queue_wait_p50_ms": round(waits[len(waits) // 2] * 1000, 1) if waits else None,
+            "queue_wait_p95_ms": round(waits[int(len(waits) * 0.95)] * 1000, 1) if waits else None,
+            "batch_p50_ms": round(seconds[len(seconds) // 2] * 1000, 1) if seconds else None,
+        }
+
+
+def batcher_from_env(run_batch: Callable[[List[Any]], List[Any]]) -> MicroBatcher:
+    """MicroBatcher sized by LLM_LOCAL_BATCH_SIZE and LLM_LOCAL_BATCH_WAIT_MS
+    (LLM_LOCAL_BATCH_SIZE=1 runs every prompt on its own)."""
+    return MicroBatcher(
+        run_batch,
+        max_batch_size=int(os.getenv("LLM_LOCAL_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE)),
+        max_wait_ms=float(os.getenv("LLM_LOCAL_BATCH_WAIT_MS", DEFAULT_MAX_WAIT_MS)),
+    )
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Reuse of the key/value cache of constant prompt prefixes.
+PrefixKVCache runs the prefill of each registered prefix (the fixed
+instructions of the CV structuring prompt) once, keeps its past_key_values,
+and generates prompts starting with that prefix from a copy of the cache, so
+the model only encodes the document-specific suffix; prompts sharing a
+prefix are generated as one batch from a single copy. Prompts are tokenized
+whole and the cache covers the tokens they share with the prefix: a
+tokenization that merges across the boundary costs a few tokens of prefill,
+never a wrong cache. torch and transformers are imported on first use.
+"""
+
+import copy
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+
+def shared_length(prefix_ids: List[int], ids: List[int]) -> int:
+    """Number of leading token ids ids has in common with prefix_ids."""
+    count = 0
+    for a, b in zip(prefix_ids, ids):
+        if a != b:
+            break
+        count += 1
+    return count
+
+
+class _Prefix:
+    def __init__(self, text: str):
+        self.text = text
+        self.ids: Optional[List[int]] = None
+        self.cache: Any = None
+        self.prefill_seconds = 0.0
+
+
+class PrefixKVCache:
+    """Generates with a causal LM from the cached prefill of known prefixes."""
+
+    def __init__(self, model: Any, tokenizer: Any, prefixes: List[str]):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.prefixes = [_Prefix(text) for text in prefixes]
+        self.hits = 0
+        self.reused_tokens = 0
+        self.prefilled_tokens = 0
+        self._lock = threading.Lock()
+
+    def match(self, text: str) -> Optional[_Prefix]:
+        """Registered prefix text starts with, if any."""
+        for prefix in self.prefixes:
+            if text.startswith(prefix.text):
+                return prefix
+        return None
+
+    def generate(self, text: str, **generate_kwargs) -> Optional[str]:
+        """Continuation of text, generated from the cached prefix it starts
+        with; None when it starts with no registered prefix."""
+        return self.generate_batch([text], **generate_kwargs)[0]
+
+    def generate_batch(self, texts: List[str], **generate_kwargs) -> List[Optional[str]]:
+        """Continuations of texts, None for those starting with no registered
+        prefix. Texts starting with the same prefix are generated in one batch."""
+        results: List[Optional[str]] = [None] * len(texts)
+        groups: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            prefix = self.match(text)
+            if prefix is not None:
+                groups.setdefault(prefix.text, []).append(i)
+        for prefix in self.prefixes:
+            indices = groups.get(prefix.text)
+            if indices:
+                outputs = self._generate_group(prefix, [texts[i] for i in indices], generate_kwargs)
+                for i, output in zip(indices, outputs):
+                    results[i] = output
+        return results
+
+    def _generate_group(self, prefix: _Prefix, texts: List[str], generate_kwargs: Dict[str, Any]) -> List[str]:
+        """Generate texts from one copy of prefix's cache, repeated for each
+        text. The parts after the cache are padded on the left, so padding sits
+        between the prefix and each suffix; generate() masks it out and derives
+        positions from the attention mask."""
+        import torch
+
+        with self._lock:
+            if prefix.cache is None:
+                self._prefill(prefix)
+        rows = [self.tokenizer(text)["input_ids"] for text in texts]
+        # generate() needs at least one token of each text that is not in the cache
+        shared = min(min(shared_length(prefix.ids, row), len(row) - 1) for row in rows)
+        suffixes = [row[shared:] for row in rows]
+        width = max(len(suffix) for suffix in suffixes)
+        pad = self.tokenizer.pad_token_id if self.tokenizer.pad_token_id is not None else self.tokenizer.eos_token_id
+        input_ids = torch.tensor([prefix.ids[:shared] + [pad] * (width - len(suffix)) + suffix for suffix in suffixes],
+                                 device=self.model.device)
+        attention_mask = torch.tensor([[1] * shared + [0] * (width - len(suffix)) + [1] * len(suffix)
+                                       for suffix in suffixes], device=self.model.device)
+
+        kwargs = dict(generate_kwargs)
+        if shared > 0:
+            # generate() extends the cache it is given, so each call gets a copy
+            cache = copy.deepcopy(prefix.cache)
+            if shared < len(prefix.ids):
+                # A negative length drops that many tokens from the end
+                cache.crop(shared - len(prefix.ids))
+            if len(texts) > 1:
+                cache.batch_repeat_interleave(len(texts))
+            kwargs["past_key_values"] = cache
+        with self._lock:
+            self.hits += len(texts) if shared > 0 else 0
+            self.reused_tokens += shared * len(texts)
+            self.prefilled_tokens += sum(len(suffix) for suffix in suffixes)
+
+        with torch.no_grad():
+            output = self.model.generate(input_ids=input_ids, attention_mask=attention_mask, **kwargs)
+        return self.tokenizer.batch_decode(output[:, input_ids.shape[1]:], skip_special_tokens=True)
+
+    def _prefill(self, prefix: _Prefix) -> None:
+        import torch
+        from transformers import DynamicCache
+
+        input_ids = self.tokenizer(prefix.text, return_tensors="pt")["input_ids"].to(self.model.device)
+        start = time.perf_counter()
+        with torch.no_grad():
+            output = self.model(input_ids=input_ids, past_key_values=DynamicCache(), use_cache=True)
+        prefix.prefill_seconds = time.perf_counter() - start
+        prefix.cache = output.past_key_values
+        prefix.ids = input_ids[0].tolist()
+
+    def stats(self) -> Dict[str, Any]:
+        """Prefix sizes and prefill times, and the prompt tokens served from
+        the cache versus encoded."""
+        return {
+            "prefixes": [
+                {"tokens": len(prefix.ids) if prefix.ids is not None else None,
+                 "prefill_ms": round(prefix.prefill_seconds * 1000, 1) if prefix.ids is not None else None}
+                for prefix in self.prefixes
+            ],
+            "hits": self.hits,
+            "reused_tokens": self.reused_tokens,
+            "prefilled_tokens": self.prefilled_tokens,
+        }
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Latency-aware routing between the LLM providers.
+ProviderRouter keeps a rolling window of recent call latencies and outcomes
+per provider, plus a circuit breaker that opens after consecutive failures so
+calls stop waiting on a provider during an incident. order() lists the
+providers to try, healthiest first. Once an open circuit has cooled down it
+lets a single trial call through (half-open); the circuit closes again when
+that call succeeds.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_WINDOW = 50
+DEFAULT_WINDOW_SECONDS = 300.0
+DEFAULT_SLOW_SECONDS = 15.0
+# Share of failed calls in the window above which a provider is degraded,
+# once the window holds at least MIN_SAMPLES calls
+MAX_ERROR_RATE = 0.5
+MIN_SAMPLES = 3
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures and stays open for
+    open_seconds; then one trial call decides whether it closes again."""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 open_seconds: float = DEFAULT_OPEN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+
+    def available(self, now: float) -> bool:
+        """Whether a call may go through now."""
+        if self.state == OPEN and now - self.opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+        return self.state == CLOSED or (self.state == HALF_OPEN and not self._trial_running)
+
+    def acquire(self, now: float) -> bool:
+        """Take the right to call; a half-open breaker grants it to one call at a time."""
+        if not self.available(now):
+            return False
+        if self.state == HALF_OPEN:
+            self._trial_running = True
+        return True
+
+    def record(self, ok: bool, now: float) -> None:
+        if ok:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = now
+        self._trial_running = False
+
+
+class ProviderRouter:
+    """Orders providers by health and tracks their latency and failures."""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 open_seconds: float = DEFAULT_OPEN_SECONDS,
+                 window: int = DEFAULT_WINDOW,
+                 window_seconds: float = DEFAULT_WINDOW_SECONDS,
+                 slow_seconds: float = DEFAULT_SLOW_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.window = window
+        self.window_seconds = window_seconds
+        self.slow_seconds = slow_seconds
+        self.providers: List[str] = []
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        # provider -> last `window` (timestamp, seconds, ok) samples
+        self.samples: Dict[str, Deque[Tuple[float, float, bool]]] = {}
+        self.calls: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        # Calls no provider could serve; the callers fall back to the CLI parser
+        self.cli_fallbacks = 0
+        self._lock = threading.Lock()
+
+    def configure(self, providers: List[str]) -> None:
+        """Route between providers, given in order of preference. Providers
+        already known keep their statistics and circuit state."""
+        with self._lock:
+            self.providers = list(providers)
+            for provider in providers:
+                if provider not in self.breakers:
+                    self.breakers[provider] = CircuitBreaker(self.failure_threshold, self.open_seconds)
+                    self.samples[provider] = deque(maxlen=self.window)
+                    self.calls[provider] = 0
+                    self.failures[provider] = 0
+
+    def order(self) -> List[str]:
+        """Providers to try, healthiest first; open circuits are left out.
+
+        Healthy providers and half-open ones awaiting their trial call come in
+        order of preference, then degraded providers (too many failures or
+        median latency over slow_seconds in the last window_seconds) from
+        fastest to slowest. A degraded provider left without traffic is
+        healthy again once its samples are older than window_seconds.
+        """
+        now = time.time()
+        ranked = []
+        with self._lock:
+            for index, provider in enumerate(self.providers):
+                breaker = self.breakers[provider]
+                if not breaker.available(now):
+                    continue
+                samples = self._recent(provider, now)
+                if breaker.state == HALF_OPEN or self._healthy(samples):
+                    ranked.append((0, index, provider))
+                else:
+                    ranked.append((1, self._median_latency(samples), provider))
+        return [provider for _, _, provider in sorted(ranked)]
+
+    def acquire(self, provider: str) -> bool:
+        """Whether a call to provider may start now (see CircuitBreaker.acquire)."""
+        with self._lock:
+            return self.breakers[provider].acquire(time.time())
+
+    def record(self, provider: str, seconds: float, ok: bool) -> None:
+        """Record the outcome of a call started with acquire()."""
+        now = time.time()
+        with self._lock:
+            breaker = self.breakers[provider]
+            if ok and breaker.state == HALF_OPEN:
+                # The provider recovered: earlier failures no longer describe it
+                self.samples[provider].clear()
+            breaker.record(ok, now)
+            self.samples[provider].append((now, seconds, ok))
+            self.calls[provider] += 1
+            if not ok:
+                self.failures[provider] += 1
+
+    def record_fallback(self) -> None:
+        with self._lock:
+            self.cli_fallbacks += 1
+
+    def _recent(self, provider: str, now: float) -> List[Tuple[float, bool]]:
+        """(seconds, ok) of the calls made in the last window_seconds."""
+        return [(seconds, ok) for at, seconds, ok in self.samples[provider] if now - at <= self.window_seconds]
+
+    def _healthy(self, samples: List[Tuple[float, bool]]) -> bool:
+        failures = sum(1 for _, ok in samples if not ok)
+        if len(samples) >= MIN_SAMPLES and failures >= MAX_ERROR_RATE * len(samples):
+            return False
+        # Without a successful call there is no latency to judge
+        return failures == len(samples) or self._median_latency(samples) <= self.slow_seconds
+
+    @staticmethod
+    def _median_latency(samples: List[Tuple[float, bool]]) -> float:
+        latencies = sorted(seconds for seconds, ok in samples if ok)
+        return latencies[len(latencies) // 2] if latencies else float("inf")
+
+    def stats(self) -> Dict[str, Any]:
+        """Routing order and, per provider, circuit state, error rate and latency percentiles."""
+        order = self.order()
+        providers = {}
+        with self._lock:
+            now = time.time()
+            for provider in self.providers:
+                breaker = self.breakers[provider]
+                samples = self._recent(provider, now)
+                latencies = sorted(seconds for seconds, ok in samples if ok)
+                providers[provider] = {
+                    "state": breaker.state,
+                    "healthy": self._healthy(samples),
+                    "calls": self.calls[provider],
+                    "failures": self.failures[provider],
+                    "consecutive_failures": breaker.consecutive_failures,
+                    "error_rate": round(sum(1 for _, ok in samples if not ok) / len(samples), 3) if samples else 0.0,
+                    "p50_ms": round(latencies[len(latencies) // 2] * 1000) if latencies else None,
+                    "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000) if latencies else None,
+                    "retry_in_seconds": (round(max(0.0, breaker.opened_at + breaker.open_seconds - now), 1)
+                                         if breaker.state == OPEN else None),
+                }
+        return {"order": order, "providers": providers, "cli_fallbacks": self.cli_fallbacks}
+
+
+def router_from_env() -> ProviderRouter:
+    """Router configured from LLM_ROUTER_FAILURE_THRESHOLD, LLM_ROUTER_OPEN_SECONDS,
+    LLM_ROUTER_WINDOW, LLM_ROUTER_WINDOW_SECONDS and LLM_ROUTER_SLOW_SECONDS."""
+    return ProviderRouter(
+        failure_threshold=int(os.getenv("LLM_ROUTER_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD)),
+        open_seconds=float(os.getenv("LLM_ROUTER_OPEN_SECONDS", DEFAULT_OPEN_SECONDS)),
+        window=int(os.getenv("LLM_ROUTER_WINDOW", DEFAULT_WINDOW)),
+        window_seconds=float(os.getenv("LLM_ROUTER_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS)),
+        slow_seconds=float(os.getenv("LLM_ROUTER_SLOW_SECONDS", DEFAULT_SLOW_SECONDS)),
+    )
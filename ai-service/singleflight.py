@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Coalescing of identical concurrent calls.
+SingleFlight runs one call per key at a time: the first caller executes it
+and callers arriving while it runs wait for the same result (or exception)
+instead of repeating the work. Used by LlamaService so identical prompts
+submitted in parallel cost a single provider call.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Shares the result of an in-flight call with concurrent callers of the same key."""
+
+    def __init__(self):
+        self.executed = 0
+        self.shared = 0
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[str, "asyncio.Task"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return fn(), or the result of the call already running for key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaitable do(). The call runs as its own task, so a caller that is
+        cancelled does not cancel it for the others."""
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fn())
+                self._tasks[key] = task
+                task.add_done_callback(lambda done: self._forget(key, done))
+                self.executed += 1
+            else:
+                self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task") -> None:
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Calls executed, calls that shared an in-flight result, and calls running."""
+        return {
+            "executed": self.executed,
+            "coalesced": self.shared,
+            "in_flight": len(self._calls) + len(self._tasks),
+        }
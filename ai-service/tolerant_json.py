@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Single-pass, tolerant parsing of JSON embedded in LLM responses.
+parse_first_json() finds the first object or array in the text and builds
+it in one left-to-right scan, repairing the defects models commonly produce:
+prose or code fences around the JSON, trailing or missing commas,
+mismatched or extra closers, stray backslashes, and output truncated
+mid-string or mid-object (max_tokens). Text after the first complete value
+is ignored. Every repair is reported so callers can log what was changed.
+Well-formed values, including the intact parts of a damaged response, are
+decoded by json's C scanner; only the defects are walked token by token.
+"""
+
+import re
+from json.decoder import JSONDecodeError, JSONDecoder, scanstring
+from typing import Any, List, Tuple
+
+WHITESPACE = re.compile(r'\s*')
+NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?')
+# Body of a string up to its closing quote (or the end of the text)
+STRING_BODY = re.compile(r'(?:[^"\\]|\\.)*', re.DOTALL)
+# Escapes JSON accepts; any other backslash is taken literally
+ESCAPE = re.compile(r'\\(["\\/bfnrt]|u[0-9a-fA-F]{4})|\\')
+# Backslashes, and the start of a \u escape, at the end of a cut-off string
+TRAILING_ESCAPE = re.compile(r'(\\+)(u[0-9a-fA-F]{0,3})?$')
+LITERALS = (("true", True), ("false", False), ("null", None),
+            ("True", True), ("False", False), ("None", None))
+CLOSERS = {"}": "{", "]": "["}
+# First characters of a value (or key) after which a missing comma is assumed
+VALUE_START = frozenset('"{[-0123456789tfnTFN')
+
+# What an open container expects next
+KEY = "key"        # object: a key or "}"
+COLON = "colon"    # object: ":" after a key
+VALUE = "value"    # a value, or "]" right after "["
+COMMA = "comma"    # "," or the closer, after a member or item
+
+_SKIPPED = object()
+_DECODER = JSONDecoder()
+
+
+def parse_first_json(text: str, openers: str = "{[") -> Tuple[Any, List[str]]:
+    """Parse the first JSON value starting with one of openers in text.
+
+    Returns (value, repairs): value is None when text contains no opener;
+    repairs lists the fixes applied and is empty for valid JSON.
+    """
+    starts = [i for i in (text.find(opener) for opener in openers) if i >= 0]
+    if not starts:
+        return None, []
+    start = min(starts)
+    try:
+        # Valid JSON is decoded by the C scanner; only defects need the slow path
+        return _DECODER.raw_decode(text, start)[0], []
+    except JSONDecodeError:
+        return _Parser(text).parse(start)
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.repairs: List[str] = []
+        # Open containers as [opener, container, pending key, expected token,
+        # whether the last separator was a comma read from the text]
+        self.stack: List[list] = []
+
+    def parse(self, start: int) -> Tuple[Any, List[str]]:
+        text = self.text
+        self.pos = start
+        self._open(text[start])
+        while True:
+            self.pos = WHITESPACE.match(text, self.pos).end()
+            if self.pos >= len(text):
+                return self._close_all(), self.repairs
+
+            char = text[self.pos]
+            if char in CLOSERS:
+                closed = self._close(char)
+                if closed is not _SKIPPED and not self.stack:
+                    return closed, self.repairs
+                continue
+
+            frame = self.stack[-1]
+            if char == ",":
+                if frame[3] == COMMA:
+                    frame[3] = KEY if frame[0] == "{" else VALUE
+                    frame[4] = True
+                else:
+                    self.repairs.append(f"dropped extra comma at {self.pos}")
+                self.pos += 1
+                continue
+
+            if frame[3] == COMMA:
+                if char not in VALUE_START:
+                    self.repairs.append(f"skipped unexpected {char!r} at {self.pos}")
+                    self.pos += 1
+                    continue
+                self.repairs.append(f"inserted missing comma at {self.pos}")
+                frame[3] = KEY if frame[0] == "{" else VALUE
+            if frame[3] == COLON:
+                if char == ":":
+                    frame[3] = VALUE
+                    self.pos += 1
+                    continue
+                self.repairs.append(f"inserted missing colon at {self.pos}")
+                frame[3] = VALUE
+
+            if frame[3] == KEY:
+                if char == '"':
+                    frame[2] = self._string()
+                    frame[3] = COLON
+                else:
+                    self.repairs.append(f"skipped unexpected {char!r} at {self.pos}")
+                    self.pos += 1
+            elif char in "{[":
+                self._container(char)
+            else:
+                value = self._scalar(char)
+                if value is not _SKIPPED:
+                    self._add(value)
+
+    def _container(self, char: str) -> None:
+        """Add the container starting at pos: well-formed ones are decoded
+        whole by the C scanner, others are opened and parsed token by token."""
+        try:
+            value, end = _DECODER.raw_decode(self.text, self.pos)
+        except JSONDecodeError:
+            self._open(char)
+            return
+        self.pos = end
+        self._add(value)
+
+    def _open(self, char: str) -> None:
+        if char == "{":
+            self.stack.append(["{", {}, None, KEY, False])
+        else:
+            self.stack.append(["[", [], None, VALUE, False])
+        self.pos += 1
+
+    def _add(self, value: Any) -> None:
+        frame = self.stack[-1]
+        if frame[0] == "{":
+            frame[1][frame[2]] = value
+            frame[2] = None
+        else:
+            frame[1].append(value)
+        frame[3] = COMMA
+        frame[4] = False
+
+    def _finish(self, frame: list, where: str) -> None:
+        """Note what is missing from a container being closed."""
+        if frame[4] and frame[3] in (KEY, VALUE) and (frame[0] == "[" or frame[2] is None):
+            self.repairs.append(f"removed trailing comma {where}")
+        if frame[0] == "{" and frame[2] is not None:
+            self.repairs.append(f"dropped key {frame[2]!r} without a value {where}")
+
+    def _close(self, char: str) -> Any:
+        """Close the containers up to the one char closes and return it, or
+        _SKIPPED for a closer without a matching opener."""
+        position = self.pos
+        self.pos += 1
+        opener = CLOSERS[char]
+        if not any(frame[0] == opener for frame in self.stack):
+            self.repairs.append(f"dropped unmatched {char!r} at {position}")
+            return _SKIPPED
+        while True:
+            frame = self.stack.pop()
+            self._finish(frame, f"at {position}")
+            if frame[0] != opener:
+                self.repairs.append(f"closed {frame[0]!r} left open at {position}")
+            if self.stack:
+                self._add(frame[1])
+            if frame[0] == opener:
+                return frame[1]
+
+    def _close_all(self) -> Any:
+        """Close every container left open when the text ends."""
+        self.repairs.append(f"closed {len(self.stack)} container(s) left open at end of text")
+        while True:
+            frame = self.stack.pop()
+            self._finish(frame, "at end of text")
+            if not self.stack:
+                return frame[1]
+            self._add(frame[1])
+
+    def _string(self) -> str:
+        """Decode the string starting at pos; a string cut off by the end of
+        the text is kept as far as it goes."""
+        start = self.pos + 1
+        try:
+            value, self.pos = scanstring(self.text, start, False)
+            return value
+        except JSONDecodeError:
+            pass
+
+        end = STRING_BODY.match(self.text, start).end()
+        body = self.text[start:end]
+        if self.text.startswith('"', end):
+            self.pos = end + 1
+        else:
+            self.pos = len(self.text)
+            self.repairs.append("closed string truncated at end of text")
+            cut = TRAILING_ESCAPE.search(body)
+            if cut and len(cut.group(1)) % 2:
+                body = body[:cut.end(1) - 1]
+        fixed = ESCAPE.sub(lambda m: m.group(0) if m.group(1) else "\\\\", body)
+        if fixed != body:
+            self.repairs.append(f"escaped stray backslash in string at {start - 1}")
+        return scanstring(fixed + '"', 0, False)[0]
+
+    def _scalar(self, char: str) -> Any:
+        if char == '"':
+            return self._string()
+        match = NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            number = match.group()
+            return float(number) if match.group(1) or match.group(2) else int(number)
+        for literal, value in LITERALS:
+            if self.text.startswith(literal, self.pos):
+                if literal[0].isupper():
+                    self.repairs.append(f"read Python literal {literal} at {self.pos}")
+                self.pos += len(literal)
+                return value
+        self.repairs.append(f"skipped unexpected {char!r} at {self.pos}")
+        self.pos += 1
+        return _SKIPPED
@@ -5,93 +5,168 @@ Uses pattern recognition and contextual clues to identify addresses without hard
 """
 
 import re
-from typing import List
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 
-def extract_address_dynamic(text: str) -> str:
+# Candidates whose word sets overlap by more than this are near-duplicates
+DUPLICATE_SIMILARITY = 0.7
+
+
+def _any_of(patterns: Sequence[str], flags: int = 0) -> "re.Pattern":
+    """Merge a pattern family into one alternation; a search of it is any(search(p))."""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), flags)
+
+
+class AddressExtractor:
     """
-    Dynamic address extraction for English and French CVs.
-    Uses pattern recognition and contextual clues to identify addresses without hardcoded dictionaries.
+    Address engine for English and French CVs.
+    Every pattern family is compiled once as a single alternation, and the
+    per-line predicates are memoized so each line is classified only once.
     """
-    
-    def clean_and_normalize(text: str) -> str:
+
+    # Address-related keywords in English/French (matched on lowercased text)
+    ADDRESS_INDICATORS = _any_of([
+        # English
+        r'\baddress\b', r'\bhome\b', r'\blocation\b', r'\bresidence\b', r'\bresidential\b',
+        r'\blives?\s+(?:at|in)\b', r'\bresiding\s+(?:at|in)\b', r'\bdomiciled\s+(?:at|in)\b',
+        # French
+        r'\badresse\b', r'\bdomicile\b', r'\brésidence\b', r'\blieu\s+de\s+résidence\b',
+        r'\bdemeurant\s+(?:à|au|aux)\b', r'\bhabite\s+(?:à|au|aux)\b',
+    ])
+
+    # Postal codes of various countries
+    POSTAL_CODE = _any_of([
+        r'\b\d{5}(?:-\d{4})?\b',      # US: 12345 or 12345-6789
+        r'\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b',  # Canada: K1A 0A6
+        r'\b\d{5}\b',                  # France/Morocco: 75001
+        r'\b[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}\b',  # UK: SW1A 1AA
+        r'\b\d{4}\s?[A-Z]{2}\b',       # Netherlands: 1012 AB
+        r'\b\d{5}\s+\w+\b',            # Germany: 10115 Berlin
+    ], re.IGNORECASE)
+
+    # Words that commonly appear in addresses (matched on lowercased text)
+    STRUCTURE_WORDS = _any_of([
+        # Numbers + street indicators
+        r'\b\d+\s*[,.]?\s*\w+',  # Street numbers
+        # English street types
+        r'\b(?:street|st\.?|road|rd\.?|avenue|ave\.?|boulevard|blvd\.?|lane|ln\.?|drive|dr\.?|court|ct\.?|place|pl\.?|way|circle|square|park|plaza)\b',
+        # French street types
+        r'\b(?:rue|avenue|boulevard|place|impasse|allée|chemin|route|quai|cours|passage|villa|square|esplanade|promenade)\b',
+        # Building/housing types
+        r'\b(?:apartment|apt\.?|suite|unit|floor|building|house|residence|complex)\b',
+        r'\b(?:appartement|appt\.?|étage|bâtiment|maison|résidence|immeuble|villa)\b',
+        # Area/district indicators
+        r'\b(?:district|neighborhood|area|zone|sector|quarter|region)\b',
+        r'\b(?:quartier|secteur|zone|région|arrondissement)\b',
+    ])
+
+    # Geographic/location indicators
+    GEOGRAPHIC = _any_of([
+        r'\b\w+\s*,\s*\w+',  # City, State/Country pattern
+        # A run of proper nouns ends in one that starts on a word boundary,
+        # so only that last noun needs matching (no nested repetition)
+        r'\b[A-Z][a-z]+\s*,',  # Proper noun followed by comma
+        r'\b\w+\s+\d{4,5}\b',   # Location + postal code
+        r'\b[A-Z][a-z]+\s*\d{4,5}\b',  # Capitalized location + postal
+        # Country indicators (common ones)
+        r'\b(?:france|canada|usa|united\s+states|uk|united\s+kingdom|germany|spain|italy|morocco|maroc)\b',
+    ], re.IGNORECASE)
+
+    # State/province abbreviations or full names
+    STATE_PROVINCE = _any_of([
+        r'\b[A-Z]{2}\s+\d{5}\b',  # US state abbreviation + ZIP
+        r'\b(?:ON|BC|AB|QC|NS|NB|MB|SK|PE|NL|NT|YT|NU)\s+[A-Z]\d[A-Z]\s?\d[A-Z]\d\b',  # Canadian provinces
+        r'\b\d{5}\s+[A-Z][a-z]+\b',  # Postal code + city/state
+    ])
+
+    # Each matching family costs 3 points, so they stay separate patterns
+    NON_ADDRESS_INDICATORS = [re.compile(p) for p in [
+        r'\b(?:email|telephone|phone|mobile|cell|fax|tel|gsm|contact)\b',
+        r'\b(?:experience|education|formation|compétences|skills|work|employment|job)\b',
+        r'\b(?:born|né|date|age|single|married|célibataire|marié|divorced)\b',
+        r'\b(?:objective|summary|profile|profil|résumé|curriculum)\b',
+        r'@',  # Email addresses
+        r'(?:\+|00)\d{10,}',  # Long phone numbers
+        r'\b(?:https?://|www\.)',  # URLs
+        r'\b(?:mr\.?|mrs\.?|ms\.?|dr\.?|prof\.?|m\.?|mme\.?|mlle\.?)\s+\w+',  # Titles + names
+    ]]
+
+    # Text after an address indicator, tried in order
+    INDICATOR_VALUES = [re.compile(p, re.IGNORECASE) for p in [
+        r'(?:address|adresse|location|domicile|résidence)\s*:?\s*(.+)',
+        r'(?:lieu\s+de\s+résidence|home\s+address|residential\s+address)\s*:?\s*(.+)',
+        r'(?:lives?\s+(?:at|in)|residing\s+(?:at|in)|domiciled\s+(?:at|in))\s*(.+)',
+        r'(?:demeurant\s+(?:à|au|aux)|habite\s+(?:à|au|aux))\s*(.+)',
+    ]]
+
+    # Whole-text candidates are found by linear scanners (see
+    # extract_candidates_from_patterns) built from these bounded pieces.
+    # (postal code, where one can start, context kept after it)
+    POSTAL_FORMS = [
+        (re.compile(r'\b\d{5}(?:-\d{4})?\b'), 'digit', 50),  # US ZIP
+        (re.compile(r'\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b'), 'upper', 30),  # Canadian postal
+        (re.compile(r'\b[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}\b'), 'upper', 30),  # UK postal
+        (re.compile(r'\b\d{5}\b'), 'digit', 50),  # General 5-digit postal
+    ]
+    POSTAL_MIN_PREFIX = 15
+    STREET_TYPES = re.compile(r'street|st\.?|road|rd\.?|avenue|ave\.?|boulevard|blvd\.?|rue', re.IGNORECASE)
+    NUMBERED_STREET_TYPES = re.compile(r'street|st\.?|road|rd\.?|avenue|ave\.?|rue', re.IGNORECASE)
+    LETTER_WORD_START = re.compile(r'\b[A-Z][a-z]', re.IGNORECASE)
+    STRUCTURE_MIN_TAIL = 5
+
+    LINE_BREAK = re.compile(r'[\n\r]')
+    BOUNDARY_DIGIT = re.compile(r'\b\d')
+    BOUNDARY_UPPER = re.compile(r'\b[A-Z]')
+    BOUNDARY_4_DIGITS = re.compile(r'\b\d{4}')
+    TITLE_WORD = re.compile(r'[A-Z][a-z]+')
+    WHITESPACE_RUN = re.compile(r'\s+')
+    # Zero-width so that "Lyon, Rabat" is found inside "Paris, Lyon, Rabat"
+    TITLE_COMMA_TITLE = re.compile(r'(?=[A-Z][a-z]+\s*,\s*([A-Z][a-z]+))')
+
+    HORIZONTAL_WHITESPACE = re.compile(r'[ \t]+')
+    NEWLINES = re.compile(r'\n+')
+    NUMBER = re.compile(r'\d+')
+    WORD_NUMBER = re.compile(r'\b\d+\b')
+    CAPITALIZED_WORD = re.compile(r'\b[A-Z][a-z]+')
+
+    def __init__(self, cache_size: int = 4096):
+        # Per-instance memo of the line predicates; a line or candidate is
+        # tested at most once per predicate however often it is scored
+        self.has_address_indicators = lru_cache(maxsize=cache_size)(self._has_address_indicators)
+        self.has_postal_code = lru_cache(maxsize=cache_size)(self._has_postal_code)
+        self.has_address_structure_words = lru_cache(maxsize=cache_size)(self._has_address_structure_words)
+        self.has_geographic_indicators = lru_cache(maxsize=cache_size)(self._has_geographic_indicators)
+        self.has_state_province_pattern = lru_cache(maxsize=cache_size)(self._has_state_province_pattern)
+
+    def clean_and_normalize(self, text: str) -> str:
         """Clean text while preserving structure."""
         # Remove excessive whitespace but keep line breaks
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = re.sub(r'\n+', '\n', text)
+        text = self.HORIZONTAL_WHITESPACE.sub(' ', text)
+        text = self.NEWLINES.sub('\n', text)
         return text.strip()
-    
-    def has_address_indicators(line: str) -> bool:
+
+    def _has_address_indicators(self, line: str) -> bool:
         """Check if line contains address-related keywords in English/French."""
-        address_keywords = [
-            # English
-            r'\baddress\b', r'\bhome\b', r'\blocation\b', r'\bresidence\b', r'\bresidential\b',
-            r'\blives?\s+(?:at|in)\b', r'\bresiding\s+(?:at|in)\b', r'\bdomiciled\s+(?:at|in)\b',
-            # French
-            r'\badresse\b', r'\bdomicile\b', r'\brésidence\b', r'\blieu\s+de\s+résidence\b',
-            r'\bdemeurant\s+(?:à|au|aux)\b', r'\bhabite\s+(?:à|au|aux)\b',
-        ]
-        
-        line_lower = line.lower()
-        return any(re.search(keyword, line_lower) for keyword in address_keywords)
-    
-    def has_postal_code(text: str) -> bool:
+        return self.ADDRESS_INDICATORS.search(line.lower()) is not None
+
+    def _has_postal_code(self, text: str) -> bool:
         """Check if text contains postal code patterns (various countries)."""
-        postal_patterns = [
-            r'\b\d{5}(?:-\d{4})?\b',      # US: 12345 or 12345-6789
-            r'\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b',  # Canada: K1A 0A6
-            r'\b\d{5}\b',                  # France/Morocco: 75001
-            r'\b[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}\b',  # UK: SW1A 1AA
-            r'\b\d{4}\s?[A-Z]{2}\b',       # Netherlands: 1012 AB
-            r'\b\d{5}\s+\w+\b',            # Germany: 10115 Berlin
-        ]
-        
-        return any(re.search(pattern, text, re.IGNORECASE) for pattern in postal_patterns)
-    
-    def has_address_structure_words(text: str) -> bool:
+        return self.POSTAL_CODE.search(text) is not None
+
+    def _has_address_structure_words(self, text: str) -> bool:
         """Check for words that commonly appear in addresses (English/French)."""
-        structure_patterns = [
-            # Numbers + street indicators
-            r'\b\d+\s*[,.]?\s*\w+',  # Street numbers
-            # English street types
-            r'\b(?:street|st\.?|road|rd\.?|avenue|ave\.?|boulevard|blvd\.?|lane|ln\.?|drive|dr\.?|court|ct\.?|place|pl\.?|way|circle|square|park|plaza)\b',
-            # French street types
-            r'\b(?:rue|avenue|boulevard|place|impasse|allée|chemin|route|quai|cours|passage|villa|square|esplanade|promenade)\b',
-            # Building/housing types
-            r'\b(?:apartment|apt\.?|suite|unit|floor|building|house|residence|complex)\b',
-            r'\b(?:appartement|appt\.?|étage|bâtiment|maison|résidence|immeuble|villa)\b',
-            # Area/district indicators
-            r'\b(?:district|neighborhood|area|zone|sector|quarter|region)\b',
-            r'\b(?:quartier|secteur|zone|région|arrondissement)\b',
-        ]
-        
-        text_lower = text.lower()
-        return any(re.search(pattern, text_lower) for pattern in structure_patterns)
-    
-    def has_geographic_indicators(text: str) -> bool:
+        return self.STRUCTURE_WORDS.search(text.lower()) is not None
+
+    def _has_geographic_indicators(self, text: str) -> bool:
         """Check for geographic/location indicators."""
-        geo_patterns = [
-            r'\b\w+\s*,\s*\w+',  # City, State/Country pattern
-            r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s*,',  # Proper noun followed by comma
-            r'\b\w+\s+\d{4,5}\b',   # Location + postal code
-            r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s*\d{4,5}\b',  # Capitalized location + postal
-            # Country indicators (common ones)
-            r'\b(?:france|canada|usa|united\s+states|uk|united\s+kingdom|germany|spain|italy|morocco|maroc)\b',
-        ]
-        
-        return any(re.search(pattern, text, re.IGNORECASE) for pattern in geo_patterns)
-    
-    def has_state_province_pattern(text: str) -> bool:
+        return self.GEOGRAPHIC.search(text) is not None
+
+    def _has_state_province_pattern(self, text: str) -> bool:
         """Check for state/province abbreviations or full names."""
-        # Common patterns for states/provinces
-        state_patterns = [
-            r'\b[A-Z]{2}\s+\d{5}\b',  # US state abbreviation + ZIP
-            r'\b(?:ON|BC|AB|QC|NS|NB|MB|SK|PE|NL|NT|YT|NU)\s+[A-Z]\d[A-Z]\s?\d[A-Z]\d\b',  # Canadian provinces
-            r'\b\d{5}\s+[A-Z][a-z]+\b',  # Postal code + city/state
-        ]
-        
-        return any(re.search(pattern, text) for pattern in state_patterns)
-    
-    def score_address_candidate(candidate: str) -> int:
+        return self.STATE_PROVINCE.search(text) is not None
+
+    def score_address_candidate(self, candidate: str) -> int:
         """Score a potential address based on various criteria."""
         score = 0
         candidate_lower = candidate.lower()
@@ -106,24 +181,28 @@ def extract_address_dynamic(text: str) -> str:
         elif length > 300:
             score -= 2  # Too long, probably not just an address
         
+        has_postal = self.has_postal_code(candidate)
+        has_structure = self.has_address_structure_words(candidate)
+        has_geo = self.has_geographic_indicators(candidate)
+        
         # Has postal code (strong indicator)
-        if has_postal_code(candidate):
+        if has_postal:
             score += 5
         
         # Has address structure words
-        if has_address_structure_words(candidate):
+        if has_structure:
             score += 4
         
         # Has geographic indicators
-        if has_geographic_indicators(candidate):
+        if has_geo:
             score += 3
         
         # Has state/province pattern
-        if has_state_province_pattern(candidate):
+        if self.has_state_province_pattern(candidate):
             score += 2
         
         # Contains numbers (street numbers, postal codes)
-        number_count = len(re.findall(r'\d+', candidate))
+        number_count = len(self.NUMBER.findall(candidate))
         if number_count >= 1:
             score += min(number_count, 3)  # Cap at 3 points
         
@@ -135,38 +214,21 @@ def extract_address_dynamic(text: str) -> str:
             score -= 1  # Too many commas might be a list
         
         # Proper capitalization (addresses often have proper nouns)
-        capital_words = len(re.findall(r'\b[A-Z][a-z]+', candidate))
+        capital_words = len(self.CAPITALIZED_WORD.findall(candidate))
         if capital_words >= 2:
             score += min(capital_words // 2, 3)
         
         # Avoid obviously non-address content
-        non_address_indicators = [
-            r'\b(?:email|telephone|phone|mobile|cell|fax|tel|gsm|contact)\b',
-            r'\b(?:experience|education|formation|compétences|skills|work|employment|job)\b',
-            r'\b(?:born|né|date|age|single|married|célibataire|marié|divorced)\b',
-            r'\b(?:objective|summary|profile|profil|résumé|curriculum)\b',
-            r'@',  # Email addresses
-            r'(?:\+|00)\d{10,}',  # Long phone numbers
-            r'\b(?:https?://|www\.)',  # URLs
-            r'\b(?:mr\.?|mrs\.?|ms\.?|dr\.?|prof\.?|m\.?|mme\.?|mlle\.?)\s+\w+',  # Titles + names
-        ]
-        
-        penalty_count = 0
-        for pattern in non_address_indicators:
-            if re.search(pattern, candidate_lower):
-                penalty_count += 1
-        
+        penalty_count = sum(1 for pattern in self.NON_ADDRESS_INDICATORS if pattern.search(candidate_lower))
         score -= penalty_count * 3  # Heavy penalty for non-address indicators
         
         # Bonus for complete-looking addresses
-        if (has_postal_code(candidate) and 
-            has_address_structure_words(candidate) and 
-            has_geographic_indicators(candidate)):
+        if has_postal and has_structure and has_geo:
             score += 3
         
         return max(0, score)  # Don't go below 0
-    
-    def extract_candidates_from_lines(text: str) -> List[str]:
+
+    def extract_candidates_from_lines(self, text: str) -> List[str]:
         """Extract address candidates from text lines."""
         candidates = []
         lines = text.split('\n')
@@ -177,17 +239,10 @@ def extract_address_dynamic(text: str) -> str:
                 continue
             
             # Method 1: Lines with address indicators
-            if has_address_indicators(line):
+            if self.has_address_indicators(line):
                 # Extract everything after the indicator
-                patterns = [
-                    r'(?:address|adresse|location|domicile|résidence)\s*:?\s*(.+)',
-                    r'(?:lieu\s+de\s+résidence|home\s+address|residential\s+address)\s*:?\s*(.+)',
-                    r'(?:lives?\s+(?:at|in)|residing\s+(?:at|in)|domiciled\s+(?:at|in))\s*(.+)',
-                    r'(?:demeurant\s+(?:à|au|aux)|habite\s+(?:à|au|aux))\s*(.+)'
-                ]
-                
-                for pattern in patterns:
-                    match = re.search(pattern, line, re.IGNORECASE)
+                for pattern in self.INDICATOR_VALUES:
+                    match = pattern.search(line)
                     if match:
                         extracted = match.group(1).strip()
                         if extracted:
@@ -198,122 +253,356 @@ def extract_address_dynamic(text: str) -> str:
                     candidates.append(line)
             
             # Method 2: Lines that structurally look like addresses
-            elif (has_address_structure_words(line) or 
-                  has_postal_code(line) or 
-                  has_geographic_indicators(line) or
-                  has_state_province_pattern(line)):
+            elif (self.has_address_structure_words(line) or
+                  self.has_postal_code(line) or
+                  self.has_geographic_indicators(line) or
+                  self.has_state_province_pattern(line)):
                 candidates.append(line)
             
             # Method 3: Multi-line addresses (combine with next line if it looks related)
-            if (i < len(lines) - 1 and 
-                (has_address_structure_words(line) or re.search(r'\b\d+\b', line)) and
-                not has_postal_code(line)):
+            if (i < len(lines) - 1 and
+                (self.has_address_structure_words(line) or self.WORD_NUMBER.search(line)) and
+                not self.has_postal_code(line)):
                 next_line = lines[i + 1].strip()
-                if (next_line and 
-                    (has_postal_code(next_line) or 
-                     has_geographic_indicators(next_line) or
-                     has_state_province_pattern(next_line))):
+                if (next_line and
+                    (self.has_postal_code(next_line) or
+                     self.has_geographic_indicators(next_line) or
+                     self.has_state_province_pattern(next_line))):
                     combined = f"{line}, {next_line}".strip()
                     candidates.append(combined)
         
         return candidates
-    
-    def extract_candidates_from_patterns(text: str) -> List[str]:
-        """Extract candidates using regex patterns."""
+
+    def extract_candidates_from_patterns(self, text: str) -> List[str]:
+        """Extract candidates from the whole text.
+        
+        Each scanner returns exactly what findall of its original pattern
+        (quoted in the scanner docstring) returned. Only bounded regexes
+        are run, so the cost grows linearly with the text instead of
+        backtracking over long lines.
+        """
+        layout = _TextLayout(self, text)
         candidates = []
         
         # Pattern 1: Text with postal codes and surrounding context
-        postal_patterns = [
-            r'([^\n\r]{15,}?\b\d{5}(?:-\d{4})?\b[^\n\r]{0,50})',  # US ZIP
-            r'([^\n\r]{15,}?\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b[^\n\r]{0,30})',  # Canadian postal
-            r'([^\n\r]{15,}?\b[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}\b[^\n\r]{0,30})',  # UK postal
-            r'([^\n\r]{15,}?\b\d{5}\b[^\n\r]{0,50})',  # General 5-digit postal
-        ]
-        
-        for pattern in postal_patterns:
-            matches = re.findall(pattern, text)
-            candidates.extend(matches)
+        for postal, start_kind, tail in self.POSTAL_FORMS:
+            candidates.extend(self._scan_postal_context(layout, postal, start_kind, tail))
         
         # Pattern 2: Structured address patterns
-        structure_patterns = [
-            r'([^\n\r]*(?:street|st\.?|road|rd\.?|avenue|ave\.?|boulevard|blvd\.?|rue|avenue|boulevard)[^\n\r]{5,})',
-            r'([^\n\r]*\b\d+[^\n\r]*(?:street|st\.?|road|rd\.?|avenue|ave\.?|rue|avenue)[^\n\r]{5,})',
-            r'(\b\d+[^\n\r,]*,[^\n\r]*\b[A-Z][a-z]+[^\n\r]{5,})',  # Number, comma, capitalized location
-        ]
-        
-        for pattern in structure_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            candidates.extend(matches)
+        candidates.extend(self._scan_street_lines(layout))
+        candidates.extend(self._scan_numbered_street_lines(layout))
+        candidates.extend(self._scan_number_comma_location(layout))
         
         # Pattern 3: Geographic patterns with proper capitalization
-        geo_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*[^\n\r]*\b\d{4,5}[^\n\r]*)',  # City + postal
-            r'([^\n\r]*[A-Z][a-z]+\s*,\s*[A-Z][a-z]+[^\n\r]*\b\d{4,5}[^\n\r]*)',  # City, State/Country + postal
-            r'(\b\d+[^\n\r]*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*[^\n\r]*)',  # Street number + capitalized words
-        ]
-        
-        for pattern in geo_patterns:
-            matches = re.findall(pattern, text)
-            candidates.extend(matches)
+        candidates.extend(self._scan_titles_then_postal(layout))
+        candidates.extend(self._scan_title_pair_then_postal(layout))
+        candidates.extend(self._scan_number_then_titles(layout))
         
         return candidates
-    
-    # Main extraction logic
-    text = clean_and_normalize(text)
-    all_candidates = []
-    
-    # Collect candidates from different methods
-    all_candidates.extend(extract_candidates_from_lines(text))
-    all_candidates.extend(extract_candidates_from_patterns(text))
-    
-    if not all_candidates:
-        return ""
-    
-    # Remove duplicates and very similar candidates
-    unique_candidates = []
-    for candidate in all_candidates:
-        candidate = candidate.strip()
-        if not candidate or len(candidate) < 10:
-            continue
+
+    def _scan_postal_context(self, layout: "_TextLayout", postal: "re.Pattern",
+                             start_kind: str, tail: int) -> List[str]:
+        """findall of [^\\n\\r]{15,}?<postal>[^\\n\\r]{0,tail}.
+        
+        A match starts at the scan position (or the start of the next line)
+        and runs to the first postal code at least 15 characters further on
+        the same line, plus up to ``tail`` characters of context.
+        """
+        text = layout.text
+        starts = layout.boundary_digits if start_kind == 'digit' else layout.boundary_uppers
+        matches = []
+        pos = 0
+        for j in starts:
+            if j < pos:
+                continue
+            start = max(pos, layout.line_start(j))
+            if j - start < self.POSTAL_MIN_PREFIX:
+                continue
+            m = postal.match(text, j)
+            if not m:
+                continue
+            end = min(m.end() + tail, layout.line_end(m.end()))
+            matches.append(text[start:end])
+            pos = end
+        return matches
+
+    def _scan_street_lines(self, layout: "_TextLayout") -> List[str]:
+        """findall of [^\\n\\r]*(?:street|st\\.?|...)[^\\n\\r]{5,} (ignoring case).
+        
+        Every line with a street type that leaves five characters after it
+        matches as a whole.
+        """
+        return [layout.text[ls:le] for ls, le in layout.lines
+                if self.STREET_TYPES.search(layout.text, ls, le - self.STRUCTURE_MIN_TAIL)]
+
+    def _scan_numbered_street_lines(self, layout: "_TextLayout") -> List[str]:
+        """findall of [^\\n\\r]*\\b\\d+[^\\n\\r]*(?:street|...)[^\\n\\r]{5,} (ignoring case).
+        
+        Like _scan_street_lines, with the street type after a number.
+        """
+        matches = []
+        for ls, le in layout.lines:
+            d = layout.first_boundary_digit(ls, le)
+            if d is not None and self.NUMBERED_STREET_TYPES.search(layout.text, d + 1, le - self.STRUCTURE_MIN_TAIL):
+                matches.append(layout.text[ls:le])
+        return matches
+
+    def _scan_number_comma_location(self, layout: "_TextLayout") -> List[str]:
+        """findall of \\b\\d+[^\\n\\r,]*,[^\\n\\r]*\\b[A-Z][a-z]+[^\\n\\r]{5,} (ignoring case).
+        
+        From the first number of a line to its end, when the first comma
+        after that number is followed by a word with room for five more
+        characters.
+        """
+        text = layout.text
+        matches = []
+        for ls, le in layout.lines:
+            d = layout.first_boundary_digit(ls, le)
+            if d is None:
+                continue
+            comma = text.find(',', d, le)
+            if comma != -1 and self.LETTER_WORD_START.search(text, comma + 1, le - self.STRUCTURE_MIN_TAIL):
+                matches.append(text[d:le])
+        return matches
+
+    def _scan_titles_then_postal(self, layout: "_TextLayout") -> List[str]:
+        """findall of [A-Z][a-z]+(?:\\s+[A-Z][a-z]+)*[^\\n\\r]*\\b\\d{4,5}[^\\n\\r]*.
+        
+        From a capitalized word, through the run of capitalized words that
+        follows it (which may continue on the next lines), to the end of the
+        line where the run stops, if that line has a 4-5 digit number after
+        the run.
+        """
+        text = layout.text
+        matches = []
+        pos = 0
+        for i, (ws, _) in enumerate(layout.words):
+            if ws < pos:
+                continue
+            run_end = layout.run_end(i)
+            le = layout.line_end(run_end)
+            if layout.has_boundary_4_digits(run_end, le):
+                matches.append(text[ws:le])
+                pos = le
+        return matches
+
+    def _scan_title_pair_then_postal(self, layout: "_TextLayout") -> List[str]:
+        """findall of [^\\n\\r]*[A-Z][a-z]+\\s*,\\s*[A-Z][a-z]+[^\\n\\r]*\\b\\d{4,5}[^\\n\\r]*.
+        
+        From the start of a line to the end of the line holding the second
+        word of its last "Word, Word" pair that is followed by a 4-5 digit
+        number (the pair may span lines).
+        """
+        text = layout.text
+        pairs_by_line: Dict[int, List[Tuple[int, int]]] = {}
+        for m in self.TITLE_COMMA_TITLE.finditer(text):
+            pairs_by_line.setdefault(layout.line_start(m.start()), []).append((m.start(), m.end(1)))
+        
+        matches = []
+        pos = 0
+        for ls in sorted(pairs_by_line):
+            if ls < pos:
+                continue
+            for _, second_end in reversed(pairs_by_line[ls]):
+                le = layout.line_end(second_end)
+                if layout.has_boundary_4_digits(second_end, le):
+                    matches.append(text[ls:le])
+                    pos = le
+                    break
+        return matches
+
+    def _scan_number_then_titles(self, layout: "_TextLayout") -> List[str]:
+        """findall of \\b\\d+[^\\n\\r]*[A-Z][a-z]+(?:\\s+[A-Z][a-z]+)*[^\\n\\r]*.
+        
+        From the first number of a line to the end of the line where the
+        run of capitalized words starting at the line's last capitalized
+        word stops.
+        """
+        text = layout.text
+        matches = []
+        pos = 0
+        for d in layout.boundary_digits:
+            if d < pos:
+                continue
+            le = layout.line_end(d)
+            i = layout.last_word_before(le)
+            if i is None or layout.words[i][0] <= d:
+                # No capitalized word after the number: skip the whole line
+                pos = le
+                continue
+            end = layout.line_end(layout.run_end(i))
+            matches.append(text[d:end])
+            pos = end
+        return matches
+
+    @staticmethod
+    def _min_overlap(size: int) -> int:
+        """Smallest word overlap that can pass the similarity threshold against a set of this size."""
+        k = int(DUPLICATE_SIMILARITY * size)
+        while k / size <= DUPLICATE_SIMILARITY:
+            k += 1
+        return k
+
+    def dedupe_candidates(self, candidates: List[str]) -> List[str]:
+        """Drop near-duplicate candidates, keeping the longer one of each pair.
+        
+        A candidate is a duplicate of the first kept candidate (in list
+        order) whose word sets overlap by more than DUPLICATE_SIMILARITY of
+        the larger set. When it is longer it replaces that candidate and
+        moves to the end of the list.
+        
+        Kept candidates are found through an inverted index over a prefix of
+        their words. Words are ordered rarest first, and a pair that can pass
+        the threshold always shares a word in both prefixes. This keeps the
+        lookup near-linear instead of comparing against every kept candidate.
+        """
+        entries = []
+        for candidate in candidates:
+            candidate = candidate.strip()
+            if candidate and len(candidate) >= 10:
+                entries.append((candidate, frozenset(candidate.lower().split())))
+        
+        frequency: Dict[str, int] = {}
+        for _, words in entries:
+            for word in words:
+                frequency[word] = frequency.get(word, 0) + 1
+        
+        def prefix(words: FrozenSet[str]) -> List[str]:
+            ordered = sorted(words, key=lambda w: (frequency[w], w))
+            return ordered[:len(words) - self._min_overlap(len(words)) + 1]
+        
+        # seq -> (candidate, words); seq order is the list order
+        kept: Dict[int, Tuple[str, FrozenSet[str]]] = {}
+        index: Dict[str, Set[int]] = {}
+        
+        def keep(seq: int, candidate: str, words: FrozenSet[str]) -> None:
+            kept[seq] = (candidate, words)
+            for word in prefix(words):
+                index.setdefault(word, set()).add(seq)
+        
+        for seq, (candidate, words) in enumerate(entries):
+            probes = set()
+            for word in prefix(words):
+                probes.update(index.get(word, ()))
             
-        # Check if this candidate is too similar to existing ones
-        is_duplicate = False
-        candidate_words = set(candidate.lower().split())
-        
-        for existing in unique_candidates:
-            existing_words = set(existing.lower().split())
-            # Calculate word overlap
-            overlap = len(candidate_words & existing_words)
-            similarity = overlap / max(len(candidate_words), len(existing_words))
+            match = None
+            for other in sorted(probes):
+                existing, existing_words = kept[other]
+                overlap = len(words & existing_words)
+                if overlap / max(len(words), len(existing_words)) > DUPLICATE_SIMILARITY:
+                    match = other
+                    break
             
-            if similarity > 0.7:  # 70% similarity threshold
-                is_duplicate = True
+            if match is None:
+                keep(seq, candidate, words)
+            elif len(candidate) > len(kept[match][0]):
                 # Keep the longer/more complete version
-                if len(candidate) > len(existing):
-                    unique_candidates.remove(existing)
-                    unique_candidates.append(candidate)
-                break
+                for word in prefix(kept[match][1]):
+                    index[word].discard(match)
+                del kept[match]
+                keep(seq, candidate, words)
         
-        if not is_duplicate:
-            unique_candidates.append(candidate)
-    
-    # Score and select the best candidate
-    scored_candidates = [(candidate, score_address_candidate(candidate)) 
-                        for candidate in unique_candidates]
-    
-    # Filter out candidates with very low scores
-    good_candidates = [c for c in scored_candidates if c[1] > 2]
-    
-    if not good_candidates:
-        # If no good candidates, try with lower threshold
-        good_candidates = [c for c in scored_candidates if c[1] > 0]
-    
-    if not good_candidates:
-        return ""
-    
-    # Return the highest-scoring candidate
-    best_candidate = max(good_candidates, key=lambda x: x[1])
-    return best_candidate[0].strip()
+        return [kept[seq][0] for seq in sorted(kept)]
+
+    def extract(self, text: str) -> str:
+        """
+        Dynamic address extraction for English and French CVs.
+        Uses pattern recognition and contextual clues to identify addresses without hardcoded dictionaries.
+        """
+        text = self.clean_and_normalize(text)
+        all_candidates = []
+        
+        # Collect candidates from different methods
+        all_candidates.extend(self.extract_candidates_from_lines(text))
+        all_candidates.extend(self.extract_candidates_from_patterns(text))
+        
+        if not all_candidates:
+            return ""
+        
+        # Remove duplicates and very similar candidates
+        unique_candidates = self.dedupe_candidates(all_candidates)
+        
+        # Score and select the best candidate
+        scored_candidates = [(candidate, self.score_address_candidate(candidate))
+                             for candidate in unique_candidates]
+        
+        # Filter out candidates with very low scores
+        good_candidates = [c for c in scored_candidates if c[1] > 2]
+        
+        if not good_candidates:
+            # If no good candidates, try with lower threshold
+            good_candidates = [c for c in scored_candidates if c[1] > 0]
+        
+        if not good_candidates:
+            return ""
+        
+        # Return the highest-scoring candidate
+        best_candidate = max(good_candidates, key=lambda x: x[1])
+        return best_candidate[0].strip()
+
+
+class _TextLayout:
+    """Line, number and capitalized-word positions of a text, for the scanners."""
+
+    def __init__(self, engine: AddressExtractor, text: str):
+        self.text = text
+        self.breaks = [m.start() for m in engine.LINE_BREAK.finditer(text)]
+        starts = [0] + [b + 1 for b in self.breaks]
+        ends = self.breaks + [len(text)]
+        self.lines = list(zip(starts, ends))
+        self.boundary_digits = [m.start() for m in engine.BOUNDARY_DIGIT.finditer(text)]
+        self.boundary_uppers = [m.start() for m in engine.BOUNDARY_UPPER.finditer(text)]
+        self.boundary_4_digits = [m.start() for m in engine.BOUNDARY_4_DIGITS.finditer(text)]
+        self.words = [m.span() for m in engine.TITLE_WORD.finditer(text)]
+        self.word_starts = [ws for ws, _ in self.words]
+        
+        # End of the whitespace-separated run of capitalized words starting
+        # at each word, computed right to left
+        self._run_ends = [0] * len(self.words)
+        for i in range(len(self.words) - 1, -1, -1):
+            end = self.words[i][1]
+            if (i + 1 < len(self.words)
+                    and engine.WHITESPACE_RUN.fullmatch(text, end, self.words[i + 1][0])):
+                end = self._run_ends[i + 1]
+            self._run_ends[i] = end
+
+    def line_start(self, pos: int) -> int:
+        i = bisect_left(self.breaks, pos)
+        return self.breaks[i - 1] + 1 if i else 0
+
+    def line_end(self, pos: int) -> int:
+        """Position of the first line break at or after pos (or the text end)."""
+        i = bisect_left(self.breaks, pos)
+        return self.breaks[i] if i < len(self.breaks) else len(self.text)
+
+    def first_boundary_digit(self, start: int, end: int) -> Optional[int]:
+        i = bisect_left(self.boundary_digits, start)
+        if i < len(self.boundary_digits) and self.boundary_digits[i] < end:
+            return self.boundary_digits[i]
+        return None
+
+    def has_boundary_4_digits(self, start: int, end: int) -> bool:
+        i = bisect_left(self.boundary_4_digits, start)
+        return i < len(self.boundary_4_digits) and self.boundary_4_digits[i] < end
+
+    def last_word_before(self, end: int) -> Optional[int]:
+        i = bisect_left(self.word_starts, end)
+        return i - 1 if i else None
+
+    def run_end(self, i: int) -> int:
+        return self._run_ends[i]
+
+
+# Shared engine; its predicate memo persists across calls
+_address_extractor = AddressExtractor()
+
+
+def extract_address_dynamic(text: str) -> str:
+    """
+    Dynamic address extraction for English and French CVs.
+    Uses pattern recognition and contextual clues to identify addresses without hardcoded dictionaries.
+    """
+    return _address_extractor.extract(text)
 
 # Simplified wrapper for easy integration
 def extract_contact_address(text: str) -> str:
@@ -54,10 +54,7 @@ def analyze_cv():
         return jsonify({"error": "File type not supported. Use PDF, DOCX, or TXT"}), 400
     try:
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        result = extractor.extract_cv_data(filepath)
-        os.remove(filepath)
+        result = extractor.extract_cv_data(file.stream, filename=filename)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
@@ -68,12 +65,7 @@ def analyze_cv_text():
     if not data or 'cv_text' not in data:
         return jsonify({"error": "No CV text provided"}), 400
     try:
-        temp_filename = "temp_cv.txt"
-        temp_filepath = os.path.join(app.config['UPLOAD_FOLDER'], temp_filename)
-        with open(temp_filepath, 'w', encoding='utf-8') as f:
-            f.write(data['cv_text'])
-        result = extractor.extract_cv_data(temp_filepath)
-        os.remove(temp_filepath)
+        result = extractor.extract_cv_data(data['cv_text'].encode('utf-8'), filename="cv_text.txt")
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
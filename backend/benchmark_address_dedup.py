@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark address candidate deduplication on synthetic multi-page CVs.
+
+"Legacy" is the previous loop that compared every candidate with every kept
+candidate and removed replaced ones from the list. "Indexed" is
+AddressExtractor.dedupe_candidates. Candidates come from the real candidate
+extractors run over generated CVs, so their overlap mirrors noisy PDFs.
+
+Usage:
+    python benchmark_address_dedup.py [--pages 5 20 60] [--repeat N]
+"""
+
+import time
+import random
+import argparse
+
+from address_extractor import AddressExtractor
+
+CITIES = ["Paris", "Lyon", "Casablanca", "Rabat", "Toronto", "Springfield", "Marseille", "Berlin", "Madrid", "Lille"]
+STREETS = ["Rue", "Avenue", "Boulevard", "Street", "Road", "Place", "Chemin", "Allée"]
+NAMES = ["Victor Hugo", "de la République", "Saint-Michel", "Oak", "Main", "Mohammed V", "des Champs", "Pasteur"]
+FILLER = [
+    "Developed REST APIs with Python and FastAPI for {n} clients",
+    "Led a team of {n} engineers on the {city} data platform",
+    "Migrated {n} services to Kubernetes in the {city} region",
+    "Project {n}: analytics dashboard for the {city} office, 2021 - 2023",
+]
+
+
+def legacy_dedupe(all_candidates):
+    unique_candidates = []
+    for candidate in all_candidates:
+        candidate = candidate.strip()
+        if not candidate or len(candidate) < 10:
+            continue
+        is_duplicate = False
+        candidate_words = set(candidate.lower().split())
+        for existing in unique_candidates:
+            existing_words = set(existing.lower().split())
+            overlap = len(candidate_words & existing_words)
+            similarity = overlap / max(len(candidate_words), len(existing_words))
+            if similarity > 0.7:
+                is_duplicate = True
+                if len(candidate) > len(existing):
+                    unique_candidates.remove(existing)
+                    unique_candidates.append(candidate)
+                break
+        if not is_duplicate:
+            unique_candidates.append(candidate)
+    return unique_candidates
+
+
+def make_cv(pages: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(pages * 40):
+        city = rng.choice(CITIES)
+        if rng.random() < 0.4:
+            lines.append(f"{rng.randint(1, 300)} {rng.choice(STREETS)} {rng.choice(NAMES)}, "
+                         f"{rng.randint(10000, 99999)} {city}")
+        else:
+            lines.append(rng.choice(FILLER).format(n=rng.randint(2, 90), city=city))
+    return "\n".join(lines)
+
+
+def time_fn(fn, candidates, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(candidates)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy vs indexed address candidate dedup")
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 20, 60], help="Synthetic CV sizes in pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    extractor = AddressExtractor()
+    rng = random.Random(42)
+
+    print(f"⏱  Address dedup benchmark ({args.repeat} iterations)")
+    print("=" * 66)
+    print(f"{'pages':>6}{'candidates':>12}{'kept':>7}{'legacy ms':>12}{'indexed ms':>12}{'speedup':>9}")
+    for pages in args.pages:
+        text = extractor.clean_and_normalize(make_cv(pages, rng))
+        candidates = extractor.extract_candidates_from_lines(text) + extractor.extract_candidates_from_patterns(text)
+
+        kept = extractor.dedupe_candidates(candidates)
+        if kept != legacy_dedupe(candidates):
+            print(f"✗ Output mismatch on {pages} page(s)")
+            continue
+
+        old = time_fn(legacy_dedupe, candidates, args.repeat)
+        new = time_fn(extractor.dedupe_candidates, candidates, args.repeat)
+        print(f"{pages:>6}{len(candidates):>12}{len(kept):>7}{old * 1000:>12.1f}{new * 1000:>12.1f}{old / new:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Adversarial-input benchmark of the whole-text address candidate search.
+
+"Legacy" runs findall with the previous candidate regexes, which backtrack
+over long lines (some of them cubically). "Scanners" runs
+AddressExtractor.extract_candidates_from_patterns. Each input is a single
+long line of a shape that triggers the backtracking; the legacy side is only
+timed up to --legacy-max characters because it takes seconds beyond that.
+
+Usage:
+    python benchmark_address_regex.py [--lengths 250 1000 4000 16000 64000] [--legacy-max 1000]
+"""
+
+import re
+import time
+import argparse
+
+from address_extractor import AddressExtractor
+
+LEGACY_CANDIDATES = [re.compile(p) for p in [
+    r'([^\n\r]{15,}?\b\d{5}(?:-\d{4})?\b[^\n\r]{0,50})',
+    r'([^\n\r]{15,}?\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b[^\n\r]{0,30})',
+    r'([^\n\r]{15,}?\b[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}\b[^\n\r]{0,30})',
+    r'([^\n\r]{15,}?\b\d{5}\b[^\n\r]{0,50})',
+]] + [re.compile(p, re.IGNORECASE) for p in [
+    r'([^\n\r]*(?:street|st\.?|road|rd\.?|avenue|ave\.?|boulevard|blvd\.?|rue|avenue|boulevard)[^\n\r]{5,})',
+    r'([^\n\r]*\b\d+[^\n\r]*(?:street|st\.?|road|rd\.?|avenue|ave\.?|rue|avenue)[^\n\r]{5,})',
+    r'(\b\d+[^\n\r,]*,[^\n\r]*\b[A-Z][a-z]+[^\n\r]{5,})',
+]] + [re.compile(p) for p in [
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*[^\n\r]*\b\d{4,5}[^\n\r]*)',
+    r'([^\n\r]*[A-Z][a-z]+\s*,\s*[A-Z][a-z]+[^\n\r]*\b\d{4,5}[^\n\r]*)',
+    r'(\b\d+[^\n\r]*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*[^\n\r]*)',
+]]
+
+ADVERSARIAL = {
+    "letters": "a",
+    "numbered words": "1 Abc ",
+    "title words": "Word ",
+    "number, comma": "1,xxxxxxxx",
+}
+
+
+def legacy_candidates(text: str):
+    candidates = []
+    for pattern in LEGACY_CANDIDATES:
+        candidates.extend(pattern.findall(text))
+    return candidates
+
+
+def time_once(fn, text: str) -> float:
+    start = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy candidate regexes vs linear scanners on adversarial lines")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[250, 1000, 4000, 16000, 64000], help="Line lengths")
+    parser.add_argument("--legacy-max", type=int, default=1000, help="Longest line the legacy regexes are timed on")
+    args = parser.parse_args()
+
+    extractor = AddressExtractor()
+
+    print("⏱  Address candidate search on one adversarial line")
+    print("=" * 62)
+    print(f"{'input':<16}{'chars':>8}{'legacy ms':>12}{'scanners ms':>13}{'µs/char':>10}")
+    for name, unit in ADVERSARIAL.items():
+        for length in args.lengths:
+            text = (unit * (length // len(unit) + 1))[:length]
+            new = time_once(extractor.extract_candidates_from_patterns, text)
+            if length <= args.legacy_max:
+                if legacy_candidates(text) != extractor.extract_candidates_from_patterns(text):
+                    print(f"✗ Output mismatch on {name} ({length} chars)")
+                old = f"{time_once(legacy_candidates, text) * 1000:.1f}"
+            else:
+                old = "—"
+            print(f"{name:<16}{length:>8}{old:>12}{new * 1000:>13.2f}{new / length * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark the windowed contact scan against the full-text scan.
+
+Synthetic CVs keep their contact block in the first lines and grow by
+appending experience pages, so the full scan slows down with length while
+the windowed scan only reads the header. A second run moves the email and
+phone to the end of the CV to time the fallback path.
+
+Usage:
+    python benchmark_contact_window.py [--pages 1 10 50 200] [--repeat N] [--window-lines 30]
+"""
+
+import io
+import time
+import argparse
+import contextlib
+
+from cv_extractor_cli import extract_contact_info, scan_contact_info, CONTACT_WINDOW_CHARS
+
+HEADER = [
+    "Marie Dupont",
+    "Backend Developer",
+    "Email: marie.dupont@email.fr | Tél: 01 42 34 56 78",
+    "Adresse: 25 Rue de la République, 75011 Paris, France",
+    "linkedin.com/in/marie-dupont",
+]
+PAGE_LINES = [
+    "EXPERIENCE",
+    "JUIN 2024 - AOÛT 2024 : Progiciel System, Backend Developer",
+    "- Built the invoicing API with FastAPI and PostgreSQL for 12 clients",
+    "- Migrated 40 services to Kubernetes in the Lyon region",
+    "SEPT 2020 - JUIN 2022 : Master Data Science (ENSA)",
+    "- Python, SQL, Docker, Kubernetes, Terraform",
+] * 8
+
+
+def make_cv(pages: int, contact_last: bool = False) -> str:
+    body = PAGE_LINES * pages
+    if contact_last:
+        return "\n".join(HEADER[:2] + body + HEADER[2:])
+    return "\n".join(HEADER + body)
+
+
+def time_scan(text: str, repeat: int, **options) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            extract_contact_info(text, **options)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text vs windowed contact extraction")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 200], help="Synthetic CV sizes in pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Iterations per measurement")
+    parser.add_argument("--window-lines", type=int, default=30, help="Lines of the header window")
+    args = parser.parse_args()
+
+    window = {"window_lines": args.window_lines, "window_chars": CONTACT_WINDOW_CHARS}
+
+    print(f"⏱  Contact extraction benchmark ({args.repeat} iterations, {args.window_lines}-line window)")
+    print("=" * 70)
+    print(f"{'contacts':<10}{'pages':>6}{'chars':>10}{'full ms':>11}{'window ms':>12}{'speedup':>9}{'scope':>12}")
+    for contact_last in (False, True):
+        for pages in args.pages:
+            text = make_cv(pages, contact_last)
+            with contextlib.redirect_stdout(io.StringIO()):
+                full_info = extract_contact_info(text)
+                window_info, scope = scan_contact_info(text, **window)
+            if window_info["emails"] != full_info["emails"] or window_info["phones"] != full_info["phones"]:
+                print(f"✗ Window missed contacts on {pages} page(s)")
+
+            full = time_scan(text, args.repeat)
+            windowed = time_scan(text, args.repeat, **window)
+            print(f"{'last' if contact_last else 'header':<10}{pages:>6}{len(text):>10}{full * 1000:>11.2f}"
+                  f"{windowed * 1000:>12.2f}{full / windowed:>8.2f}x{scope:>12}")
+
+
+if __name__ == "__main__":
+    main()
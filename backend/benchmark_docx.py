@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming DOCX reader against the python-docx object model.
+
+Runs on the DOCX files of cv_dir plus a synthetic template-heavy document
+(many styled paragraphs and a large table). Reports time per document and
+peak Python memory (tracemalloc) of each reader.
+
+Usage:
+    python benchmark_docx.py [cv_dir] [--repeat N] [--synthetic-rows N]
+"""
+
+import io
+import os
+import time
+import argparse
+import contextlib
+import tracemalloc
+
+from docx import Document
+
+from cv_extractor_cli import _extract_text_from_docx_fast
+
+
+def python_docx_text(data: bytes) -> str:
+    """Paragraphs then table cells through python-docx, as before the fast path."""
+    doc = Document(io.BytesIO(data))
+    lines = [t for t in ((p.text or "").strip() for p in doc.paragraphs) if t]
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                t = (cell.text or "").strip()
+                if t:
+                    lines.append(t)
+    return "\n".join(lines)
+
+
+def make_docx(rows: int) -> bytes:
+    doc = Document()
+    doc.add_heading("Jane Smith", level=1)
+    for i in range(rows):
+        p = doc.add_paragraph(style="List Bullet")
+        p.add_run(f"Project {i}: ").bold = True
+        p.add_run("built a data pipeline with Python, SQL and Docker")
+    table = doc.add_table(rows=rows, cols=3)
+    for i, row in enumerate(table.rows):
+        row.cells[0].text = f"20{i % 100:02d}"
+        row.cells[1].text = "Progiciel System"
+        row.cells[2].text = "Backend Developer\nInvoicing API"
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def measure(fn, data: bytes, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(data)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming DOCX reader vs python-docx")
+    parser.add_argument("cv_dir", nargs="?", default=os.path.join(os.path.dirname(__file__), "cv_files"))
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per document")
+    parser.add_argument("--synthetic-rows", type=int, default=2000, help="Paragraphs and table rows of the synthetic document")
+    args = parser.parse_args()
+
+    docs = []
+    for name in sorted(os.listdir(args.cv_dir)):
+        if name.lower().endswith(".docx"):
+            with open(os.path.join(args.cv_dir, name), "rb") as f:
+                docs.append((name, f.read()))
+    docs.append((f"synthetic ({args.synthetic_rows} rows)", make_docx(args.synthetic_rows)))
+
+    print(f"⏱  DOCX extraction benchmark ({args.repeat} iterations)")
+    print("=" * 78)
+    print(f"{'document':<28}{'docx ms':>9}{'fast ms':>9}{'speedup':>9}{'docx KiB':>11}{'fast KiB':>10}")
+    for name, data in docs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            old_ms, old_peak = measure(python_docx_text, data, args.repeat)
+            new_ms, new_peak = measure(_extract_text_from_docx_fast, data, args.repeat)
+        print(f"{name[:27]:<28}{old_ms * 1000:>9.2f}{new_ms * 1000:>9.2f}{old_ms / new_ms:>8.2f}x"
+              f"{old_peak / 1024:>11.0f}{new_peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
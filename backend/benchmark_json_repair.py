@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark parsing of malformed LLM JSON: regex + _repair_json vs parse_first_json.
+
+The corpus is built from the structured CVs in outputs/ (real LLaMA
+structuring results) by applying the defects seen in provider responses:
+prose and code fences around the JSON, trailing commas, a missing comma,
+an extra closer, stray backslashes, Python literals, and truncation by
+max_tokens at several points. Each response is parsed with the previous
+pipeline (regex extraction, _repair_json, json.loads, whose failure sent the
+CV to the partial regex extractor) and with the single-pass parser.
+
+"parsed" counts responses that yield an object; "members" is the share of
+the original top-level members recovered with their exact value (the
+member a stray backslash or Python literal is injected into cannot match).
+
+Usage:
+    python benchmark_json_repair.py [--outputs outputs] [--repeat 20]
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-service'))
+from tolerant_json import parse_first_json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def repair_json(json_str: str) -> str:
+    """LlamaService._repair_json before the single-pass parser (logging removed)."""
+    try:
+        json.loads(json_str)
+        return json_str
+    except json.JSONDecodeError:
+        pass
+    repaired = json_str.strip()
+    if '{' in repaired:
+        repaired = repaired[repaired.find('{'):]
+    elif '[' in repaired:
+        repaired = repaired[repaired.find('['):]
+    if '}' in repaired:
+        repaired = repaired[:repaired.rfind('}') + 1]
+    elif ']' in repaired:
+        repaired = repaired[:repaired.rfind(']') + 1]
+    repaired = re.sub(r',(\s*[}\]])', r'\1', repaired)
+    open_braces, close_braces = repaired.count('{'), repaired.count('}')
+    open_brackets, close_brackets = repaired.count('['), repaired.count(']')
+    if open_braces > close_braces:
+        repaired += '}' * (open_braces - close_braces)
+    if open_brackets > close_brackets:
+        repaired += ']' * (open_brackets - close_brackets)
+    try:
+        json.loads(repaired)
+        return repaired
+    except json.JSONDecodeError:
+        return json_str
+
+
+def parse_before(response: str):
+    """Previous _parse_cv_structure_response path, up to its fallbacks."""
+    match = re.search(r'\{.*\}', response, re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(repair_json(match.group(0)))
+    except json.JSONDecodeError:
+        return None
+
+
+def parse_after(response: str):
+    return parse_first_json(response, "{")[0]
+
+
+def corrupt(data: dict) -> dict:
+    """Malformed responses derived from one structured CV, by defect."""
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    trailing = re.sub(r'(["\]}\d])(\n\s*[\]}])', r'\1,\2', text)
+    second_member = text.index('\n  "', text.index('\n  "') + 1)
+    return {
+        "valid": text,
+        "prose + fence": f"Voici les données structurées :\n```json\n{text}\n```\nN'hésitez pas à demander {{plus}}.",
+        "trailing commas": trailing,
+        "missing comma": text[:second_member - 1] + text[second_member:],
+        "extra closer": text + "\n}\n```",
+        "stray backslash": text.replace('"skills": [', '"skills": ["C\\C++", ', 1),
+        "python literals": text.replace('": []', '": None', 1).replace('": ""', '": None', 1),
+        "truncated 50%": text[:len(text) // 2],
+        "truncated 90%": text[:len(text) * 9 // 10],
+        "trailing + truncated": trailing[:len(trailing) * 3 // 4],
+    }
+
+
+def members_kept(original: dict, parsed) -> int:
+    if not isinstance(parsed, dict):
+        return 0
+    return sum(1 for key, value in original.items() if parsed.get(key) == value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Malformed LLM JSON: parse rate, recovered members and time")
+    parser.add_argument("--outputs", default=os.path.join(HERE, "outputs"), help="Directory of structured CV JSON files")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the corpus")
+    args = parser.parse_args()
+
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(args.outputs, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for defect, response in corrupt(data).items():
+            corpus.append((defect, data, response))
+    if not corpus:
+        print(f"❌ No structured CV found in {args.outputs}")
+        return
+
+    defects = list(dict.fromkeys(defect for defect, _, _ in corpus))
+    print(f"⏱  Malformed JSON benchmark ({len(corpus)} responses from {len(corpus) // len(defects)} CVs, {args.repeat} passes)")
+    print("=" * 72)
+    print(f"{'defect':<22}{'parsed before':>15}{'parsed after':>14}{'members before':>16}{'after':>7}")
+    totals = {"before": [0, 0], "after": [0, 0]}
+    members_total = 0
+    for defect in defects:
+        cases = [(data, response) for name, data, response in corpus if name == defect]
+        row = {}
+        for label, parse in (("before", parse_before), ("after", parse_after)):
+            results = [parse(response) for _, response in cases]
+            parsed = sum(1 for result in results if isinstance(result, dict))
+            kept = sum(members_kept(data, result) for (data, _), result in zip(cases, results))
+            row[label] = (parsed, kept)
+            totals[label][0] += parsed
+            totals[label][1] += kept
+        members = sum(len(data) for data, _ in cases)
+        members_total += members
+        print(f"{defect:<22}{row['before'][0]:>11}/{len(cases):<3}{row['after'][0]:>10}/{len(cases):<3}"
+              f"{row['before'][1] / members:>15.0%}{row['after'][1] / members:>8.0%}")
+
+    print("-" * 72)
+    print(f"{'total':<22}{totals['before'][0]:>11}/{len(corpus):<3}{totals['after'][0]:>10}/{len(corpus):<3}"
+          f"{totals['before'][1] / members_total:>15.0%}{totals['after'][1] / members_total:>8.0%}")
+
+    print()
+    print(f"{'µs per response':<22}{'valid':>10}{'malformed':>12}")
+    for label, parse in (("regex + _repair_json", parse_before), ("parse_first_json", parse_after)):
+        timings = []
+        for valid in (True, False):
+            responses = [response for defect, _, response in corpus if (defect == "valid") == valid]
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for response in responses:
+                    parse(response)
+            timings.append((time.perf_counter() - start) / (args.repeat * len(responses)))
+        print(f"✅ {label:<20}{timings[0] * 1e6:>10.0f}{timings[1] * 1e6:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
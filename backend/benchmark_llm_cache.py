@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark the LLM response cache tiers.
+
+Fills a temporary SQLite cache with --entries responses of --response-chars
+characters, then times puts, in-memory hits and SQLite hits (a fresh
+instance without memory tier, as after an API restart). A provider round
+trip takes seconds; these are the costs a repeated prompt pays instead.
+
+Usage:
+    python benchmark_llm_cache.py [--entries 5000] [--response-chars 2000] [--lookups 2000]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-service'))
+from llm_cache import LLMResponseCache
+
+PARAMS = {"max_tokens": 1000, "temperature": 0.7, "top_p": 0.9}
+
+
+def time_each(fn, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM response cache put/hit latency")
+    parser.add_argument("--entries", type=int, default=5000, help="Responses stored before timing lookups")
+    parser.add_argument("--response-chars", type=int, default=2000, help="Size of each response")
+    parser.add_argument("--lookups", type=int, default=2000, help="Timed lookups per tier")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(temp_dir, "llm.sqlite3")
+        cache = LLMResponseCache(db_path, memory_entries=args.lookups)
+        keys = [cache.key("together", "llama", PARAMS, f"Job description {i}") for i in range(args.entries)]
+        response = "x" * args.response_chars
+
+        put = time_each(lambda key: cache.put(key, response), keys)
+        sample = random.Random(42).sample(keys, min(args.lookups, len(keys)))
+        for key in sample:
+            cache.get(key)
+        memory_hit = time_each(cache.get, sample)
+        sqlite_hit = time_each(LLMResponseCache(db_path, memory_entries=0).get, sample)
+        miss = time_each(cache.get, [key[::-1] for key in sample])
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"⏱  LLM response cache benchmark ({args.entries} entries of {args.response_chars} chars)")
+    print("=" * 56)
+    print(f"put:          {put * 1e6:10.1f} µs")
+    print(f"memory hit:   {memory_hit * 1e6:10.1f} µs")
+    print(f"SQLite hit:   {sqlite_hit * 1e6:10.1f} µs")
+    print(f"miss:         {miss * 1e6:10.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
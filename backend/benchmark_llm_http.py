@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call requests.post against the pooled LLM HTTP client.
+
+A local HTTPS server (self-signed certificate generated with openssl)
+answers with a chat-completion payload, so every request.post pays a fresh
+TCP + TLS handshake while the pooled client reuses one connection. With
+--fail-every N the server answers 503 to every Nth request to exercise the
+retry path. Local handshakes are cheaper than real ones over the internet,
+so the gap here is a lower bound.
+
+The async section sends --concurrent calls at once through
+AsyncPooledHTTPClient while the server takes --latency-ms per answer, the
+way LLM generation does, and compares with the same calls made one by one.
+
+Usage:
+    python benchmark_llm_http.py [--calls 200] [--fail-every 0] [--concurrent 20] [--latency-ms 200]
+"""
+
+import os
+import ssl
+import sys
+import json
+import asyncio
+import time
+import tempfile
+import argparse
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-service'))
+from http_pool import PooledHTTPClient, AsyncPooledHTTPClient
+
+RESPONSE = json.dumps({"choices": [{"message": {"content": "[]"}}]}).encode("utf-8")
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    fail_every = 0
+    latency = 0.0
+    served = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        CompletionHandler.served += 1
+        time.sleep(self.latency)
+        status = 503 if self.fail_every and CompletionHandler.served % self.fail_every == 0 else 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+class CompletionServer(ThreadingHTTPServer):
+    # Room for every concurrent connect; the default backlog of 5 drops SYNs
+    request_queue_size = 128
+
+
+def start_server(cert_dir: str) -> ThreadingHTTPServer:
+    cert, key = os.path.join(cert_dir, "cert.pem"), os.path.join(cert_dir, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost", "-keyout", key, "-out", cert],
+                   check=True, capture_output=True)
+    server = CompletionServer(("localhost", 0), CompletionHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_calls(post, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        post()
+    return (time.perf_counter() - start) / calls
+
+
+async def time_concurrent(client: AsyncPooledHTTPClient, url: str, calls: int, **kwargs) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(client.post(url, **kwargs) for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="requests.post vs pooled keep-alive client")
+    parser.add_argument("--calls", type=int, default=200, help="Requests per client")
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer 503 to every Nth request (0: never)")
+    parser.add_argument("--concurrent", type=int, default=20, help="Calls in flight at once in the async section")
+    parser.add_argument("--latency-ms", type=float, default=200, help="Server time per answer in the async section")
+    args = parser.parse_args()
+
+    CompletionHandler.fail_every = args.fail_every
+    with tempfile.TemporaryDirectory() as cert_dir:
+        server = start_server(cert_dir)
+        url = f"https://localhost:{server.server_address[1]}/v1/chat/completions"
+        cert = os.path.join(cert_dir, "cert.pem")
+        payload = {"messages": [{"role": "user", "content": "test"}], "max_tokens": 10}
+
+        single = time_calls(lambda: requests.post(url, json=payload, timeout=30, verify=cert), args.calls)
+        client = PooledHTTPClient(backoff=0)
+        pooled = time_calls(lambda: client.post(url, json=payload, verify=cert), args.calls)
+
+        CompletionHandler.latency = args.latency_ms / 1000
+        serial = time_calls(lambda: client.post(url, json=payload, verify=cert), args.concurrent) * args.concurrent
+        async_client = AsyncPooledHTTPClient(backoff=0, pool_size=args.concurrent, verify=cert)
+        concurrent = asyncio.run(time_concurrent(async_client, url, args.concurrent, json=payload))
+        server.shutdown()
+
+    stats = client.stats()
+    print(f"⏱  LLM HTTP client benchmark ({args.calls} calls, local HTTPS)")
+    print("=" * 60)
+    print(f"requests.post:  {single * 1000:8.2f} ms/call")
+    print(f"pooled client:  {pooled * 1000:8.2f} ms/call ({single / pooled:.2f}x)")
+    print(f"pool stats:     {stats['connections']} connection(s), reuse ratio {stats['reuse_ratio']}, "
+          f"{stats['retries']} retries")
+    print(f"{args.concurrent} calls at {args.latency_ms:.0f} ms: {serial * 1000:.0f} ms one by one, "
+          f"{concurrent * 1000:.0f} ms concurrently ({serial / concurrent:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark micro-batching of local model prompts.
+
+--clients threads each send --requests prompts, one after the other,
+through a MicroBatcher capped at each of --batch-sizes. With batch size 1
+this is the previous behaviour: one generate() call per prompt, the others
+waiting their turn.
+
+--model tiny generates with a tiny randomly initialized GPT-2 on CPU
+(needs torch and transformers). --model simulated replaces generate() by a
+sleep of --generate-ms per batch plus --per-item-ms per prompt, the shape of
+a memory-bound decoder on a GPU; it is the default when torch is missing.
+
+Usage:
+    python benchmark_local_batching.py [--model tiny|simulated] [--clients 8] [--requests 5]
+                                       [--batch-sizes 1 2 4 8] [--wait-ms 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import importlib.util
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-service'))
+from micro_batcher import MicroBatcher
+
+
+def simulated_generate(generate_ms: float, per_item_ms: float):
+    def run_batch(prompts):
+        time.sleep((generate_ms + per_item_ms * len(prompts)) / 1000)
+        return [f"réponse à {prompt}" for prompt in prompts]
+    return run_batch
+
+
+def tiny_generate(max_new_tokens: int):
+    """Batched generate() of a tiny random GPT-2 with a word-level tokenizer."""
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    words = ["<pad>", "<unk>", "###", "Human:", "Assistant:"] + [f"mot{i}" for i in range(500)]
+    backend = Tokenizer(models.WordLevel({word: i for i, word in enumerate(words)}, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, pad_token="<pad>", unk_token="<unk>", eos_token="<pad>")
+    tokenizer.padding_side = "left"
+    torch.manual_seed(0)
+    model = GPT2LMHeadModel(GPT2Config(vocab_size=len(words), n_positions=256, n_embd=128, n_layer=4, n_head=4,
+                                       bos_token_id=tokenizer.pad_token_id, eos_token_id=tokenizer.pad_token_id))
+    model.eval()
+
+    def run_batch(prompts):
+        inputs = tokenizer([f"### Human: {prompt} ### Assistant:" for prompt in prompts], return_tensors="pt", padding=True)
+        with torch.no_grad():
+            output = model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False,
+                                    pad_token_id=tokenizer.pad_token_id)
+        return tokenizer.batch_decode(output[:, inputs["input_ids"].shape[1]:], skip_special_tokens=True)
+    return run_batch
+
+
+def run_clients(batcher: MicroBatcher, clients: int, requests: int) -> float:
+    def client(index):
+        for request in range(requests):
+            batcher.submit(" ".join(f"mot{(index * 7 + request * 3 + k) % 500}" for k in range(20 + index)))
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    has_torch = all(importlib.util.find_spec(name) for name in ("torch", "transformers"))
+    parser = argparse.ArgumentParser(description="Throughput of the local model with micro-batching")
+    parser.add_argument("--model", choices=["tiny", "simulated"], default="tiny" if has_torch else "simulated",
+                        help="Tiny random GPT-2 on CPU, or a simulated generate()")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--requests", type=int, default=5, help="Prompts per client")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8], help="Batch size caps to compare")
+    parser.add_argument("--wait-ms", type=float, default=20, help="Longest wait for a batch to fill")
+    parser.add_argument("--generate-ms", type=float, default=200, help="Simulated cost of one generate() call")
+    parser.add_argument("--per-item-ms", type=float, default=10, help="Simulated extra cost per prompt in a batch")
+    parser.add_argument("--max-new-tokens", type=int, default=16, help="Tokens generated per prompt (tiny model)")
+    args = parser.parse_args()
+
+    if args.model == "tiny":
+        if not has_torch:
+            print("❌ --model tiny needs torch and transformers")
+            return
+        run_batch = tiny_generate(args.max_new_tokens)
+        run_batch(["mot1 mot2"])  # warm-up
+        label = f"tiny random GPT-2 on CPU, {args.max_new_tokens} new tokens"
+    else:
+        run_batch = simulated_generate(args.generate_ms, args.per_item_ms)
+        label = f"simulated generate {args.generate_ms:.0f} ms + {args.per_item_ms:.0f} ms/prompt"
+
+    total = args.clients * args.requests
+    print(f"⏱  Local micro-batching benchmark ({label}; {args.clients} clients x {args.requests} prompts)")
+    print("=" * 78)
+    print(f"{'batch cap':>9}{'seconds':>10}{'prompts/s':>11}{'mean batch':>12}{'wait p50 ms':>13}{'wait p95 ms':>13}")
+    baseline = None
+    for size in args.batch_sizes:
+        batcher = MicroBatcher(run_batch, max_batch_size=size, max_wait_ms=args.wait_ms)
+        elapsed = run_clients(batcher, args.clients, args.requests)
+        batcher.close()
+        stats = batcher.stats()
+        throughput = total / elapsed
+        baseline = baseline or throughput
+        print(f"{size:>9}{elapsed:>10.2f}{throughput:>11.1f}{stats['mean_batch_size']:>12.2f}"
+              f"{stats['queue_wait_p50_ms']:>13.0f}{stats['queue_wait_p95_ms']:>13.0f}   x{throughput / baseline:.1f}")
+
+
+if __name__ == "__main__":
+    main()
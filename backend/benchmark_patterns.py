@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the per-line regex cost before and after cv_patterns.
+
+"Before" replays the module-level re.match/re.search/re.sub calls with
+literal pattern strings that cv_extractor_cli used to make for every line.
+"After" uses the precompiled registry and the merged header classifier.
+
+Usage:
+    python benchmark_patterns.py [cv_dir] [--repeat N]
+"""
+
+import os
+import io
+import re
+import time
+import argparse
+import contextlib
+
+import cv_patterns as patterns
+from cv_extractor_cli import load_text
+
+# Enter and exit header checks of the six section parsers
+LEGACY_HEADER_CHECKS = [
+    (re.match, r'^(?:SUMMARY|RÉSUMÉ|PROFILE)$'),
+    (re.match, r'^(?:TECHNICAL SKILLS|SKILLS|EDUCATION|FORMATION|EXPERIENCE|LANGUAGES|PROJECTS)$'),
+    (re.search, r'\b(?:TECHNICAL\s+SKILLS|COMPÉTENCES|SKILLS)\b'),
+    (re.match, r'^(?:LANGUAGES|LANGUES|EDUCATION|FORMATION|EXPERIENCE|PROJECTS|CERTIFICATIONS)$'),
+    (re.match, r'^(?:LANGUAGES|LANGUES)$'),
+    (re.search, r'\b(?:CERTIFICATIONS|EDUCATION|FORMATION|EXPERIENCE|PROJECTS|SKILLS)\b'),
+    (re.match, r'^(?:EDUCATION|FORMATION|ÉDUCATION)$'),
+    (re.search, r'\b(?:Expérience Professionnelle|EXPERIENCE|PROJECTS|SKILLS|LANGUAGES)\b'),
+    (re.search, r'\b(?:Expérience Professionnelle|EXPERIENCE|EMPLOI|Professional Experience)\b'),
+    (re.search, r'\b(?:PROJECTS|EDUCATION|FORMATION|SKILLS|LANGUAGES)\b'),
+    (re.match, r'^(?:PROJECTS|PROJETS)$'),
+    (re.match, r'^(?:EDUCATION|FORMATION|EXPERIENCE|SKILLS|LANGUAGES)$'),
+]
+
+
+def headers_before(lines):
+    for line in lines:
+        for fn, pattern in LEGACY_HEADER_CHECKS:
+            fn(pattern, line, re.IGNORECASE)
+
+
+def headers_after(lines):
+    for line in lines:
+        patterns.classify_header(line)
+
+
+def content_before(lines):
+    for line in lines:
+        line = re.sub(r'[\u200B\u200C\u200D\uFEFF]', '', line)
+        if re.match(r'^[●○•\-\*]\s*', line):
+            re.sub(r'^[●○•\-\*]\s*', '', line)
+        m = re.match(r'^([A-Za-zÀ-ÿ]+\s+\d{4}\s*[-–]\s*[A-Za-zÀ-ÿ]+\s+\d{4})\s*:\s*(.+)$', line, re.IGNORECASE)
+        if not m:
+            m = re.match(r'^([A-Za-zÀ-ÿ]+\s+\d{4}\s*[-–]\s*[A-Za-zÀ-ÿ]+\s+\d{4})\s+(.+)$', line, re.IGNORECASE)
+        if not m:
+            m = re.match(r'^([A-Za-zÀ-ÿ]+\s+\d{4}\s*[-–]\s*[A-Za-zÀ-ÿ]+\s+\d{4})\s+:\s*(.+)$', line, re.IGNORECASE)
+
+
+def content_after(lines):
+    for line in lines:
+        line = patterns.ZERO_WIDTH.sub('', line)
+        bullet_match = patterns.BULLET.match(line)
+        if bullet_match:
+            line[bullet_match.end():]
+        patterns.EXPERIENCE_DATE_RANGE.match(line)
+
+
+def per_line_ns(fn, lines, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(lines)
+    return (time.perf_counter() - start) / (repeat * len(lines)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-line regex cost before/after cv_patterns")
+    parser.add_argument("cv_dir", nargs="?", default=os.path.join(os.path.dirname(__file__), "cv_files"))
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations over the corpus")
+    args = parser.parse_args()
+
+    lines = []
+    for name in sorted(os.listdir(args.cv_dir)):
+        if name.lower().endswith((".pdf", ".docx", ".doc", ".txt")):
+            with contextlib.redirect_stdout(io.StringIO()):
+                text = load_text(os.path.join(args.cv_dir, name))
+            lines.extend(s for s in (ln.strip() for ln in text.split('\n')) if s)
+
+    print(f"⏱  Per-line regex cost on {len(lines)} lines ({args.repeat} iterations)")
+    print("=" * 60)
+    print(f"{'check':<24}{'before ns':>12}{'after ns':>12}{'speedup':>10}")
+    for label, before, after in [
+        ("header classification", headers_before, headers_after),
+        ("bullet + date range", content_before, content_after),
+    ]:
+        old = per_line_ns(before, lines, args.repeat)
+        new = per_line_ns(after, lines, args.repeat)
+        print(f"{label:<24}{old:>12.0f}{new:>12.0f}{old / new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF text extraction on synthetic 1, 10 and 100-page documents.
+
+Compares the full serial read with the page-budgeted read (--max-pages)
+and the page-range process pool (--workers). Documents are generated in
+memory with PyMuPDF, one CV-like block of text per page.
+
+Usage:
+    python benchmark_pdf_pages.py [--pages 1 10 100] [--repeat N] [--max-pages 3] [--workers 4]
+"""
+
+import io
+import time
+import argparse
+import contextlib
+import multiprocessing
+
+import fitz  # PyMuPDF
+
+from cv_extractor_cli import extract_text_from_pdf
+
+PAGE_LINES = [
+    "EXPERIENCE",
+    "JUIN 2024 - AOÛT 2024 : Progiciel System, Backend Developer",
+    "- Built the invoicing API with FastAPI and PostgreSQL",
+    "- Reduced report generation time from minutes to seconds",
+    "SEPT 2020 - JUIN 2022 : Master Data Science (ENSA)",
+    "SKILLS",
+    "- Python, SQL, Docker, Kubernetes, Terraform",
+    "PROJECTS",
+    "Portfolio case study: data pipeline for retail analytics",
+] * 5
+
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for page_no in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 50), f"Page {page_no + 1}\n" + "\n".join(PAGE_LINES), fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def time_extract(pdf: bytes, repeat: int, **options) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            extract_text_from_pdf(pdf, **options)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs budgeted vs parallel PDF extraction")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100], help="Document sizes in pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Iterations per measurement")
+    parser.add_argument("--max-pages", type=int, default=3, help="Page budget of the budgeted mode")
+    parser.add_argument("--workers", type=int, default=max(2, multiprocessing.cpu_count()), help="Processes of the parallel mode")
+    args = parser.parse_args()
+
+    print(f"⏱  PDF extraction benchmark ({args.repeat} iterations, {multiprocessing.cpu_count()} CPU(s))")
+    print("=" * 72)
+    print(f"{'pages':>6}{'full ms':>11}{f'first {args.max_pages} ms':>14}{'speedup':>9}"
+          f"{f'{args.workers} procs ms':>14}{'speedup':>9}")
+
+    for pages in args.pages:
+        pdf = make_pdf(pages)
+        full = time_extract(pdf, args.repeat)
+        budgeted = time_extract(pdf, args.repeat, max_pages=args.max_pages)
+        parallel = time_extract(pdf, args.repeat, workers=args.workers)
+        print(f"{pages:>6}{full * 1000:>11.2f}{budgeted * 1000:>14.2f}{full / budgeted:>8.2f}x"
+              f"{parallel * 1000:>14.2f}{full / parallel:>8.2f}x")
+
+        if extract_text_from_pdf(pdf, workers=args.workers) != extract_text_from_pdf(pdf):
+            print(f"✗ Parallel output differs from serial output on {pages} page(s)")
+
+
+if __name__ == "__main__":
+    main()
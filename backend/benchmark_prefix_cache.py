@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark prefill with and without the cached structuring-prompt prefix.
+
+For each CV text in extracted_data/, the local-model structuring prompt is
+built as LlamaService sends it, then timed on CPU:
+  - full prefill: one forward pass over the whole prompt (the previous cost);
+  - cached prefill: copy of the prefix's past_key_values plus a forward
+    pass over the tokens the prompt does not share with the prefix;
+  - generate: --new-tokens greedy tokens through PrefixKVCache.generate()
+    versus model.generate() on the whole prompt.
+The saving should track the prefix share of the prompt tokens. A last line
+times all the prompts as one batch: PrefixKVCache.generate_batch() versus
+one left-padded model.generate() call, as the pipeline batches them.
+
+The model is --model from the local Hugging Face cache, or by default a
+randomly initialized GPT-2 (--layers, --hidden) with a byte-level BPE
+tokenizer trained on the prompt and CV texts, so token counts are those of
+a real subword vocabulary. Needs torch and transformers.
+
+Usage:
+    python benchmark_prefix_cache.py [--model distilgpt2] [--layers 6] [--hidden 384]
+                                     [--repeat 5] [--new-tokens 8]
+"""
+
+import os
+import sys
+import copy
+import glob
+import time
+import argparse
+import statistics
+import importlib.util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, '..', 'ai-service'))
+
+
+def load_model(args, texts):
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer, GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    if args.model:
+        tokenizer = AutoTokenizer.from_pretrained(args.model, local_files_only=True)
+        model = AutoModelForCausalLM.from_pretrained(args.model, local_files_only=True)
+        return model.eval(), tokenizer, args.model
+
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+    backend = Tokenizer(models.BPE())
+    backend.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    backend.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(vocab_size=args.vocab, special_tokens=["<|endoftext|>"],
+                                  initial_alphabet=pre_tokenizers.ByteLevel.alphabet())
+    backend.train_from_iterator(texts, trainer)
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, eos_token="<|endoftext|>", pad_token="<|endoftext|>")
+    longest = max(len(tokenizer(text)["input_ids"]) for text in texts)
+    torch.manual_seed(0)
+    config = GPT2Config(vocab_size=len(tokenizer), n_positions=longest + args.new_tokens + 8,
+                        n_embd=args.hidden, n_layer=args.layers, n_head=max(1, args.hidden // 64),
+                        bos_token_id=tokenizer.eos_token_id, eos_token_id=tokenizer.eos_token_id)
+    return GPT2LMHeadModel(config).eval(), tokenizer, f"random GPT-2 {args.layers}x{args.hidden}"
+
+
+def median_ms(fn, repeat: int) -> float:
+    fn()  # warm-up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefill time with the cached structuring prefix")
+    parser.add_argument("--model", help="Causal LM from the local Hugging Face cache (default: random GPT-2)")
+    parser.add_argument("--layers", type=int, default=6, help="Layers of the random GPT-2")
+    parser.add_argument("--hidden", type=int, default=384, help="Hidden size of the random GPT-2")
+    parser.add_argument("--vocab", type=int, default=4000, help="BPE vocabulary trained for the random GPT-2")
+    parser.add_argument("--cv-dir", default=os.path.join(HERE, "extracted_data"), help="Directory of CV .txt files")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--new-tokens", type=int, default=8, help="Greedy tokens generated per prompt")
+    args = parser.parse_args()
+
+    if not all(importlib.util.find_spec(name) for name in ("torch", "transformers")):
+        print("❌ This benchmark needs torch and transformers")
+        return
+
+    import torch
+    from transformers import DynamicCache
+    from llama_service import LlamaService, CV_STRUCTURING_INSTRUCTIONS, LOCAL_PROMPT_START, LOCAL_PROMPT_END
+    from prefix_cache import PrefixKVCache, shared_length
+
+    cvs = {}
+    for path in sorted(glob.glob(os.path.join(args.cv_dir, "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            cvs[os.path.basename(path)] = f.read()
+    if not cvs:
+        print(f"❌ No CV text found in {args.cv_dir}")
+        return
+
+    # The prompt builder does not use the service's state
+    prompts = {name: f"{LOCAL_PROMPT_START}{LlamaService._create_cv_structuring_prompt(None, text)}{LOCAL_PROMPT_END}"
+               for name, text in cvs.items()}
+    prefix = LOCAL_PROMPT_START + CV_STRUCTURING_INSTRUCTIONS
+    model, tokenizer, label = load_model(args, list(prompts.values()))
+    sampling = {"max_new_tokens": args.new_tokens, "do_sample": False, "pad_token_id": tokenizer.eos_token_id}
+
+    prefix_ids = tokenizer(prefix, return_tensors="pt")["input_ids"]
+    with torch.no_grad():
+        prefix_cache = model(input_ids=prefix_ids, past_key_values=DynamicCache(), use_cache=True).past_key_values
+    cache = PrefixKVCache(model, tokenizer, [prefix])
+
+    print(f"⏱  Prefix cache benchmark ({label}, CPU, median of {args.repeat})")
+    print("=" * 92)
+    print(f"{'CV':<24}{'tokens':>7}{'cached':>8}{'share':>7}{'full ms':>9}{'cached ms':>11}{'saved':>7}"
+          f"{'gen ms':>9}{'cached gen':>12}")
+    savings = []
+    for name, prompt in prompts.items():
+        input_ids = tokenizer(prompt, return_tensors="pt")["input_ids"]
+        shared = min(shared_length(prefix_ids[0].tolist(), input_ids[0].tolist()), input_ids.shape[1] - 1)
+        mask = torch.ones_like(input_ids)
+
+        def full_prefill():
+            with torch.no_grad():
+                model(input_ids=input_ids, use_cache=True)
+
+        def cached_prefill():
+            past = copy.deepcopy(prefix_cache)
+            if shared < prefix_ids.shape[1]:
+                past.crop(shared - prefix_ids.shape[1])
+            with torch.no_grad():
+                model(input_ids=input_ids[:, shared:], past_key_values=past, use_cache=True)
+
+        def full_generate():
+            with torch.no_grad():
+                model.generate(input_ids=input_ids, attention_mask=mask, **sampling)
+
+        full_ms = median_ms(full_prefill, args.repeat)
+        cached_ms = median_ms(cached_prefill, args.repeat)
+        generate_ms = median_ms(full_generate, args.repeat)
+        cached_generate_ms = median_ms(lambda: cache.generate(prompt, **sampling), args.repeat)
+        savings.append(1 - cached_ms / full_ms)
+        print(f"{name[:23]:<24}{input_ids.shape[1]:>7}{shared:>8}{shared / input_ids.shape[1]:>7.0%}"
+              f"{full_ms:>9.1f}{cached_ms:>11.1f}{1 - cached_ms / full_ms:>7.0%}"
+              f"{generate_ms:>9.1f}{cached_generate_ms:>12.1f}")
+
+    names = list(prompts)
+    tokenizer.padding_side = "left"
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    batch = tokenizer([prompts[name] for name in names], return_tensors="pt", padding=True)
+
+    def full_batch():
+        with torch.no_grad():
+            model.generate(**batch, **sampling)
+
+    full_batch_ms = median_ms(full_batch, args.repeat)
+    cached_batch_ms = median_ms(lambda: cache.generate_batch([prompts[name] for name in names], **sampling), args.repeat)
+    print(f"{f'batch of {len(names)}':<24}{'':>60}{full_batch_ms:>9.1f}{cached_batch_ms:>12.1f}")
+
+    print()
+    print(f"✅ Prefill time saved: {statistics.mean(savings):.0%} on average "
+          f"(prefix: {prefix_ids.shape[1]} tokens)")
+
+
+if __name__ == "__main__":
+    main()
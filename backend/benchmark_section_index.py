@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared single-pass SectionIndex against the six-scan path.
+
+The six-scan path reproduces the previous behaviour: every section parser
+splits the raw text and walks all lines with its own header rules. The
+shared path segments once and hands the same SectionIndex to every parser,
+as CVExtractor.extract_cv_data does.
+
+Usage:
+    python benchmark_section_index.py [cv_dir] [--repeat N]
+"""
+
+import os
+import io
+import re
+import sys
+import time
+import argparse
+import contextlib
+
+from cv_extractor_cli import (
+    load_text, SectionIndex,
+    extract_summary, extract_skills, extract_languages,
+    extract_education, extract_experience, extract_projects,
+)
+
+SECTION_PARSERS = [
+    extract_summary, extract_skills, extract_languages,
+    extract_education, extract_experience, extract_projects,
+]
+
+# Header rules as each parser applied them before SectionIndex
+LEGACY_RULES = [
+    ("summary",
+     r'^(?:SUMMARY|RÉSUMÉ|PROFILE)$', "match",
+     r'^(?:TECHNICAL SKILLS|SKILLS|EDUCATION|FORMATION|EXPERIENCE|LANGUAGES|PROJECTS)$', "match"),
+    ("skills",
+     r'\b(?:TECHNICAL\s+SKILLS|COMPÉTENCES|SKILLS)\b', "search",
+     r'^(?:LANGUAGES|LANGUES|EDUCATION|FORMATION|EXPERIENCE|PROJECTS|CERTIFICATIONS)$', "match"),
+    ("languages",
+     r'^(?:LANGUAGES|LANGUES)$', "match",
+     r'\b(?:CERTIFICATIONS|EDUCATION|FORMATION|EXPERIENCE|PROJECTS|SKILLS)\b', "search"),
+    ("education",
+     r'^(?:EDUCATION|FORMATION|ÉDUCATION)$', "match",
+     r'\b(?:Expérience Professionnelle|EXPERIENCE|PROJECTS|SKILLS|LANGUAGES)\b', "search"),
+    ("experience",
+     r'\b(?:Expérience Professionnelle|EXPERIENCE|EMPLOI|Professional Experience)\b', "search",
+     r'\b(?:PROJECTS|EDUCATION|FORMATION|SKILLS|LANGUAGES)\b', "search"),
+    ("projects",
+     r'^(?:PROJECTS|PROJETS)$', "match",
+     r'^(?:EDUCATION|FORMATION|EXPERIENCE|SKILLS|LANGUAGES)$', "match"),
+]
+
+
+class LegacySection:
+    """One parser's own full scan of the text, as before SectionIndex."""
+
+    def __init__(self, text: str, rule):
+        name, enter, enter_mode, leave, leave_mode = rule
+        self.name = name
+        self.lines = []
+        inside = False
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            if getattr(re, enter_mode)(enter, line, re.IGNORECASE):
+                inside = True
+                continue
+            if inside and getattr(re, leave_mode)(leave, line, re.IGNORECASE):
+                inside = False
+                continue
+            if inside:
+                self.lines.append(line)
+
+    def section_lines(self, name: str):
+        return self.lines
+
+
+def six_scan(text: str):
+    return [parse(text, LegacySection(text, rule)) for rule, parse in zip(LEGACY_RULES, SECTION_PARSERS)]
+
+
+def single_pass(text: str):
+    sections = SectionIndex(text)
+    return [parse(text, sections) for parse in SECTION_PARSERS]
+
+
+def time_path(fn, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SectionIndex vs six-scan benchmark")
+    parser.add_argument("cv_dir", nargs="?", default=os.path.join(os.path.dirname(__file__), "cv_files"))
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per file")
+    args = parser.parse_args()
+
+    files = sorted(f for f in os.listdir(args.cv_dir) if f.lower().endswith((".pdf", ".docx", ".doc", ".txt")))
+    print(f"⏱  Section segmentation benchmark ({len(files)} file(s), {args.repeat} iterations)")
+    print("=" * 72)
+    print(f"{'file':<32}{'lines':>7}{'six-scan ms':>13}{'single ms':>11}{'speedup':>9}")
+
+    total_old = total_new = 0.0
+    for name in files:
+        with contextlib.redirect_stdout(io.StringIO()):
+            text = load_text(os.path.join(args.cv_dir, name))
+
+        if six_scan(text) != single_pass(text):
+            print(f"✗ Output mismatch on {name}")
+            sys.exit(1)
+
+        old = time_path(six_scan, text, args.repeat)
+        new = time_path(single_pass, text, args.repeat)
+        total_old += old
+        total_new += new
+        lines = len(text.split('\n'))
+        print(f"{name[:31]:<32}{lines:>7}{old * 1000:>13.3f}{new * 1000:>11.3f}{old / new:>8.2f}x")
+
+    print("-" * 72)
+    if total_new:
+        print(f"{'total':<39}{total_old * 1000:>13.3f}{total_new * 1000:>11.3f}{total_old / total_new:>8.2f}x")
+    print("✓ Outputs identical on every file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark API cold start: import time and peak RSS of the backend modules.
+
+Each module is imported in a fresh interpreter, --repeat times, and the
+median import time and peak resident memory are reported, together with
+whether torch or transformers ended up loaded. "torch" itself is listed as
+the cost the API paid on every start while llama_service imported it at
+module top.
+
+The database defaults to in-memory SQLite so `import main` needs no server,
+and the provider probe cache is disabled so runs do not share results.
+
+Usage:
+    python benchmark_startup.py [--modules main llama_service cv_extractor_cli torch] [--repeat 5]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import sys, time, json, resource
+sys.path.append({ai_service!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "torch": "torch" in sys.modules,
+    "transformers": "transformers" in sys.modules,
+}}))
+"""
+
+
+def measure(module: str, env: dict):
+    """One cold import of module; returns the probe's JSON or an error line."""
+    code = PROBE.format(module=module, ai_service=os.path.join(HERE, "..", "ai-service"))
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return None, lines[-1] if lines else f"exit status {result.returncode}"
+    return json.loads(result.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time and RSS of the API modules")
+    parser.add_argument("--modules", nargs="+", default=["main", "llama_service", "cv_extractor_cli", "torch"],
+                        help="Modules to import, each in a fresh interpreter")
+    parser.add_argument("--repeat", type=int, default=5, help="Cold imports per module")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    env["LLM_PROVIDER_PROBE_CACHE"] = ""
+
+    print(f"⏱  Cold-start benchmark (median of {args.repeat} fresh interpreters)")
+    print("=" * 64)
+    print(f"{'module':<20}{'import ms':>11}{'peak RSS MiB':>14}{'torch':>8}{'transformers':>13}")
+    for module in args.modules:
+        runs, error = [], None
+        for _ in range(args.repeat):
+            run, error = measure(module, env)
+            if run is None:
+                break
+            runs.append(run)
+        if error is not None:
+            print(f"{module:<20}  ✗ {error}")
+            continue
+        seconds = statistics.median(run["seconds"] for run in runs)
+        rss = statistics.median(run["rss_kib"] for run in runs) / 1024
+        print(f"{module:<20}{seconds * 1000:>11.0f}{rss:>14.1f}{'yes' if runs[0]['torch'] else 'no':>8}"
+              f"{'yes' if runs[0]['transformers'] else 'no':>13}")
+
+
+if __name__ == "__main__":
+    main()
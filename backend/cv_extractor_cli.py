@@ -1,12 +1,43 @@
 #!/usr/bin/env python3isi
 
+import io
 import os
-import re
+import sys
 import json
+import math
+import time
+import zipfile
+import multiprocessing
 import fitz  # PyMuPDF
 from docx import Document
-from typing import Dict, Any, List, Optional, Tuple, Set
+from xml.etree import ElementTree
+from typing import Dict, Any, BinaryIO, Iterator, List, Optional, Tuple, Set, Union
 import argparse
+import hashlib
+
+import cv_patterns as patterns
+from extraction_manifest import ExtractionManifest
+from text_cache import RawTextCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, cache_from_env
+
+
+def _source_fingerprint(*module_files: str) -> str:
+    """Short hash of the extractor sources; changes whenever parsing code changes."""
+    digest = hashlib.sha256()
+    for module_file in module_files:
+        with open(module_file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Identifies the parsing code that produced an output; stored in the batch
+# manifest so outputs are regenerated after the extractor changes.
+EXTRACTOR_VERSION = _source_fingerprint(
+    __file__,
+    os.path.join(_HERE, "cv_patterns.py"),
+    os.path.join(_HERE, "address_extractor.py"),
+)
 
 
 # ----------------------- Utility helpers -----------------------
@@ -29,8 +60,8 @@ def _clean_text(text: str) -> str:
         return ""
     
     # Remove excessive whitespace but preserve line breaks
-    cleaned = re.sub(r"[ \t]+", " ", text)
-    cleaned = re.sub(r"\n\s*\n", "\n\n", cleaned)
+    cleaned = patterns.HORIZONTAL_WHITESPACE.sub(" ", text)
+    cleaned = patterns.BLANK_LINES.sub("\n\n", cleaned)
     
     # Remove null characters and other artifacts
     cleaned = cleaned.replace("\u0000", "")
@@ -44,7 +75,7 @@ def _is_meaningful_text(text: str) -> bool:
         return False
     
     # Skip if it's just numbers, symbols, or very short fragments
-    if re.match(r"^[\d\s\-_=*]+$", text):
+    if patterns.NOISE_ONLY.match(text):
         return False
     
     # Skip if it's just a single character
@@ -56,26 +87,176 @@ def _is_meaningful_text(text: str) -> bool:
 
 # ----------------------- Text extraction -----------------------
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from PDF with better formatting preservation."""
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(f"File not found: {pdf_path}")
+# A document to extract from: a file path, the raw file bytes, or a binary
+# file-like object such as an upload stream.
+DocumentSource = Union[str, bytes, BinaryIO]
+
+
+# Below this many pages a process pool costs more than it saves
+PARALLEL_PDF_MIN_PAGES = 16
+
+
+def _open_pdf(pdf: Union[str, bytes]) -> "fitz.Document":
+    if isinstance(pdf, str):
+        if not os.path.exists(pdf):
+            raise FileNotFoundError(f"File not found: {pdf}")
+        return fitz.open(pdf)
+    return fitz.open(stream=pdf, filetype="pdf")
+
+
+def iter_pdf_pages(pdf: Union[str, bytes], start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """Yield the cleaned text of each non-empty page in [start, stop).
     
-    pages: List[str] = []
-    with fitz.open(pdf_path) as doc:
-        for page in doc:
-            txt = page.get_text("text")
-            txt = _clean_text(txt)
+    Pages are read lazily, so a caller that stops early never touches the
+    rest of the document.
+    """
+    with _open_pdf(pdf) as doc:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for page_no in range(start, stop):
+            txt = _clean_text(doc.load_page(page_no).get_text("text"))
             if txt:
-                pages.append(txt)
+                yield txt
+
+
+def _pdf_range_text(task: Tuple[Union[str, bytes], int, int]) -> List[str]:
+    """Pool task: every worker opens its own fitz handle on the document."""
+    pdf, start, stop = task
+    return list(iter_pdf_pages(pdf, start, stop))
+
+
+def _pdf_pages_parallel(pdf: Union[str, bytes], page_count: int, workers: int) -> Iterator[str]:
+    """Split [0, page_count) into contiguous ranges, one per worker process."""
+    step = math.ceil(page_count / workers)
+    tasks = [(pdf, start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    with multiprocessing.Pool(processes=len(tasks)) as pool:
+        for pages in pool.imap(_pdf_range_text, tasks):
+            yield from pages
+
+
+def extract_text_from_pdf(pdf: Union[str, bytes],
+                          max_pages: Optional[int] = None,
+                          max_chars: Optional[int] = None,
+                          workers: int = 1) -> str:
+    """Extract text from a PDF path or PDF bytes with better formatting preservation.
+    
+    ``max_pages`` only reads the first pages of the document and
+    ``max_chars`` stops reading once that much text has been collected (the
+    page that crosses the budget is kept whole). With ``workers`` > 1,
+    documents of at least PARALLEL_PDF_MIN_PAGES pages are split into page
+    ranges across a process pool.
+    """
+    with _open_pdf(pdf) as doc:
+        page_count = doc.page_count
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    
+    # Pool workers are daemonic and cannot start a pool of their own
+    parallel = (workers > 1 and page_count >= PARALLEL_PDF_MIN_PAGES
+                and not multiprocessing.current_process().daemon)
+    page_iter = _pdf_pages_parallel(pdf, page_count, workers) if parallel else iter_pdf_pages(pdf, 0, page_count)
+    
+    pages: List[str] = []
+    total = 0
+    for txt in page_iter:
+        pages.append(txt)
+        total += len(txt)
+        if max_chars is not None and total >= max_chars:
+            break
     
     return "\n\n".join(pages)
 
 
-def extract_text_from_docx(docx_path: str) -> str:
-    """Extract text from DOCX with better formatting and error handling."""
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+# Run children that python-docx renders as characters in Paragraph.text
+_DOCX_RUN_CHARS = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+_DOCX_BLOCKS = {_W + "p", _W + "tbl", _W + "tr", _W + "tc", _W + "sdt", _MC_FALLBACK}
+
+
+def _iter_docx_blocks(docx: Union[str, bytes]) -> Iterator[str]:
+    """Stream the text blocks of word/document.xml, in document order.
+    
+    Body paragraphs, table cells and text boxes are read in a single
+    iterparse pass. A table cell is one block whose paragraphs are joined by
+    newlines, as in python-docx's cell.text. Text boxes also have a legacy
+    VML copy under mc:Fallback, which is skipped so their text is not
+    duplicated. Blocks are emitted when they close, so a text box comes
+    before the paragraph it is anchored in.
+    """
+    with zipfile.ZipFile(docx if isinstance(docx, str) else io.BytesIO(docx)) as zf:
+        with zf.open("word/document.xml") as xml:
+            paragraphs: List[List[str]] = []
+            cells: List[List[str]] = []
+            open_elems: List[ElementTree.Element] = []
+            fallback_depth = 0
+            for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    open_elems.append(elem)
+                    if tag == _MC_FALLBACK:
+                        fallback_depth += 1
+                    elif fallback_depth:
+                        pass
+                    elif tag == _W + "p":
+                        paragraphs.append([])
+                    elif tag == _W + "tc":
+                        cells.append([])
+                    continue
+                
+                open_elems.pop()
+                if tag == _MC_FALLBACK:
+                    fallback_depth -= 1
+                elif fallback_depth:
+                    continue
+                elif tag == _W + "tc":
+                    yield "\n".join(cells.pop())
+                elif not paragraphs:
+                    pass
+                elif tag == _W + "t":
+                    paragraphs[-1].append(elem.text or "")
+                elif tag in _DOCX_RUN_CHARS:
+                    paragraphs[-1].append(_DOCX_RUN_CHARS[tag])
+                elif tag == _W + "br":
+                    # Page and column breaks carry no text
+                    if elem.get(_W + "type", "textWrapping") == "textWrapping":
+                        paragraphs[-1].append("\n")
+                elif tag == _W + "p":
+                    text = "".join(paragraphs.pop())
+                    if cells and not paragraphs:
+                        cells[-1].append(text)
+                    else:
+                        yield text
+                
+                # Detach finished blocks so memory stays flat on large documents
+                if tag in _DOCX_BLOCKS and open_elems:
+                    open_elems[-1].remove(elem)
+
+
+def _extract_text_from_docx_fast(docx: Union[str, bytes]) -> str:
+    lines: List[str] = []
+    for text in _iter_docx_blocks(docx):
+        t = text.strip()
+        if t:
+            lines.append(t)
+    return "\n".join(lines)
+
+
+def extract_text_from_docx(docx: Union[str, bytes]) -> str:
+    """Extract text from a DOCX path or DOCX bytes with better formatting and error handling.
+    
+    The streaming reader of word/document.xml is tried first; python-docx
+    is the fallback for packages it cannot read or that yield no text.
+    """
+    label = docx if isinstance(docx, str) else "<in-memory document>"
     try:
-        doc = Document(docx_path)
+        result = _extract_text_from_docx_fast(docx)
+        if result:
+            return result
+    except (KeyError, OSError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        print(f"⚠️  Fast DOCX reader failed on {label} ({e}), falling back to python-docx...")
+    
+    try:
+        doc = Document(docx if isinstance(docx, str) else io.BytesIO(docx))
         lines: List[str] = []
         
         for p in doc.paragraphs:
@@ -106,8 +287,8 @@ def extract_text_from_docx(docx_path: str) -> str:
         
         # If still no text, log detailed information
         if not result.strip():
-            print(f"❌ ERROR: No text could be extracted from DOCX file: {docx_path}")
-            print(f"   File size: {os.path.getsize(docx_path)} bytes")
+            print(f"❌ ERROR: No text could be extracted from DOCX file: {label}")
+            print(f"   File size: {os.path.getsize(docx) if isinstance(docx, str) else len(docx)} bytes")
             print(f"   Paragraphs found: {len(doc.paragraphs)}")
             print(f"   Tables found: {len(doc.tables)}")
             
@@ -118,14 +299,20 @@ def extract_text_from_docx(docx_path: str) -> str:
         return result
         
     except Exception as e:
-        print(f"❌ ERROR extracting text from DOCX {docx_path}: {e}")
+        print(f"❌ ERROR extracting text from DOCX {label}: {e}")
         # Return empty string instead of raising exception
         return ""
 
 
-def extract_text_from_txt(txt_path: str) -> str:
-    """Extract text from TXT file."""
-    with open(txt_path, "r", encoding="utf-8") as f:
+def extract_text_from_txt(txt: Union[str, bytes]) -> str:
+    """Extract text from a TXT path or UTF-8 bytes."""
+    if isinstance(txt, str):
+        f = open(txt, "r", encoding="utf-8")
+    else:
+        # newline=None gives the same universal-newline handling as open()
+        f = io.StringIO(txt.decode("utf-8"), newline=None)
+    
+    with f:
         lines: List[str] = []
         for ln in f:
             s = (ln or "").strip()
@@ -135,32 +322,104 @@ def extract_text_from_txt(txt_path: str) -> str:
     return "\n".join(lines)
 
 
-def load_text(file_path: str) -> str:
-    """Load text from various file formats."""
-    print(f"DEBUG load_text: Attempting to load file: {file_path}")
-    print(f"DEBUG load_text: File exists: {os.path.exists(file_path)}")
-    print(f"DEBUG load_text: Current working directory: {os.getcwd()}")
+def load_text(source: DocumentSource, filename: Optional[str] = None,
+              pdf_max_pages: Optional[int] = None,
+              pdf_max_chars: Optional[int] = None,
+              pdf_workers: int = 1) -> str:
+    """Load text from various file formats.
     
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
+    ``source`` is a file path, or the document bytes / a binary file-like
+    object. In-memory sources are parsed without touching the disk and need
+    ``filename`` to tell the format. The ``pdf_*`` options are passed to
+    extract_text_from_pdf.
+    """
+    if isinstance(source, str):
+        file_path = source
+        print(f"DEBUG load_text: Attempting to load file: {file_path}")
+        print(f"DEBUG load_text: File exists: {os.path.exists(file_path)}")
+        print(f"DEBUG load_text: Current working directory: {os.getcwd()}")
+        
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        document: Union[str, bytes] = file_path
+        ext = os.path.splitext(file_path)[1].lower()
+    else:
+        document = bytes(source) if isinstance(source, (bytes, bytearray)) else source.read()
+        ext = os.path.splitext(filename or "")[1].lower()
+        print(f"DEBUG load_text: Loading {len(document)} bytes from memory ({filename})")
     
-    ext = os.path.splitext(file_path)[1].lower()
     print(f"DEBUG load_text: File extension: {ext}")
     
     if ext == ".pdf":
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(document, pdf_max_pages, pdf_max_chars, pdf_workers)
     elif ext in (".docx", ".doc"):
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(document)
     elif ext == ".txt":
-        return extract_text_from_txt(file_path)
+        return extract_text_from_txt(document)
     else:
         raise ValueError(f"Unsupported file format: {ext}")
 
 
 # ----------------------- Contact extraction -----------------------
 
-def extract_contact_info(text: str) -> Dict[str, Any]:
-    """Extract contact information using comprehensive regex patterns."""
+# Default header window of the windowed contact scan
+CONTACT_WINDOW_LINES = 30
+CONTACT_WINDOW_CHARS = 3000
+
+
+def contact_window(text: str, max_lines: int = CONTACT_WINDOW_LINES,
+                   max_chars: int = CONTACT_WINDOW_CHARS) -> str:
+    """Bounded region of text where contact details usually are.
+    
+    The first max_lines lines (at most max_chars characters), followed by
+    the same amount from a "Contact" section header further down, if any.
+    """
+    def block(start: int) -> str:
+        limit = min(len(text), start + max_chars)
+        end = start
+        for _ in range(max_lines):
+            newline = text.find('\n', end, limit)
+            if newline < 0:
+                return text[start:limit]
+            end = newline + 1
+        return text[start:end]
+    
+    window = block(0)
+    header = patterns.CONTACT_HEADER.search(text, len(window))
+    if header:
+        window += "\n" + block(header.start())
+    return window
+
+
+def extract_contact_info(text: str, window_lines: Optional[int] = None,
+                         window_chars: Optional[int] = None) -> Dict[str, Any]:
+    """Extract contact information using comprehensive regex patterns.
+    
+    With window_lines or window_chars set, only the contact_window of the
+    text is scanned, and the full text only when the window has no email
+    or phone (the address scorer nearly always returns a best guess, so it
+    cannot tell a contact block apart).
+    """
+    return scan_contact_info(text, window_lines, window_chars)[0]
+
+
+def scan_contact_info(text: str, window_lines: Optional[int] = None,
+                      window_chars: Optional[int] = None) -> Tuple[Dict[str, Any], str]:
+    """extract_contact_info, plus the part of the text that was scanned:
+    "header" when the contact window was enough, otherwise "full_text"."""
+    if window_lines is None and window_chars is None:
+        return _scan_contact_info(text), "full_text"
+    
+    window = contact_window(text, window_lines or CONTACT_WINDOW_LINES, window_chars or CONTACT_WINDOW_CHARS)
+    contact_info = _scan_contact_info(window)
+    if len(window) < len(text) and not (contact_info["emails"] or contact_info["phones"]):
+        return _scan_contact_info(text), "full_text"
+    return contact_info, "header"
+
+
+def _scan_contact_info(text: str) -> Dict[str, Any]:
+    """Emails, phones, LinkedIn URL and address found anywhere in text."""
     contact_info = {
         "emails": [],
         "phones": [],
@@ -169,31 +428,23 @@ def extract_contact_info(text: str) -> Dict[str, Any]:
     }
     
     # Extract emails
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
+    emails = patterns.EMAIL.findall(text)
     contact_info["emails"] = _dedupe_list(emails)
     
     # Extract phone numbers (multiple formats)
-    phone_patterns = [
-        r'\+?[\d\s\-\(\)]{10,}',  # International format
-        r'\b\d{3}[\s\-]?\d{3}[\s\-]?\d{4}\b',  # US/Canada format
-        r'\b\d{2}[\s\-]?\d{2}[\s\-]?\d{2}[\s\-]?\d{2}[\s\-]?\d{2}\b',  # French format
-    ]
-    
     phones = []
-    for pattern in phone_patterns:
-        matches = re.findall(pattern, text)
+    for pattern in patterns.PHONES:
+        matches = pattern.findall(text)
         for match in matches:
             # Clean phone number
-            cleaned = re.sub(r'[^\d\s\+\(\)\-]', '', match)
+            cleaned = patterns.PHONE_DISALLOWED.sub('', match)
             if len(cleaned.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')) >= 7:
                 phones.append(cleaned.strip())
     
     contact_info["phones"] = _dedupe_list(phones)
     
     # Extract LinkedIn
-    linkedin_pattern = r'linkedin\.com/[^\s\n]+'
-    linkedin_match = re.search(linkedin_pattern, text, re.IGNORECASE)
+    linkedin_match = patterns.LINKEDIN.search(text)
     if linkedin_match:
         contact_info["linkedin"] = linkedin_match.group(0)
     
@@ -203,13 +454,8 @@ def extract_contact_info(text: str) -> Dict[str, Any]:
         contact_info["address"] = extract_contact_address(text)
     except ImportError:
         # Fallback to simple pattern matching if address_extractor is not available
-        address_patterns = [
-            r'[A-Za-zÀ-ÿ\s]+\d{4,5}\s*[A-Za-zÀ-ÿ\s]*',  # French postal code
-            r'[A-Za-zÀ-ÿ\s]+,\s*[A-Za-zÀ-ÿ\s]+',  # City, Country format
-        ]
-        
-        for pattern in address_patterns:
-            address_match = re.search(pattern, text)
+        for pattern in patterns.SIMPLE_ADDRESSES:
+            address_match = pattern.search(text)
             if address_match:
                 address = address_match.group(0).strip()
                 if len(address) > 10:  # Filter out very short matches
@@ -219,35 +465,66 @@ def extract_contact_info(text: str) -> Dict[str, Any]:
     return contact_info
 
 
+# ----------------------- Section segmentation -----------------------
+
+class SectionIndex:
+    """Single-pass segmentation of CV text into per-section line spans.
+
+    The text is walked once; each line is classified against every header
+    keyword with a single regex call and each section records the ``(start, end)`` spans of the
+    content lines it owns. Section parsers then read only their own slice.
+    """
+
+    SECTIONS = tuple(rule[0] for rule in patterns.SECTION_RULES)
+
+    def __init__(self, text: str):
+        self.lines: List[str] = [s for s in (ln.strip() for ln in (text or "").split('\n')) if s]
+        self.spans: Dict[str, List[Tuple[int, int]]] = {name: [] for name in self.SECTIONS}
+        self._build()
+
+    def _build(self) -> None:
+        open_at: Dict[str, int] = {}
+
+        def close(name: str, end: int) -> None:
+            start = open_at.pop(name)
+            if end > start:
+                self.spans[name].append((start, end))
+
+        for i, line in enumerate(self.lines):
+            exact, found = patterns.classify_header(line)
+            if not found:
+                continue
+
+            for name, enter_mode, enter, leave_mode, leave in patterns.SECTION_RULES:
+                if (exact in enter) if enter_mode == "match" else bool(found & enter):
+                    # Header lines are consumed; (re-)entering starts a new span
+                    if name in open_at:
+                        close(name, i)
+                    open_at[name] = i + 1
+                elif name in open_at and ((exact in leave) if leave_mode == "match" else bool(found & leave)):
+                    close(name, i)
+
+        for name in list(open_at):
+            close(name, len(self.lines))
+
+    def section_lines(self, name: str) -> List[str]:
+        """Return the content lines of a section, in document order."""
+        out: List[str] = []
+        for start, end in self.spans[name]:
+            out.extend(self.lines[start:end])
+        return out
+
+
 # ----------------------- Skills extraction -----------------------
 
-def extract_skills(text: str) -> List[str]:
+def extract_skills(text: str, sections: Optional["SectionIndex"] = None) -> List[str]:
     """Extract skills using improved bullet point detection and Unicode handling."""
     skills = []
     
-    # Find the skills section by looking for the section header and content
-    lines = text.split('\n')
-    in_skills = False
-    skills_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if we're entering skills section (more flexible matching)
-        if re.search(r'\b(?:TECHNICAL\s+SKILLS|COMPÉTENCES|SKILLS)\b', line, re.IGNORECASE):
-            in_skills = True
-            continue
-        
-        # Check if we're leaving skills section (more flexible matching)
-        # Only leave if it's a standalone section header, not content
-        if in_skills and re.match(r'^(?:LANGUAGES|LANGUES|EDUCATION|FORMATION|EXPERIENCE|PROJECTS|CERTIFICATIONS)$', line, re.IGNORECASE):
-            in_skills = False
-            continue
-        
-        if in_skills:
-            skills_lines.append(line)
+    # Read the skills section from the shared single-pass segmentation
+    if sections is None:
+        sections = SectionIndex(text)
+    skills_lines = sections.section_lines("skills")
     
     # Parse skills from the collected lines
     current_category = ""
@@ -258,10 +535,10 @@ def extract_skills(text: str) -> List[str]:
             continue
         
         # Remove zero-width spaces and other invisible Unicode characters
-        line = re.sub(r'[\u200B\u200C\u200D\uFEFF]', '', line)
+        line = patterns.ZERO_WIDTH.sub('', line)
         
         # Check for bullet points (including special Unicode characters)
-        bullet_match = re.match(r'^[●○•\-\*]\s*', line)
+        bullet_match = patterns.BULLET.match(line)
         if bullet_match:
             # Process previous category if exists
             if current_skills:
@@ -271,7 +548,7 @@ def extract_skills(text: str) -> List[str]:
                 current_skills = []
             
             # Extract content after bullet
-            content = re.sub(r'^[●○•\-\*]\s*', '', line)
+            content = line[bullet_match.end():]
             if content:
                 # Handle "Category: skill1, skill2, skill3" format
                 if ':' in content:
@@ -280,7 +557,7 @@ def extract_skills(text: str) -> List[str]:
                         current_category = parts[0].strip()
                         skill_list = parts[1].strip()
                         # Split by common separators
-                        skill_items = re.split(r'[,;/|]', skill_list)
+                        skill_items = patterns.LIST_SEPARATORS.split(skill_list)
                         for skill in skill_items:
                             skill = skill.strip()
                             if skill and len(skill) >= 2:
@@ -289,7 +566,7 @@ def extract_skills(text: str) -> List[str]:
                                     current_skills.append(skill)
                 else:
                     # Single skill or comma-separated list
-                    skill_items = re.split(r'[,;/|]', content)
+                    skill_items = patterns.LIST_SEPARATORS.split(content)
                     for skill in skill_items:
                         skill = skill.strip()
                         if skill and len(skill) >= 2:
@@ -297,9 +574,9 @@ def extract_skills(text: str) -> List[str]:
         else:
             # This might be a continuation line (no bullet)
             # Check if it looks like skill content
-            if line and not re.match(r'^[A-Z\s]+$', line):  # Not just uppercase words
+            if line and not patterns.UPPERCASE_ONLY.match(line):  # Not just uppercase words
                 # Split by common separators
-                skill_items = re.split(r'[,;/|]', line)
+                skill_items = patterns.LIST_SEPARATORS.split(line)
                 for skill in skill_items:
                     skill = skill.strip()
                     if skill and len(skill) >= 2:
@@ -316,32 +593,14 @@ def extract_skills(text: str) -> List[str]:
 
 # ----------------------- Languages extraction -----------------------
 
-def extract_languages(text: str) -> List[Dict[str, str]]:
+def extract_languages(text: str, sections: Optional["SectionIndex"] = None) -> List[Dict[str, str]]:
     """Extract languages using improved section detection and Unicode handling."""
     languages = []
     
-    # Find the languages section by looking for the section header and content
-    lines = text.split('\n')
-    in_languages = False
-    languages_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if we're entering languages section (exact match for section headers)
-        if re.match(r'^(?:LANGUAGES|LANGUES)$', line, re.IGNORECASE):
-            in_languages = True
-            continue
-        
-        # Check if we're leaving languages section (more flexible matching)
-        if in_languages and re.search(r'\b(?:CERTIFICATIONS|EDUCATION|FORMATION|EXPERIENCE|PROJECTS|SKILLS)\b', line, re.IGNORECASE):
-            in_languages = False
-            continue
-        
-        if in_languages:
-            languages_lines.append(line)
+    # Read the languages section from the shared single-pass segmentation
+    if sections is None:
+        sections = SectionIndex(text)
+    languages_lines = sections.section_lines("languages")
     
     # Parse languages from the collected lines
     for line in languages_lines:
@@ -349,14 +608,15 @@ def extract_languages(text: str) -> List[Dict[str, str]]:
             continue
         
         # Remove zero-width spaces and other invisible Unicode characters
-        line = re.sub(r'[\u200B\u200C\u200D\uFEFF]', '', line)
+        line = patterns.ZERO_WIDTH.sub('', line)
         
         # Check for bullet points
-        if re.match(r'^[●○•\-\*]\s*', line):
-            content = re.sub(r'^[●○•\-\*]\s*', '', line)
+        bullet_match = patterns.BULLET.match(line)
+        if bullet_match:
+            content = line[bullet_match.end():]
             if content:
                 # Look for "Language: Level" pattern
-                lang_match = re.match(r'^([A-Za-zÀ-ÿ]+)\s*[:\-–]\s*([A-Za-zÀ-ÿ\s]+)$', content)
+                lang_match = patterns.LANGUAGE_LEVEL.match(content)
                 if lang_match:
                     language = lang_match.group(1).title()
                     level = lang_match.group(2).strip().title()
@@ -365,7 +625,7 @@ def extract_languages(text: str) -> List[Dict[str, str]]:
         else:
             # Check if it's a language line without bullet (continuation)
             # Look for "Language: Level" pattern
-            lang_match = re.match(r'^([A-Za-zÀ-ÿ]+)\s*[:\-–]\s*([A-Za-zÀ-ÿ\s]+)$', line)
+            lang_match = patterns.LANGUAGE_LEVEL.match(line)
             if lang_match:
                 language = lang_match.group(1).title()
                 level = lang_match.group(2).strip().title()
@@ -377,32 +637,14 @@ def extract_languages(text: str) -> List[Dict[str, str]]:
 
 # ----------------------- Education extraction -----------------------
 
-def extract_education(text: str) -> List[Dict[str, Any]]:
+def extract_education(text: str, sections: Optional["SectionIndex"] = None) -> List[Dict[str, Any]]:
     """Extract education information with improved structure detection."""
     education_entries = []
     
-    # Find the education section by looking for the section header and content
-    lines = text.split('\n')
-    in_education = False
-    education_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if we're entering education section (exact match for section headers)
-        if re.match(r'^(?:EDUCATION|FORMATION|ÉDUCATION)$', line, re.IGNORECASE):
-            in_education = True
-            continue
-        
-        # Check if we're leaving education section (more flexible matching)
-        if in_education and re.search(r'\b(?:Expérience Professionnelle|EXPERIENCE|PROJECTS|SKILLS|LANGUAGES)\b', line, re.IGNORECASE):
-            in_education = False
-            continue
-        
-        if in_education:
-            education_lines.append(line)
+    # Read the education section from the shared single-pass segmentation
+    if sections is None:
+        sections = SectionIndex(text)
+    education_lines = sections.section_lines("education")
     
     # Parse education from the collected lines
     current_entry = None
@@ -412,11 +654,11 @@ def extract_education(text: str) -> List[Dict[str, Any]]:
             continue
         
         # Remove zero-width spaces and other invisible Unicode characters
-        line = re.sub(r'[\u200B\u200C\u200D\uFEFF]', '', line)
+        line = patterns.ZERO_WIDTH.sub('', line)
         
         # Check for date range pattern (e.g., "SEPT 2022- PRÉSENT :" or "SEPT 2020 - JUIN 2022 :")
         # Use Unicode-aware pattern for French month names
-        date_range_match = re.match(r'^([A-ZÀ-ÿ]+\s+\d{4}[-–]\s*(?:PRÉSENT|\d{4}))\s*:\s*(.+)$', line, re.IGNORECASE)
+        date_range_match = patterns.EDUCATION_DATE_RANGE.match(line)
         if date_range_match:
             # Start new entry
             if current_entry:
@@ -433,11 +675,11 @@ def extract_education(text: str) -> List[Dict[str, Any]]:
             # Try to extract institution and degree from content
             if content:
                 # Look for institution patterns
-                institution_match = re.search(r'\(([^)]+)\)', content)
+                institution_match = patterns.PARENTHESIZED.search(content)
                 if institution_match:
                     current_entry["institution"] = institution_match.group(1).strip()
                     # Remove institution from content to get degree
-                    degree_content = re.sub(r'\([^)]+\)', '', content).strip()
+                    degree_content = patterns.PARENTHESIZED.sub('', content).strip()
                     if degree_content:
                         current_entry["degree"] = degree_content
                 else:
@@ -445,15 +687,15 @@ def extract_education(text: str) -> List[Dict[str, Any]]:
                     current_entry["degree"] = content
         
         # Check for bullet points (coursework/details)
-        elif re.match(r'^[●○•\-\*]\s*', line):
-            content = re.sub(r'^[●○•\-\*]\s*', '', line)
+        elif patterns.BULLET.match(line):
+            content = patterns.BULLET.sub('', line)
             if content and current_entry:
                 current_entry["details"].append(content.strip())
         
         # Check for continuation lines (no bullet, no date range)
         elif current_entry and _is_meaningful_text(line):
             # This might be a continuation of institution/degree or additional details
-            if not re.match(r'^[A-Z\s]+$', line):  # Not just uppercase words
+            if not patterns.UPPERCASE_ONLY.match(line):  # Not just uppercase words
                 current_entry["details"].append(line.strip())
             else:
                 # Might be institution or degree continuation
@@ -471,32 +713,14 @@ def extract_education(text: str) -> List[Dict[str, Any]]:
 
 # ----------------------- Experience extraction -----------------------
 
-def extract_experience(text: str) -> List[Dict[str, Any]]:
+def extract_experience(text: str, sections: Optional["SectionIndex"] = None) -> List[Dict[str, Any]]:
     """Extract experience information with improved structure detection."""
     experience_entries = []
     
-    # Find the experience section by looking for the section header and content
-    lines = text.split('\n')
-    in_experience = False
-    experience_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if we're entering experience section (more flexible matching)
-        if re.search(r'\b(?:Expérience Professionnelle|EXPERIENCE|EMPLOI|Professional Experience)\b', line, re.IGNORECASE):
-            in_experience = True
-            continue
-        
-        # Check if we're leaving experience section (more flexible matching)
-        if in_experience and re.search(r'\b(?:PROJECTS|EDUCATION|FORMATION|SKILLS|LANGUAGES)\b', line, re.IGNORECASE):
-            in_experience = False
-            continue
-        
-        if in_experience:
-            experience_lines.append(line)
+    # Read the experience section from the shared single-pass segmentation
+    if sections is None:
+        sections = SectionIndex(text)
+    experience_lines = sections.section_lines("experience")
     
     # Parse experience from the collected lines
     current_entry = None
@@ -507,17 +731,12 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
             continue
         
         # Remove zero-width spaces and other invisible Unicode characters
-        line = re.sub(r'[\u200B\u200C\u200D\uFEFF]', '', line)
+        line = patterns.ZERO_WIDTH.sub('', line)
         
         # Check for date range pattern (e.g., "JUIN 2024 - AOÛT 2024 :" or "Juin 2023 - Août 2023 :")
         # Use Unicode-aware pattern for French month names
-        date_range_match = re.match(r'^([A-Za-zÀ-ÿ]+\s+\d{4}\s*[-–]\s*[A-Za-zÀ-ÿ]+\s+\d{4})\s*:\s*(.+)$', line, re.IGNORECASE)
-        if not date_range_match:
-            # Try alternative pattern without colon (e.g., "JUIN 2024 - AOÛT 2024 Progiciel System,")
-            date_range_match = re.match(r'^([A-Za-zÀ-ÿ]+\s+\d{4}\s*[-–]\s*[A-Za-zÀ-ÿ]+\s+\d{4})\s+(.+)$', line, re.IGNORECASE)
-        if not date_range_match:
-            # Try pattern with space before colon (e.g., "JUIN 2024 - AOÛT 2024 : Progiciel System,")
-            date_range_match = re.match(r'^([A-Za-zÀ-ÿ]+\s+\d{4}\s*[-–]\s*[A-Za-zÀ-ÿ]+\s+\d{4})\s+:\s*(.+)$', line, re.IGNORECASE)
+        # Also accepts the form without colon (e.g., "JUIN 2024 - AOÛT 2024 Progiciel System,")
+        date_range_match = patterns.EXPERIENCE_DATE_RANGE.match(line)
         if date_range_match:
             # Finalize previous entry
             if current_entry:
@@ -526,7 +745,7 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
                 experience_entries.append(current_entry)
             
             date_range = date_range_match.group(1).strip()
-            content = date_range_match.group(2).strip()
+            content = (date_range_match.group(2) or date_range_match.group(3)).strip()
             
             current_entry = {
                 "date_range": date_range,
@@ -544,15 +763,15 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
                     current_entry["company"] = content
         
         # Check for bullet points (details)
-        elif re.match(r'^[●○•\-\*○]\s*', line):
-            content = re.sub(r'^[●○•\-\*○]\s*', '', line)
+        elif patterns.BULLET.match(line):
+            content = patterns.BULLET.sub('', line)
             if content and current_entry and _is_meaningful_text(content):
                 current_details.append(content.strip())
         
         # Check for continuation lines (no bullet, no date range)
         elif current_entry and _is_meaningful_text(line):
             # This might be a continuation of company/role or additional details
-            if not re.match(r'^[A-Z\s]+$', line):  # Not just uppercase words
+            if not patterns.UPPERCASE_ONLY.match(line):  # Not just uppercase words
                 current_details.append(line.strip())
             else:
                 # Might be company or role continuation
@@ -572,32 +791,14 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
 
 # ----------------------- Projects extraction -----------------------
 
-def extract_projects(text: str) -> List[Dict[str, Any]]:
+def extract_projects(text: str, sections: Optional["SectionIndex"] = None) -> List[Dict[str, Any]]:
     """Extract project information."""
     projects = []
     
-    # Find the projects section by looking for the section header and content
-    lines = text.split('\n')
-    in_projects = False
-    projects_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if we're entering projects section (exact match for section headers)
-        if re.match(r'^(?:PROJECTS|PROJETS)$', line, re.IGNORECASE):
-            in_projects = True
-            continue
-        
-        # Check if we're leaving projects section (exact match for section headers)
-        if in_projects and re.match(r'^(?:EDUCATION|FORMATION|EXPERIENCE|SKILLS|LANGUAGES)$', line, re.IGNORECASE):
-            in_projects = False
-            continue
-        
-        if in_projects:
-            projects_lines.append(line)
+    # Read the projects section from the shared single-pass segmentation
+    if sections is None:
+        sections = SectionIndex(text)
+    projects_lines = sections.section_lines("projects")
     
     # Parse projects from the collected lines
     for line in projects_lines:
@@ -605,8 +806,9 @@ def extract_projects(text: str) -> List[Dict[str, Any]]:
             continue
         
         # Check for bullet points
-        if re.match(r'^[●○•\-\*]\s*', line):
-            content = re.sub(r'^[●○•\-\*]\s*', '', line)
+        bullet_match = patterns.BULLET.match(line)
+        if bullet_match:
+            content = line[bullet_match.end():]
             if content:
                 # Look for project description
                 if ':' in content:
@@ -626,32 +828,12 @@ def extract_projects(text: str) -> List[Dict[str, Any]]:
 
 # ----------------------- Summary extraction -----------------------
 
-def extract_summary(text: str) -> List[str]:
+def extract_summary(text: str, sections: Optional["SectionIndex"] = None) -> List[str]:
     """Extract professional summary with better content detection."""
-    summary_lines = []
-    
-    # Find the summary section by looking for the section header and content
-    lines = text.split('\n')
-    in_summary = False
-    summary_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if we're entering summary section (exact match for section headers)
-        if re.match(r'^(?:SUMMARY|RÉSUMÉ|PROFILE)$', line, re.IGNORECASE):
-            in_summary = True
-            continue
-        
-        # Check if we're leaving summary section (exact match for section headers)
-        if in_summary and re.match(r'^(?:TECHNICAL SKILLS|SKILLS|EDUCATION|FORMATION|EXPERIENCE|LANGUAGES|PROJECTS)$', line, re.IGNORECASE):
-            in_summary = False
-            continue
-        
-        if in_summary:
-            summary_lines.append(line)
+    # Read the summary section from the shared single-pass segmentation
+    if sections is None:
+        sections = SectionIndex(text)
+    summary_lines = sections.section_lines("summary")
     
     # Parse summary from the collected lines
     summary_text = []
@@ -661,7 +843,7 @@ def extract_summary(text: str) -> List[str]:
             continue
         
         # Skip if it contains contact information
-        if re.search(r'@', line) or re.search(r'\+?\d', line) or re.search(r'linkedin\.com|github\.com', line):
+        if patterns.CONTACT_HINT.search(line):
             continue
         
         # Skip if it's too short or looks like a fragment
@@ -681,70 +863,265 @@ def extract_summary(text: str) -> List[str]:
 class CVExtractor:
     """Improved CV extractor with better parsing accuracy."""
     
-    def extract_raw_text(self, file_path: str) -> str:
-        """Extract raw text from CV file and save to data.txt."""
-        text = load_text(file_path)
+    def __init__(self, text_cache: Optional[RawTextCache] = None,
+                 pdf_max_pages: Optional[int] = None,
+                 pdf_max_chars: Optional[int] = None,
+                 pdf_workers: int = 1,
+                 contact_window_lines: Optional[int] = None,
+                 contact_window_chars: Optional[int] = None):
+        # Optional content-addressed cache of extracted text
+        self.text_cache = text_cache
+        # PDF page/character budget and page-range parallelism
+        self.pdf_options = {
+            "pdf_max_pages": pdf_max_pages,
+            "pdf_max_chars": pdf_max_chars,
+            "pdf_workers": pdf_workers,
+        }
+        # Header window of the contact scan (None scans the full text)
+        self.contact_options = {
+            "window_lines": contact_window_lines,
+            "window_chars": contact_window_chars,
+        }
+    
+    def _load_text(self, source: DocumentSource, filename: Optional[str] = None) -> str:
+        """load_text with a lookup in the raw-text cache first."""
+        if self.text_cache is None:
+            return load_text(source, filename, **self.pdf_options)
         
-        # Save raw text to data.txt in the same directory as the CV file
-        cv_dir = os.path.dirname(file_path)
-        data_txt_path = os.path.join(cv_dir, "data.txt")
+        if isinstance(source, str):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+            with open(source, "rb") as f:
+                content = f.read()
+            filename = source
+        else:
+            content = bytes(source) if isinstance(source, (bytes, bytearray)) else source.read()
         
-        with open(data_txt_path, "w", encoding="utf-8") as f:
-            f.write(text)
+        ext = os.path.splitext(filename or "")[1].lower()
+        if ext == ".pdf" and (self.pdf_options["pdf_max_pages"] or self.pdf_options["pdf_max_chars"]):
+            # A budgeted extraction is a different text than the full one
+            ext += f"|pages={self.pdf_options['pdf_max_pages']}|chars={self.pdf_options['pdf_max_chars']}"
+        key = self.text_cache.key(content, ext)
+        text = self.text_cache.get(key)
+        if text is not None:
+            print(f"DEBUG: Raw text cache hit for {filename} ({key[:12]})")
+            return text
         
-        print(f"DEBUG: Raw text saved to: {data_txt_path}")
+        text = load_text(content, filename, **self.pdf_options)
+        self.text_cache.put(key, text)
         return text
     
-    def extract_cv_data(self, file_path: str) -> Dict[str, Any]:
-        """Extract structured CV data with improved parsing."""
-        text = load_text(file_path)
+    def extract_raw_text(self, source: DocumentSource, filename: Optional[str] = None) -> str:
+        """Extract raw text from a CV file path, or from document bytes /
+        a file-like object together with ``filename``.
+        
+        Nothing is written next to the CV; repeated documents are served
+        from the text cache when one is configured.
+        """
+        return self._load_text(source, filename)
+    
+    def extract_cv_data(self, source: DocumentSource, filename: Optional[str] = None) -> Dict[str, Any]:
+        """Extract structured CV data with improved parsing.
+        
+        ``source`` is a file path, or document bytes / a file-like object
+        together with ``filename``.
+        """
+        text = self._load_text(source, filename)
+        
+        # Segment the text once; every section parser reads its own slice
+        sections = SectionIndex(text)
         
         # Extract all information
         data = {
-            "contact_info": extract_contact_info(text),
-            "professional_summary": extract_summary(text),
-            "skills": extract_skills(text),
-            "languages": extract_languages(text),
-            "education": extract_education(text),
-            "experience": extract_experience(text),
-            "projects": extract_projects(text),
+            "contact_info": extract_contact_info(text, **self.contact_options),
+            "professional_summary": extract_summary(text, sections),
+            "skills": extract_skills(text, sections),
+            "languages": extract_languages(text, sections),
+            "education": extract_education(text, sections),
+            "experience": extract_experience(text, sections),
+            "projects": extract_projects(text, sections),
         }
         
         # Clean empty fields
         return {k: v for k, v in data.items() if v and (not isinstance(v, list) or len(v) > 0) and (not isinstance(v, dict) or any(v.values()))}
 
 
+def extractor_from_env() -> CVExtractor:
+    """CVExtractor configured from the environment, as used by the API.
+    
+    CV_TEXT_CACHE_* configure the raw-text cache (see text_cache.cache_from_env);
+    CV_PDF_MAX_PAGES, CV_PDF_MAX_CHARS and CV_PDF_WORKERS the PDF extraction;
+    CV_CONTACT_WINDOW_LINES and CV_CONTACT_WINDOW_CHARS the contact scan.
+    """
+    def _int_env(name: str) -> Optional[int]:
+        value = os.getenv(name)
+        return int(value) if value else None
+    
+    return CVExtractor(
+        cache_from_env(EXTRACTOR_VERSION),
+        pdf_max_pages=_int_env("CV_PDF_MAX_PAGES"),
+        pdf_max_chars=_int_env("CV_PDF_MAX_CHARS"),
+        pdf_workers=_int_env("CV_PDF_WORKERS") or 1,
+        contact_window_lines=_int_env("CV_CONTACT_WINDOW_LINES"),
+        contact_window_chars=_int_env("CV_CONTACT_WINDOW_CHARS"),
+    )
+
+
+# ----------------------- Batch processing -----------------------
+
+# One extractor per worker process, created by the pool initializer and
+# reused for every file the worker handles.
+_worker_extractor: Optional[CVExtractor] = None
+
+
+def _init_worker(text_cache_dir: Optional[str] = None, text_cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                 extractor_options: Optional[Dict[str, Any]] = None) -> None:
+    """Create the per-process extractor used by _extract_file.
+    
+    Workers share the on-disk tier of the text cache through text_cache_dir;
+    extractor_options are the remaining CVExtractor keyword arguments.
+    """
+    global _worker_extractor
+    text_cache = RawTextCache(text_cache_dir, EXTRACTOR_VERSION, max_bytes=text_cache_max_bytes) if text_cache_dir else None
+    _worker_extractor = CVExtractor(text_cache, **(extractor_options or {}))
+
+
+def _extract_file(in_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], float]:
+    """Extract one file; returns (data, error, seconds) and never raises."""
+    start = time.perf_counter()
+    try:
+        data = _worker_extractor.extract_cv_data(in_path)
+        return data, None, time.perf_counter() - start
+    except Exception as e:
+        return None, str(e), time.perf_counter() - start
+
+
+def _run_batch(paths: List[str], workers: int = 1, chunksize: int = 1,
+               text_cache_dir: Optional[str] = None,
+               text_cache_max_bytes: int = DEFAULT_MAX_BYTES,
+               extractor_options: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str], float]]:
+    """Yield extraction results for paths, in input order."""
+    if workers <= 1:
+        _init_worker(text_cache_dir, text_cache_max_bytes, extractor_options)
+        for path in paths:
+            yield _extract_file(path)
+        return
+    
+    with multiprocessing.Pool(processes=workers, initializer=_init_worker,
+                              initargs=(text_cache_dir, text_cache_max_bytes, extractor_options)) as pool:
+        # imap keeps input order while workers run ahead
+        for result in pool.imap(_extract_file, paths, chunksize=max(1, chunksize)):
+            yield result
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _print_throughput_report(timings: List[float], failures: int, wall_seconds: float) -> None:
+    """Print files/s, per-file latency percentiles and failure count."""
+    total = len(timings)
+    rate = total / wall_seconds if wall_seconds > 0 else 0.0
+    print("\nThroughput report:")
+    print(f"  Files:     {total} in {wall_seconds:.2f}s ({rate:.2f} files/s)")
+    print(f"  Per file:  p50 {_percentile(timings, 50) * 1000:.1f} ms, p95 {_percentile(timings, 95) * 1000:.1f} ms")
+    print(f"  Failures:  {failures}")
+
+
 # ----------------------- CLI -----------------------
 
 def main():
     parser = argparse.ArgumentParser(description="Improved CV parser with better section detection")
     parser.add_argument("input_dir", help="Directory containing CV files (pdf, docx, txt)")
     parser.add_argument("--output-dir", default="outputs", help="Directory for output JSON files")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes (default: 1, no pool)")
+    parser.add_argument("--chunksize", type=int, default=1, help="Files handed to a worker per task")
+    parser.add_argument("--max-failures", type=int, default=None,
+                        help="Exit with status 1 when more than this many files fail")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-parse every file even if the manifest says its output is current")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete outputs and manifest entries of inputs that no longer exist")
+    parser.add_argument("--text-cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Content-addressed raw-text cache shared with the API (empty string disables it)")
+    parser.add_argument("--text-cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Size budget of the on-disk text cache; least recently used entries are evicted")
+    parser.add_argument("--pdf-max-pages", type=int, default=None, help="Only read the first N pages of each PDF")
+    parser.add_argument("--pdf-max-chars", type=int, default=None, help="Stop reading a PDF once N characters are collected")
+    parser.add_argument("--pdf-workers", type=int, default=1,
+                        help="Split large PDFs into page ranges across N processes (only with --workers 1)")
+    parser.add_argument("--contact-window-lines", type=int, default=None,
+                        help=f"Scan only the first N lines (and a Contact section) for contact details, "
+                             f"falling back to the full text when nothing is found (default window: {CONTACT_WINDOW_LINES})")
+    parser.add_argument("--contact-window-chars", type=int, default=None,
+                        help=f"Character cap of the contact window (default: {CONTACT_WINDOW_CHARS})")
     args = parser.parse_args()
 
     os.makedirs(args.output_dir, exist_ok=True)
 
-    files = [f for f in os.listdir(args.input_dir) if f.lower().endswith((".pdf", ".docx", ".doc", ".txt"))]
+    files = sorted(f for f in os.listdir(args.input_dir) if f.lower().endswith((".pdf", ".docx", ".doc", ".txt")))
     print(f"Found {len(files)} file(s)")
     
-    for i, name in enumerate(files, 1):
-        in_path = os.path.join(args.input_dir, name)
-        out_path = os.path.join(args.output_dir, f"{os.path.splitext(name)[0]}.json")
-        print(f"[{i}/{len(files)}] Processing {name}")
-        
-        try:
-            extractor = CVExtractor()
-            data = extractor.extract_cv_data(in_path)
-            
-            # Save output
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+    manifest = ExtractionManifest(args.output_dir, EXTRACTOR_VERSION)
+    if args.prune:
+        for name in manifest.prune(set(files)):
+            print(f"🗑  Pruned output of deleted input: {name}")
+    
+    # Skip inputs whose content and extractor version match the manifest
+    pending: List[Tuple[str, Dict[str, Any]]] = []
+    for name in files:
+        fingerprint = manifest.fingerprint(name, os.path.join(args.input_dir, name))
+        if args.force or not manifest.is_current(name, fingerprint):
+            pending.append((name, fingerprint))
+    print(f"{len(files) - len(pending)} unchanged file(s) skipped, {len(pending)} to process")
+    
+    paths = [os.path.join(args.input_dir, name) for name, _ in pending]
+    timings: List[float] = []
+    failures = 0
+    start = time.perf_counter()
+    
+    try:
+        for i, ((name, fingerprint), (data, error, elapsed)) in enumerate(zip(pending, _run_batch(
+                paths, args.workers, args.chunksize,
+                args.text_cache_dir or None, int(args.text_cache_max_mb * 1024 * 1024),
+                {"pdf_max_pages": args.pdf_max_pages, "pdf_max_chars": args.pdf_max_chars,
+                 "pdf_workers": args.pdf_workers,
+                 "contact_window_lines": args.contact_window_lines,
+                 "contact_window_chars": args.contact_window_chars})), 1):
+            out_name = f"{os.path.splitext(name)[0]}.json"
+            out_path = os.path.join(args.output_dir, out_name)
+            print(f"[{i}/{len(pending)}] Processing {name}")
+            timings.append(elapsed)
             
-            print(f"✓ Saved: {out_path}")
-        except Exception as e:
-            print(f"✗ Error processing {name}: {e}")
+            try:
+                if error is not None:
+                    raise RuntimeError(error)
+                
+                # Save output
+                with open(out_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                
+                manifest.record(name, fingerprint, out_name)
+                print(f"✓ Saved: {out_path}")
+            except Exception as e:
+                failures += 1
+                manifest.forget(name)
+                print(f"✗ Error processing {name}: {e}")
+    finally:
+        # Keep progress of an interrupted run
+        manifest.save()
 
     print("\nExtraction complete!")
+    _print_throughput_report(timings, failures, time.perf_counter() - start)
+    
+    if args.max_failures is not None and failures > args.max_failures:
+        print(f"✗ {failures} failure(s) exceed --max-failures={args.max_failures}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
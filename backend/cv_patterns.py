@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Precompiled regex registry for the CV extractor.
+All header, bullet, date-range and contact patterns are compiled once at import
+so the per-line hot loops never go through the ``re`` module cache.
+"""
+
+import re
+from typing import FrozenSet, List, Optional, Tuple
+
+
+# ----------------------- Cleaning -----------------------
+
+HORIZONTAL_WHITESPACE = re.compile(r"[ \t]+")
+BLANK_LINES = re.compile(r"\n\s*\n")
+NOISE_ONLY = re.compile(r"^[\d\s\-_=*]+$")
+ZERO_WIDTH = re.compile(r'[\u200B\u200C\u200D\uFEFF]')
+UPPERCASE_ONLY = re.compile(r'^[A-Z\s]+$')
+
+# ----------------------- Bullets and lists -----------------------
+
+BULLET = re.compile(r'^[●○•\-\*]\s*')
+LIST_SEPARATORS = re.compile(r'[,;/|]')
+LANGUAGE_LEVEL = re.compile(r'^([A-Za-zÀ-ÿ]+)\s*[:\-–]\s*([A-Za-zÀ-ÿ\s]+)$')
+
+# ----------------------- Date ranges -----------------------
+
+# "SEPT 2022- PRÉSENT : Master ..." / "SEPT 2020 - JUIN 2022 : ..."
+EDUCATION_DATE_RANGE = re.compile(r'^([A-ZÀ-ÿ]+\s+\d{4}[-–]\s*(?:PRÉSENT|\d{4}))\s*:\s*(.+)$', re.IGNORECASE)
+PARENTHESIZED = re.compile(r'\(([^)]+)\)')
+
+# "JUIN 2024 - AOÛT 2024 : Progiciel System," with or without the colon.
+# The colon form is tried first, as the separate fallbacks used to be.
+EXPERIENCE_DATE_RANGE = re.compile(
+    r'^([A-Za-zÀ-ÿ]+\s+\d{4}\s*[-–]\s*[A-Za-zÀ-ÿ]+\s+\d{4})(?:\s*:\s*(.+)|\s+(.+))$',
+    re.IGNORECASE,
+)
+
+# ----------------------- Contact -----------------------
+
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONES: List[re.Pattern] = [
+    re.compile(r'\+?[\d\s\-\(\)]{10,}'),  # International format
+    re.compile(r'\b\d{3}[\s\-]?\d{3}[\s\-]?\d{4}\b'),  # US/Canada format
+    re.compile(r'\b\d{2}[\s\-]?\d{2}[\s\-]?\d{2}[\s\-]?\d{2}[\s\-]?\d{2}\b'),  # French format
+]
+PHONE_DISALLOWED = re.compile(r'[^\d\s\+\(\)\-]')
+LINKEDIN = re.compile(r'linkedin\.com/[^\s\n]+', re.IGNORECASE)
+SIMPLE_ADDRESSES: List[re.Pattern] = [
+    re.compile(r'[A-Za-zÀ-ÿ\s]+\d{4,5}\s*[A-Za-zÀ-ÿ\s]*'),  # French postal code
+    re.compile(r'[A-Za-zÀ-ÿ\s]+,\s*[A-Za-zÀ-ÿ\s]+'),  # City, Country format
+]
+# Any of "@", a digit, or a profile URL marks a line as contact details
+CONTACT_HINT = re.compile(r'@|\+?\d|linkedin\.com|github\.com')
+# A line consisting of a contact section header ("Contact", "Coordonnées", ...)
+CONTACT_HEADER = re.compile(
+    r'^[ \t]*(?:contact(?:s|\s+information)?|coordonn[ée]es|informations\s+personnelles|personal\s+details)[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# ----------------------- Section headers -----------------------
+
+# One named group per header keyword. A line is classified with a single
+# finditer call instead of one regex per section rule.
+_HEADER_KEYWORDS: List[Tuple[str, str]] = [
+    ("technical_skills", r'TECHNICAL SKILLS'),
+    ("technical_skills_spaced", r'TECHNICAL\s+SKILLS'),
+    ("skills", r'SKILLS'),
+    ("competences", r'COMPÉTENCES'),
+    ("languages", r'LANGUAGES'),
+    ("langues", r'LANGUES'),
+    ("education", r'EDUCATION'),
+    ("education_fr", r'ÉDUCATION'),
+    ("formation", r'FORMATION'),
+    ("experience_fr", r'Expérience Professionnelle'),
+    ("professional_experience", r'Professional Experience'),
+    ("experience", r'EXPERIENCE'),
+    ("emploi", r'EMPLOI'),
+    ("projects", r'PROJECTS'),
+    ("projets", r'PROJETS'),
+    ("certifications", r'CERTIFICATIONS'),
+    ("summary", r'SUMMARY'),
+    ("resume", r'RÉSUMÉ'),
+    ("profile", r'PROFILE'),
+]
+
+HEADER = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in _HEADER_KEYWORDS) + r')\b',
+    re.IGNORECASE,
+)
+
+# Multi-word keywords also contain the single-word keyword they end with
+_IMPLIED_KEYWORDS = {
+    "technical_skills": ("skills", "technical_skills_spaced"),
+    "technical_skills_spaced": ("skills",),
+    "professional_experience": ("experience",),
+}
+
+
+def classify_header(line: str) -> Tuple[Optional[str], FrozenSet[str]]:
+    """Classify a stripped line against every header keyword in one pass.
+
+    Returns the keyword the whole line consists of (or None) and the set of
+    keywords found anywhere in the line on word boundaries.
+    """
+    exact = None
+    found = set()
+    for m in HEADER.finditer(line):
+        name = m.lastgroup
+        found.add(name)
+        found.update(_IMPLIED_KEYWORDS.get(name, ()))
+        if m.start() == 0 and m.end() == len(line):
+            exact = name
+    return exact, frozenset(found)
+
+
+# (section, enter mode, enter keywords, exit mode, exit keywords) for every
+# section parser. "match" rules need the whole line to be one of the
+# keywords, "search" rules accept the keyword anywhere in the line.
+SECTION_RULES: List[Tuple[str, str, FrozenSet[str], str, FrozenSet[str]]] = [
+    ("summary",
+     "match", frozenset({"summary", "resume", "profile"}),
+     "match", frozenset({"technical_skills", "skills", "education", "formation", "experience", "languages", "projects"})),
+    ("skills",
+     "search", frozenset({"technical_skills_spaced", "competences", "skills"}),
+     "match", frozenset({"languages", "langues", "education", "formation", "experience", "projects", "certifications"})),
+    ("languages",
+     "match", frozenset({"languages", "langues"}),
+     "search", frozenset({"certifications", "education", "formation", "experience", "projects", "skills"})),
+    ("education",
+     "match", frozenset({"education", "formation", "education_fr"}),
+     "search", frozenset({"experience_fr", "experience", "projects", "skills", "languages"})),
+    ("experience",
+     "search", frozenset({"experience_fr", "experience", "emploi", "professional_experience"}),
+     "search", frozenset({"projects", "education", "formation", "skills", "languages"})),
+    ("projects",
+     "match", frozenset({"projects", "projets"}),
+     "match", frozenset({"education", "formation", "experience", "skills", "languages"})),
+]
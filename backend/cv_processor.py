@@ -12,7 +12,7 @@ import os
 # Add ai-service to path for llama_service
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ai-service'))
 
-from cv_extractor_cli import CVExtractor
+from cv_extractor_cli import extractor_from_env
 from cv_validation import validate_cv_structure, detect_partial_cv, CVValidator
 from llama_service import LlamaService
 
@@ -51,21 +51,21 @@ class CVProcessor:
     """Two-step, fault-tolerant CV processing pipeline."""
     
     def __init__(self):
-        self.cv_extractor = CVExtractor()
+        self.cv_extractor = extractor_from_env()
         self.llama_service = LlamaService()
         self.validator = CVValidator()
     
     def process_cv(self, file_path: str) -> CVProcessingResult:
         """
         Process CV using two-step pipeline:
-        1. Extract raw text and save to data.txt
+        1. Extract raw text (served from the text cache for known documents)
         2. Try AI structuring, validate, fallback to CLI if needed
         3. Merge partial outputs if necessary
         """
         processing_logs = []
         
         try:
-            # Step 1: Extract raw text and save to data.txt
+            # Step 1: Extract raw text
             logger.info(f"Step 1: Extracting raw text from {file_path}")
             raw_text = self.cv_extractor.extract_raw_text(file_path)
             processing_logs.append(f"Raw text extracted: {len(raw_text)} characters")
@@ -201,29 +201,33 @@ class CVProcessor:
             Dict with paths to saved files
         """
         artifacts = {}
+        # Artifacts are named after the source file without its extension
+        stem = os.path.splitext(base_path)[0]
         
         try:
-            # Save raw text (already saved by extract_raw_text)
-            data_txt_path = os.path.join(os.path.dirname(base_path), "data.txt")
-            if os.path.exists(data_txt_path):
-                artifacts["raw_text"] = data_txt_path
+            # Save raw text
+            if result.raw_text:
+                raw_text_path = stem + "_raw_text.txt"
+                with open(raw_text_path, "w", encoding="utf-8") as f:
+                    f.write(result.raw_text)
+                artifacts["raw_text"] = raw_text_path
             
             # Save AI output if available
             if result.ai_output:
-                ai_output_path = base_path.replace(".pdf", "_ai_output.json").replace(".docx", "_ai_output.json").replace(".txt", "_ai_output.json")
+                ai_output_path = stem + "_ai_output.json"
                 with open(ai_output_path, "w", encoding="utf-8") as f:
                     json.dump(result.ai_output, f, ensure_ascii=False, indent=2)
                 artifacts["ai_output"] = ai_output_path
             
             # Save fallback output if available
             if result.fallback_output:
-                fallback_output_path = base_path.replace(".pdf", "_fallback_output.json").replace(".docx", "_fallback_output.json").replace(".txt", "_fallback_output.json")
+                fallback_output_path = stem + "_fallback_output.json"
                 with open(fallback_output_path, "w", encoding="utf-8") as f:
                     json.dump(result.fallback_output, f, ensure_ascii=False, indent=2)
                 artifacts["fallback_output"] = fallback_output_path
             
             # Save processing logs
-            logs_path = base_path.replace(".pdf", "_processing_logs.json").replace(".docx", "_processing_logs.json").replace(".txt", "_processing_logs.json")
+            logs_path = stem + "_processing_logs.json"
             log_data = {
                 "timestamp": datetime.now().isoformat(),
                 "source": result.source,
@@ -139,19 +139,22 @@ IGA Casablanca (2019-2022)
             import traceback
             traceback.print_exc()
         
-        # Step 4: Check the data.txt file
-        print("\n4. Checking data.txt file:")
-        data_txt_path = os.path.join(uploads_dir, "data.txt")
-        if os.path.exists(data_txt_path):
-            with open(data_txt_path, 'r', encoding='utf-8') as f:
-                data_content = f.read()
-            print(f"   data.txt length: {len(data_content)} characters")
-            if len(data_content) > 0:
-                print(f"   First 200 characters: '{data_content[:200]}'")
-            else:
-                print("   ❌ data.txt is empty!")
+        # Step 4: Check the raw-text cache entry
+        print("\n4. Checking raw-text cache:")
+        from cv_extractor_cli import EXTRACTOR_VERSION
+        from text_cache import cache_from_env
+        text_cache = cache_from_env(EXTRACTOR_VERSION)
+        if text_cache is None:
+            print("   ⚠️  Raw-text cache disabled (CV_TEXT_CACHE_DIR is empty)")
         else:
-            print("   ❌ data.txt file not found!")
+            with open(uploaded_file_path, 'rb') as f:
+                key = text_cache.key(f.read(), os.path.splitext(uploaded_file_path)[1])
+            cached_text = text_cache.get(key)
+            if cached_text is None:
+                print(f"   No cache entry yet in {text_cache.cache_dir}")
+            else:
+                print(f"   Cached text length: {len(cached_text)} characters")
+                print(f"   First 200 characters: '{cached_text[:200]}'")
         
     except Exception as e:
         print(f"❌ Error during debugging: {e}")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest for incremental runs of the batch CV extractor.
+Maps every input file to its SHA-256, the extractor version that parsed it
+and the output JSON it produced, so unchanged files can be skipped.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from typing import Any, Dict, List, Set
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+
+def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionManifest:
+    """Per-output-directory record of which inputs are already extracted."""
+
+    def __init__(self, output_dir: str, extractor_version: str):
+        self.output_dir = output_dir
+        self.extractor_version = extractor_version
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT:
+            return {}
+        return data.get("entries", {})
+
+    def fingerprint(self, name: str, path: str) -> Dict[str, Any]:
+        """Return size, mtime and SHA-256 of an input file.
+
+        The hash recorded in the manifest is reused when size and mtime are
+        unchanged, so a re-run over an untouched archive does not read it.
+        """
+        st = os.stat(path)
+        entry = self.entries.get(name)
+        if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            sha = entry["sha256"]
+        else:
+            sha = sha256_file(path)
+        return {"sha256": sha, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def is_current(self, name: str, fingerprint: Dict[str, Any]) -> bool:
+        """True when the input was extracted by this version and its output still exists."""
+        entry = self.entries.get(name)
+        return bool(
+            entry
+            and entry.get("sha256") == fingerprint["sha256"]
+            and entry.get("extractor_version") == self.extractor_version
+            and os.path.exists(os.path.join(self.output_dir, entry.get("output", "")))
+        )
+
+    def record(self, name: str, fingerprint: Dict[str, Any], output: str) -> None:
+        """Record a successful extraction of name into output (relative to output_dir)."""
+        self.entries[name] = dict(fingerprint, extractor_version=self.extractor_version, output=output)
+
+    def forget(self, name: str) -> None:
+        self.entries.pop(name, None)
+
+    def prune(self, existing: Set[str]) -> List[str]:
+        """Drop entries whose input no longer exists and delete their outputs.
+
+        Returns the names of the pruned inputs.
+        """
+        pruned = sorted(name for name in self.entries if name not in existing)
+        for name in pruned:
+            output = self.entries.pop(name).get("output")
+            if output:
+                out_path = os.path.join(self.output_dir, output)
+                if os.path.exists(out_path):
+                    os.remove(out_path)
+        return pruned
+
+    def save(self) -> None:
+        """Write the manifest atomically next to the outputs."""
+        data = {"format": MANIFEST_FORMAT, "entries": self.entries}
+        fd, tmp_path = tempfile.mkstemp(prefix=".manifest-", suffix=".json", dir=self.output_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
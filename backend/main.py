@@ -1,13 +1,12 @@
 from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, status, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from datetime import timedelta
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from typing import List
 import os
 import json
-import shutil
 from datetime import datetime
 
 import sys
@@ -44,7 +43,7 @@ from auth import (
     get_admin_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
-from cv_extractor_cli import CVExtractor
+from cv_extractor_cli import extractor_from_env
 from llama_service import LlamaService  # Now uses LLaMA models
 
 # Get the path to the React build folder
@@ -118,9 +117,13 @@ def startup_event():
         print(f"Warning: could not ensure default admin user: {e}")
 
 # Initialize services
-cv_extractor = CVExtractor()
+cv_extractor = extractor_from_env()
 llama_service = LlamaService()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await llama_service.aclose()
+
 # Create uploads directory
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -269,6 +272,33 @@ async def change_password(payload: PasswordChange, db: Session = Depends(get_db)
     db.commit()
     return {"message": "Mot de passe mis à jour"}
 
+CV_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+def store_candidate(db: Session, filename: str, extracted_data: dict) -> Candidate:
+    """Create the candidate record of an uploaded CV from its structured data."""
+    # Extract basic info for database
+    contact_info = extracted_data.get("contact_info", {})
+    name = None
+    if contact_info.get("emails"):
+        # Try to extract name from first email
+        email = contact_info["emails"][0]
+        name = email.split("@")[0].replace(".", " ").replace("_", " ").title()
+    
+    # Create candidate record
+    candidate = Candidate(
+        name=name,
+        email=contact_info.get("emails", [None])[0] if contact_info.get("emails") else None,
+        phone=contact_info.get("phones", [None])[0] if contact_info.get("phones") else None,
+        location=contact_info.get("address", ""),
+        raw_cv_path=os.path.join(UPLOAD_DIR, filename),
+        extracted_data=json.dumps(extracted_data)
+    )
+    
+    db.add(candidate)
+    db.commit()
+    db.refresh(candidate)
+    return candidate
+
 @app.post("/api/upload-cv", response_model=UploadResponse)
 async def upload_cv(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     """
@@ -276,58 +306,23 @@ async def upload_cv(file: UploadFile = File(...), db: Session = Depends(get_db),
     """
     try:
         # Validate file type
-        if not file.filename.lower().endswith(('.pdf', '.docx', '.doc', '.txt')):
+        if not file.filename.lower().endswith(CV_EXTENSIONS):
             raise HTTPException(
                 status_code=400, 
                 detail="Unsupported file type. Please upload PDF, DOCX, or TXT files."
             )
         
-        # Save uploaded file
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        print(f"DEBUG: Saving file to: {file_path}")
-        print(f"DEBUG: File exists before save: {os.path.exists(file_path)}")
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        print(f"DEBUG: File exists after save: {os.path.exists(file_path)}")
-        print(f"DEBUG: File size: {os.path.getsize(file_path) if os.path.exists(file_path) else 'N/A'}")
+        # Parse the upload fully in memory; nothing is written to disk
+        content = await file.read()
+        print(f"DEBUG: Received {file.filename} ({len(content)} bytes)")
         
-        # Extract raw text and save to data.txt
-        print(f"DEBUG: About to extract raw text from: {file_path}")
-        raw_text = cv_extractor.extract_raw_text(file_path)
+        print(f"DEBUG: About to extract raw text from: {file.filename}")
+        raw_text = cv_extractor.extract_raw_text(content, filename=file.filename)
         
         # Use LLaMA to structure the raw text into JSON
         print(f"DEBUG: About to structure text with LLaMA")
-        extracted_data = llama_service.structure_cv_text(raw_text)
-        
-        # Extract basic info for database
-        contact_info = extracted_data.get("contact_info", {})
-        name = None
-        if contact_info.get("emails"):
-            # Try to extract name from first email
-            email = contact_info["emails"][0]
-            name = email.split("@")[0].replace(".", " ").replace("_", " ").title()
-        
-        # Create candidate record
-        candidate = Candidate(
-            name=name,
-            email=contact_info.get("emails", [None])[0] if contact_info.get("emails") else None,
-            phone=contact_info.get("phones", [None])[0] if contact_info.get("phones") else None,
-            location=contact_info.get("address", ""),
-            raw_cv_path=file_path,
-            extracted_data=json.dumps(extracted_data)
-        )
-        
-        db.add(candidate)
-        db.commit()
-        db.refresh(candidate)
-        
-        # Clean up the uploaded file after processing
-        try:
-            os.remove(file_path)
-        except Exception as cleanup_error:
-            print(f"Warning: Could not clean up file {file_path}: {cleanup_error}")
+        extracted_data = await llama_service.structure_cv_text_async(raw_text)
+        candidate = store_candidate(db, file.filename, extracted_data)
         
         return UploadResponse(
             candidate_id=candidate.id,
@@ -336,11 +331,49 @@ async def upload_cv(file: UploadFile = File(...), db: Session = Depends(get_db),
         )
         
     except Exception as e:
-        # Clean up file if there was an error
-        if 'file_path' in locals() and os.path.exists(file_path):
-            os.remove(file_path)
         raise HTTPException(status_code=500, detail=f"Error processing CV: {str(e)}")
 
+@app.post("/api/upload-cv/stream")
+async def upload_cv_stream(file: UploadFile = File(...), current_user: User = Depends(get_current_active_user)):
+    """
+    Upload a CV and stream its structured data back as NDJSON.
+    One {"section", "data"} line is sent per CV section as soon as the LLM has
+    produced it, then {"candidate_id", "extracted_data", "message"} once the
+    candidate is stored, or {"error"} if processing fails midway.
+    """
+    if not file.filename.lower().endswith(CV_EXTENSIONS):
+        raise HTTPException(
+            status_code=400, 
+            detail="Unsupported file type. Please upload PDF, DOCX, or TXT files."
+        )
+    
+    content = await file.read()
+    try:
+        raw_text = cv_extractor.extract_raw_text(content, filename=file.filename)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing CV: {str(e)}")
+    
+    async def events():
+        try:
+            async for event in llama_service.structure_cv_text_stream(raw_text):
+                if "extracted_data" in event:
+                    # The request's session is closed once streaming starts
+                    db = next(get_db())
+                    try:
+                        candidate = store_candidate(db, file.filename, event["extracted_data"])
+                    finally:
+                        db.close()
+                    event = {
+                        "candidate_id": candidate.id,
+                        "extracted_data": event["extracted_data"],
+                        "message": "CV uploaded and processed successfully"
+                    }
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": f"Error processing CV: {str(e)}"}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 @app.get("/api/candidate/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(candidate_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     """
@@ -373,9 +406,10 @@ async def get_candidate(candidate_id: int, db: Session = Depends(get_db), curren
     )
 
 @app.post("/api/recommend/{candidate_id}", response_model=JobRecommendationResponse)
-async def generate_recommendations(candidate_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+async def generate_recommendations(candidate_id: int, refresh: bool = False, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     """
     Generate job recommendations for a candidate using LLaMA models.
+    ``refresh=true`` bypasses the LLM response cache.
     """
     candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
     if not candidate:
@@ -385,7 +419,7 @@ async def generate_recommendations(candidate_id: int, db: Session = Depends(get_
     extracted_data = json.loads(candidate.extracted_data) if candidate.extracted_data else {}
     
     # Generate recommendations using LLaMA service
-    recommendations = llama_service.generate_recommendations(extracted_data)
+    recommendations = await llama_service.generate_recommendations_async(extracted_data, use_cache=not refresh)
     
     # Store recommendations in database
     job_recommendation = JobRecommendation(
@@ -493,7 +527,7 @@ async def match_job(job_request: JobMatchRequest, db: Session = Depends(get_db),
     """
     try:
         # Extract required skills from job description using LLaMA
-        required_skills = llama_service.extract_skills_from_job_description(job_request.job_description)
+        required_skills = await llama_service.extract_skills_async(job_request.job_description)
         
         # Get all candidates
         candidates = db.query(Candidate).all()
@@ -558,6 +592,32 @@ def calculate_skill_match(candidate_skills: List[str], required_skills: List[str
 def health_check():
     return {"status": "healthy", "message": "CV Analysis API is running"}
 
+@app.get("/api/admin/llm/http-stats")
+async def get_llm_http_stats(current_user: User = Depends(get_admin_user)):
+    """Connection pool statistics of the LLM provider clients."""
+    return llama_service.http_stats()
+
+@app.get("/api/admin/llm/provider")
+async def get_llm_provider(current_user: User = Depends(get_admin_user)):
+    """Selected LLM provider and background probe state."""
+    return llama_service.provider_status()
+
+@app.get("/api/admin/llm/router")
+async def get_llm_router(current_user: User = Depends(get_admin_user)):
+    """Provider routing order, circuit breaker states and latency statistics."""
+    return llama_service.router_stats()
+
+@app.get("/api/admin/llm/local-batching")
+async def get_llm_local_batching(current_user: User = Depends(get_admin_user)):
+    """Batch sizes and queue waits of the local model's micro-batching, and
+    the prompt tokens served from its structuring prefix cache."""
+    return llama_service.local_batch_stats()
+
+@app.get("/api/admin/llm/cache-stats")
+async def get_llm_cache_stats(current_user: User = Depends(get_admin_user)):
+    """Hit/miss counters of the LLM response cache and coalesced in-flight prompts."""
+    return llama_service.cache_stats()
+
 # Admin endpoints
 @app.get("/api/admin/users", response_model=List[UserListResponse])
 async def get_all_users(db: Session = Depends(get_db), current_user: User = Depends(get_admin_user)):
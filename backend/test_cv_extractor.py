@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import fitz
+from docx import Document
+
+import cv_patterns as patterns
+from extraction_manifest import ExtractionManifest
+from text_cache import RawTextCache
+from address_extractor import AddressExtractor
+from cv_extractor_cli import (
+    CVExtractor,
+    SectionIndex,
+    PARALLEL_PDF_MIN_PAGES,
+    extract_text_from_pdf,
+    extract_text_from_docx,
+    load_text,
+    contact_window,
+    extract_contact_info,
+    scan_contact_info,
+    _percentile,
+    _run_batch,
+    extract_skills,
+    extract_languages,
+    extract_experience,
+    extract_summary,
+)
+
+
+class TestSectionIndex(unittest.TestCase):
+    """Test cases for the single-pass section segmentation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.sample_text = """
+        Jane Smith
+        SUMMARY
+        Backend engineer focused on data pipelines and reliable services.
+        TECHNICAL SKILLS
+        - Python, SQL
+        - Docker
+        LANGUAGES
+        - French: Native
+        - English: Fluent
+        EXPERIENCE
+        JUIN 2024 - AOÛT 2024 : Progiciel System, Backend Developer
+        - Built the invoicing API
+        EDUCATION
+        SEPT 2020 - JUIN 2022 : Master Data Science (ENSA)
+        """
+
+    def test_section_spans(self):
+        """Each section owns the lines between its header and the next exit header."""
+        sections = SectionIndex(self.sample_text)
+
+        self.assertEqual(
+            sections.section_lines("summary"),
+            ["Backend engineer focused on data pipelines and reliable services."],
+        )
+        self.assertEqual(sections.section_lines("skills"), ["- Python, SQL", "- Docker"])
+        self.assertEqual(sections.section_lines("projects"), [])
+
+    def test_shared_index_matches_standalone_parsers(self):
+        """Parsers return the same result with or without a shared index."""
+        sections = SectionIndex(self.sample_text)
+
+        for parse in (extract_skills, extract_languages, extract_experience, extract_summary):
+            with self.subTest(parser=parse.__name__):
+                self.assertEqual(parse(self.sample_text, sections), parse(self.sample_text))
+
+    def test_reentering_section_starts_new_span(self):
+        """A repeated header opens a new span instead of being kept as content."""
+        text = "SKILLS\nPython\nLANGUAGES\nFrench: Native\nSKILLS\nDocker"
+        sections = SectionIndex(text)
+
+        self.assertEqual(sections.spans["skills"], [(1, 2), (5, 6)])
+        self.assertEqual(extract_skills(text, sections), ["Python", "Docker"])
+
+
+class TestPatternRegistry(unittest.TestCase):
+    """Test cases for the precompiled pattern registry."""
+
+    def test_classify_header(self):
+        """Whole-line headers are exact; keywords inside text are only found."""
+        self.assertEqual(patterns.classify_header("Technical Skills"),
+                         ("technical_skills", frozenset({"technical_skills", "technical_skills_spaced", "skills"})))
+        self.assertEqual(patterns.classify_header("Langues"), ("langues", frozenset({"langues"})))
+
+        exact, found = patterns.classify_header("Experience in education projects")
+        self.assertIsNone(exact)
+        self.assertEqual(found, {"experience", "education", "projects"})
+
+        self.assertEqual(patterns.classify_header("Python, SQL"), (None, frozenset()))
+
+    def test_experience_date_range_with_and_without_colon(self):
+        """Both the colon and the bare form of a date range line are recognised."""
+        for line, content in [
+            ("JUIN 2024 - AOÛT 2024 : Progiciel System, Dev", "Progiciel System, Dev"),
+            ("JUIN 2024 - AOÛT 2024 Progiciel System, Dev", "Progiciel System, Dev"),
+        ]:
+            with self.subTest(line=line):
+                m = patterns.EXPERIENCE_DATE_RANGE.match(line)
+                self.assertEqual(m.group(1), "JUIN 2024 - AOÛT 2024")
+                self.assertEqual((m.group(2) or m.group(3)).strip(), content)
+
+
+class TestBatchProcessing(unittest.TestCase):
+    """Test cases for the batch worker pool."""
+
+    def test_pool_results_follow_input_order(self):
+        """A worker pool returns the same results, in the same order, as a serial run."""
+        data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extracted_data")
+        paths = sorted(os.path.join(data_dir, f) for f in os.listdir(data_dir))
+
+        serial = [data for data, _, _ in _run_batch(paths)]
+        pooled = [data for data, _, _ in _run_batch(paths, workers=2, chunksize=2)]
+
+        self.assertEqual(pooled, serial)
+
+    def test_failures_are_reported_not_raised(self):
+        """A missing file yields an error entry instead of stopping the batch."""
+        data, error, elapsed = next(_run_batch(["missing.pdf"]))
+
+        self.assertIsNone(data)
+        self.assertIn("missing.pdf", error)
+        self.assertGreaterEqual(elapsed, 0.0)
+
+    def test_percentile(self):
+        """Nearest-rank percentiles."""
+        values = [0.4, 0.1, 0.3, 0.2]
+        self.assertEqual(_percentile(values, 50), 0.2)
+        self.assertEqual(_percentile(values, 95), 0.4)
+        self.assertEqual(_percentile([], 50), 0.0)
+
+
+class TestExtractionManifest(unittest.TestCase):
+    """Test cases for the incremental-run manifest."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.temp_dir, "cv.txt")
+        with open(self.input_path, "w", encoding="utf-8") as f:
+            f.write("SKILLS\nPython")
+        with open(os.path.join(self.temp_dir, "cv.json"), "w", encoding="utf-8") as f:
+            f.write("{}")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_unchanged_input_is_current_after_reload(self):
+        """A recorded input stays current across runs until its content or the version changes."""
+        manifest = ExtractionManifest(self.temp_dir, "v1")
+        fingerprint = manifest.fingerprint("cv.txt", self.input_path)
+        self.assertFalse(manifest.is_current("cv.txt", fingerprint))
+        manifest.record("cv.txt", fingerprint, "cv.json")
+        manifest.save()
+
+        reloaded = ExtractionManifest(self.temp_dir, "v1")
+        self.assertTrue(reloaded.is_current("cv.txt", reloaded.fingerprint("cv.txt", self.input_path)))
+        self.assertFalse(ExtractionManifest(self.temp_dir, "v2").is_current("cv.txt", fingerprint))
+
+        with open(self.input_path, "a", encoding="utf-8") as f:
+            f.write("\nDocker")
+        self.assertFalse(reloaded.is_current("cv.txt", reloaded.fingerprint("cv.txt", self.input_path)))
+
+    def test_prune_removes_outputs_of_deleted_inputs(self):
+        """Pruning drops the entry and deletes the output JSON."""
+        manifest = ExtractionManifest(self.temp_dir, "v1")
+        manifest.record("cv.txt", manifest.fingerprint("cv.txt", self.input_path), "cv.json")
+
+        self.assertEqual(manifest.prune(set()), ["cv.txt"])
+        self.assertNotIn("cv.txt", manifest.entries)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "cv.json")))
+
+
+class TestInMemoryExtraction(unittest.TestCase):
+    """Test cases for extraction from bytes and file-like objects."""
+
+    def test_bytes_and_stream_match_path(self):
+        """PDF, DOCX and TXT sources give the same text in memory as from disk."""
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        for rel_path in ["cv_files/CV_Chadi.pdf", "cv_files/CV_Doha_ENG.docx", "extracted_data/NOUR_CV.txt"]:
+            path = os.path.join(base_dir, rel_path)
+            name = os.path.basename(path)
+            with open(path, "rb") as f:
+                content = f.read()
+            with self.subTest(file=name):
+                expected = load_text(path)
+                self.assertEqual(load_text(content, filename=name), expected)
+                self.assertEqual(load_text(io.BytesIO(content), filename=name), expected)
+
+    def test_in_memory_raw_text_does_not_write_data_txt(self):
+        """extract_raw_text on bytes leaves the working directory untouched."""
+        before = set(os.listdir("."))
+        text = CVExtractor().extract_raw_text(b"SKILLS\r\n- Python\r\n\r\n", filename="cv.txt")
+
+        self.assertEqual(text, "SKILLS\n- Python")
+        self.assertEqual(set(os.listdir(".")), before)
+
+
+
+class TestRawTextCache(unittest.TestCase):
+    """Test cases for the content-addressed raw-text cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_resubmitted_document_skips_parsing(self):
+        """Same bytes under another name are served from the cache, across instances."""
+        content = b"SKILLS\n- Python\n"
+        extractor = CVExtractor(RawTextCache(self.temp_dir, "v1"))
+        first = extractor.extract_raw_text(content, filename="a.txt")
+
+        fresh = CVExtractor(RawTextCache(self.temp_dir, "v1", memory_entries=0))
+        with patch("cv_extractor_cli.load_text") as parse:
+            self.assertEqual(fresh.extract_raw_text(io.BytesIO(content), filename="b.txt"), first)
+            parse.assert_not_called()
+
+        cache = RawTextCache(self.temp_dir, "v2")
+        self.assertIsNone(cache.get(cache.key(content, ".txt")))
+
+    def test_disk_tier_evicts_least_recently_used(self):
+        """Entries beyond the size budget are evicted oldest-access first."""
+        cache = RawTextCache(self.temp_dir, "v1", max_bytes=25, memory_entries=0)
+        keys = [cache.key(name.encode(), ".txt") for name in ("a", "b", "c")]
+        cache.put(keys[0], "x" * 10)
+        cache.put(keys[1], "y" * 10)
+        os.utime(cache._entry_path(keys[1]), ns=(0, 0))
+        cache.put(keys[2], "z" * 10)
+
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[0]), "x" * 10)
+        self.assertEqual(cache.get(keys[2]), "z" * 10)
+
+
+
+class TestPdfPageBudget(unittest.TestCase):
+    """Test cases for budgeted and page-range parallel PDF extraction."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        doc = fitz.open()
+        for page_no in range(PARALLEL_PDF_MIN_PAGES + 4):
+            doc.new_page().insert_text((50, 50), f"Page {page_no + 1}\nSKILLS\n- Python")
+        self.pdf = doc.tobytes()
+        doc.close()
+
+    def test_page_and_char_budgets(self):
+        """Budgets stop reading after the first pages."""
+        self.assertEqual(extract_text_from_pdf(self.pdf, max_pages=2),
+                         "Page 1\nSKILLS\n- Python\n\nPage 2\nSKILLS\n- Python")
+        self.assertEqual(extract_text_from_pdf(self.pdf, max_chars=1), "Page 1\nSKILLS\n- Python")
+
+    def test_parallel_matches_serial(self):
+        """Page ranges split across processes join back in page order."""
+        self.assertEqual(extract_text_from_pdf(self.pdf, workers=3), extract_text_from_pdf(self.pdf))
+
+
+
+class TestDocxStreaming(unittest.TestCase):
+    """Test cases for the streaming word/document.xml reader."""
+
+    def test_paragraphs_and_cells_in_document_order(self):
+        """Table cells are read in place, one block per cell."""
+        doc = Document()
+        doc.add_paragraph("Jane Smith")
+        doc.add_paragraph("")
+        table = doc.add_table(rows=1, cols=2)
+        table.rows[0].cells[0].text = "SKILLS"
+        table.rows[0].cells[1].text = "- Python\n- Docker"
+        doc.add_paragraph("LANGUAGES\tFrench")
+        buf = io.BytesIO()
+        doc.save(buf)
+
+        self.assertEqual(extract_text_from_docx(buf.getvalue()),
+                         "Jane Smith\nSKILLS\n- Python\n- Docker\nLANGUAGES\tFrench")
+
+    def test_unreadable_package_returns_empty_text(self):
+        """A corrupt file falls back to python-docx, which reports it and returns ''."""
+        self.assertEqual(extract_text_from_docx(b"not a zip"), "")
+
+
+
+class TestContactWindow(unittest.TestCase):
+    """Test cases for the windowed contact scan."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.body = "\n".join(f"- Delivered project {i} with Python and SQL" for i in range(200))
+
+    def test_window_covers_header_and_contact_section(self):
+        """The window is the first lines plus the lines under a Contact header."""
+        text = "Jane Smith\nBackend Developer\n" + self.body + "\nCONTACT\njane@example.com\n" + self.body
+        window = contact_window(text, max_lines=3, max_chars=1000)
+
+        self.assertEqual(window, "Jane Smith\nBackend Developer\n- Delivered project 0 with Python and SQL\n"
+                                 "\nCONTACT\njane@example.com\n- Delivered project 0 with Python and SQL\n")
+        self.assertEqual(contact_window("a" * 50 + "\nb", max_lines=3, max_chars=20), "a" * 20)
+
+    def test_header_hit_and_full_text_fallback(self):
+        """Contacts in the header skip the body; a header without any falls back."""
+        header, scope = scan_contact_info("Jane Smith\njane@example.com\n" + self.body + "\nold@example.com",
+                                          window_lines=5)
+        self.assertEqual((scope, header["emails"]), ("header", ["jane@example.com"]))
+
+        fallback, scope = scan_contact_info("Jane Smith\n" + self.body + "\nold@example.com", window_lines=5)
+        self.assertEqual((scope, fallback["emails"]), ("full_text", ["old@example.com"]))
+
+        # The returned contact_info keeps the same fields with or without a window
+        windowed = extract_contact_info("Jane Smith\njane@example.com\n" + self.body, window_lines=5)
+        self.assertEqual(set(windowed), set(extract_contact_info("Jane Smith\njane@example.com")))
+
+
+class TestAddressExtractor(unittest.TestCase):
+    """Test cases for the precompiled address engine."""
+
+    def test_predicates_are_memoized_per_line(self):
+        """Each line is tested once per predicate, however often it is scored."""
+        extractor = AddressExtractor()
+        text = "Marie Dupont\nAdresse: 25 Rue de la République, 75011 Paris, France\nEmail: marie@email.fr"
+
+        self.assertIn("25 Rue de la République, 75011 Paris", extractor.extract(text))
+        first = extractor.has_postal_code.cache_info()
+
+        extractor.extract(text)
+        second = extractor.has_postal_code.cache_info()
+        self.assertEqual(second.misses, first.misses)
+        self.assertGreater(second.hits, first.hits)
+
+    def test_dedupe_keeps_longer_near_duplicate_at_the_end(self):
+        """A longer near-duplicate replaces the kept one and moves to the end."""
+        candidates = [
+            "25 Rue de la République Paris",
+            "Casablanca 20250, Morocco",
+            "25 Rue de la République Paris France",
+            "25 Rue de la République",
+        ]
+
+        self.assertEqual(AddressExtractor().dedupe_candidates(candidates), [
+            "Casablanca 20250, Morocco",
+            "25 Rue de la République Paris France",
+        ])
+
+    def test_candidate_scanners_follow_lines_like_the_regexes(self):
+        """Scanners keep findall's results, including runs of capitalized words across lines."""
+        text = "Marie Dupont\nAdresse: 25 Rue de la République, 75011 Paris, France\nToronto, ON M5V 3A1"
+        address_line = "Adresse: 25 Rue de la République, 75011 Paris, France"
+
+        self.assertEqual(AddressExtractor().extract_candidates_from_patterns(text), [address_line] * 4 + [
+            "25 Rue de la République, 75011 Paris, France",
+            "Marie Dupont\n" + address_line,
+            "25 Rue de la République, 75011 Paris, France\nToronto, ON M5V 3A1",
+        ])
+
+    def test_candidate_scan_is_linear_on_long_lines(self):
+        """A 20k-character line that used to backtrack cubically is scanned quickly."""
+        start = time.perf_counter()
+        AddressExtractor().extract_candidates_from_patterns("1 Abc " * 20000)
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -240,6 +240,23 @@ class TestCVPipeline(unittest.TestCase):
         is_valid, _, details = validate_cv_structure(data_no_name, self.sample_raw_text)
         self.assertFalse(details["has_name"])
     
+    def test_artifact_names_replace_the_extension(self):
+        """Test that artifacts of a .pdf are named after the file without its extension."""
+        from cv_processor import CVProcessor, CVProcessingResult
+        
+        processor = CVProcessor()
+        result = CVProcessingResult(
+            structured_data={}, source="fallback", used_ai=False, used_fallback=True,
+            validation_passed=True, validation_reason="", processing_logs=[],
+            raw_text=self.sample_raw_text, fallback_output={"skills": ["Python"]}
+        )
+        artifacts = processor.save_processing_artifacts(result, os.path.join(self.temp_dir, "cv.pdf"))
+        
+        self.assertEqual(artifacts["raw_text"], os.path.join(self.temp_dir, "cv_raw_text.txt"))
+        self.assertEqual(artifacts["fallback_output"], os.path.join(self.temp_dir, "cv_fallback_output.json"))
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         ["cv_fallback_output.json", "cv_processing_logs.json", "cv_raw_text.txt"])
+    
     def test_merge_partial_outputs(self):
         """Test merging partial AI output with CLI parser output."""
         ai_data = {
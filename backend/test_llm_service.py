@@ -0,0 +1,680 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import asyncio
+import time
+import shutil
+import tempfile
+import unittest
+import threading
+import subprocess
+import importlib.util
+from unittest.mock import patch
+
+# The LLM infrastructure lives next to llama_service
+AI_SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ai-service')
+sys.path.append(AI_SERVICE_DIR)
+
+# test_cv_pipeline replaces llama_service with a Mock for the whole session
+sys.modules.pop("llama_service", None)
+import llama_service
+from llm_cache import LLMResponseCache
+from json_sections import JSONSectionParser
+from provider_router import ProviderRouter
+from singleflight import SingleFlight
+from tolerant_json import parse_first_json
+from micro_batcher import MicroBatcher
+from prefix_cache import PrefixKVCache, shared_length
+
+# Keeps LlamaService away from the persistent caches and probe file in ai-service/cache
+ISOLATED_ENV = {"LLM_CACHE_PATH": "", "LLM_TRANSLATION_MEMO_PATH": "", "LLM_PROVIDER_PROBE_CACHE": ""}
+
+
+def make_service(provider="together", **env):
+    """LlamaService whose probe picked provider, built with ISOLATED_ENV plus env."""
+    with patch.dict(os.environ, {**ISOLATED_ENV, **env}):
+        with patch.object(llama_service.LlamaService, "_initialize_provider", return_value=provider):
+            service = llama_service.LlamaService()
+            service.provider
+    return service
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Test cases for the persistent LLM response cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "llm.sqlite3")
+        self.params = {"max_tokens": 1000, "temperature": 0.7}
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_key_covers_provider_model_params_and_prompt(self):
+        """Changing any part of the request changes the key."""
+        key = LLMResponseCache.key("together", "llama", self.params, "prompt")
+
+        self.assertEqual(key, LLMResponseCache.key("together", "llama", dict(reversed(self.params.items())), "prompt"))
+        self.assertNotEqual(key, LLMResponseCache.key("huggingface", "llama", self.params, "prompt"))
+        self.assertNotEqual(key, LLMResponseCache.key("together", "falcon", self.params, "prompt"))
+        self.assertNotEqual(key, LLMResponseCache.key("together", "llama", {**self.params, "temperature": 0}, "prompt"))
+        self.assertNotEqual(key, LLMResponseCache.key("together", "llama", self.params, "prompt 2"))
+
+    def test_sqlite_tier_survives_restart_until_ttl(self):
+        """A new instance serves stored responses, and misses once they expire."""
+        cache = LLMResponseCache(self.db_path, ttl_seconds=60)
+        key = cache.key("together", "llama", self.params, "prompt")
+        cache.put(key, '["Python"]')
+
+        fresh = LLMResponseCache(self.db_path, ttl_seconds=60, memory_entries=0)
+        self.assertEqual(fresh.get(key), '["Python"]')
+
+        with patch("llm_cache.time.time", return_value=10 ** 12):
+            self.assertIsNone(fresh.get(key))
+            self.assertIsNone(cache.get(key))
+        self.assertEqual((fresh.hits, fresh.misses), (1, 1))
+
+    def test_sqlite_tier_evicts_least_recently_used(self):
+        """Entries beyond max_entries are evicted oldest-access first."""
+        cache = LLMResponseCache(self.db_path, memory_entries=0, max_entries=2)
+        keys = [cache.key("together", "llama", self.params, prompt) for prompt in ("a", "b", "c")]
+        cache.put(keys[0], "A")
+        cache.put(keys[1], "B")
+        cache._db.execute("UPDATE responses SET accessed = 0 WHERE key = ?", (keys[1],))
+        cache.put(keys[2], "C")
+
+        self.assertEqual([cache.get(key) for key in keys], ["A", None, "C"])
+
+
+class TestProviderProbe(unittest.TestCase):
+    """Test cases for the background provider selection."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.env = patch.dict(os.environ, {
+            **ISOLATED_ENV,
+            "TOGETHER_API_KEY": "",
+            "HF_API_KEY": "",
+            "LLM_DEVICE": "cpu",
+            "LLM_PROVIDER_PROBE_CACHE": os.path.join(self.temp_dir, "probe.json"),
+        })
+        self.env.start()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.env.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_constructor_does_not_wait_for_the_probe(self):
+        """The service starts on "cli"; the first provider read waits for the probe."""
+        def slow_probe(service):
+            time.sleep(0.3)
+            return "together"
+
+        with patch.object(llama_service.LlamaService, "_initialize_provider", slow_probe):
+            start = time.perf_counter()
+            service = llama_service.LlamaService()
+            self.assertLess(time.perf_counter() - start, 0.2)
+            self.assertEqual(service.provider_status()["provider"], "cli")
+
+            self.assertEqual(service.provider, "together")
+            self.assertFalse(service.provider_status()["probing"])
+
+    def test_restart_reuses_recent_probe_result(self):
+        """A second instance with the same configuration skips probing."""
+        llama_service.LlamaService().provider
+
+        with patch.object(llama_service.LlamaService, "_initialize_provider") as probe:
+            service = llama_service.LlamaService()
+            self.assertEqual(service.provider, "cli")
+            probe.assert_not_called()
+
+    def test_import_does_not_load_torch(self):
+        """torch stays unloaded until the local model is considered."""
+        code = "import sys, llama_service; print('torch' in sys.modules, 'transformers' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=AI_SERVICE_DIR,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "False False")
+
+
+
+class TestFrenchTranslation(unittest.TestCase):
+    """Test cases for the batched French normalization of recommendations."""
+
+    RESPONSE = json.dumps([
+        {"title": "Software Engineer", "reason": "Strong Python skills."},
+        {"title": "Chef de Projet", "reason": "Expérience en gestion d'équipe."},
+        {"title": "Data Analyst", "reason": "Background in statistics."},
+    ])
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.service = make_service(
+            LLM_TRANSLATION_MEMO_PATH=os.path.join(self.temp_dir, "translations.sqlite3"))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_english_texts_are_translated_in_one_call(self):
+        """All English titles and reasons go out in one prompt; a repeat uses the memo."""
+        translations = ["Développeur Logiciel", "Solides compétences en Python.",
+                        "Analyste de Données", "Formation en statistiques."]
+        with patch.object(self.service, "generate_llama_content", return_value=json.dumps(translations)) as generate:
+            recommendations = self.service._parse_response(self.RESPONSE)
+            self.assertEqual(generate.call_count, 1)
+
+            self.assertEqual([rec["title"] for rec in recommendations],
+                             ["Développeur Logiciel", "Chef de Projet", "Analyste de Données"])
+            self.assertEqual(recommendations[1]["reason"], "Expérience en gestion d'équipe.")
+
+            self.assertEqual(self.service._parse_response(self.RESPONSE), recommendations)
+            self.assertEqual(generate.call_count, 1)
+
+    def test_unusable_batch_falls_back_without_memoizing(self):
+        """A response with the wrong number of translations uses the fallback dictionary."""
+        with patch.object(self.service, "generate_llama_content", return_value='["Développeur Logiciel"]') as generate:
+            recommendations = self.service._parse_response(self.RESPONSE)
+            self.service._parse_response(self.RESPONSE)
+
+        self.assertEqual(recommendations[0]["title"], "Développeur Logiciel")
+        self.assertEqual(recommendations[2]["title"], "Analyste de Données")
+        self.assertEqual(generate.call_count, 2)
+
+
+
+class TestChunkedStructuring(unittest.TestCase):
+    """Test cases for the map-reduce structuring of long CVs."""
+
+    SECTIONS = {
+        "EXPERIENCE": ["2020-2023: Engineer at Acme"] * 40,
+        "EDUCATION": ["2016-2019: MSc Computer Science"] * 40,
+        "SKILLS": ["Python, SQL, Docker"] * 40,
+    }
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.service = make_service(LLM_STRUCTURE_CHUNK_TOKENS="200")
+        lines = ["Jane Doe", "jane@example.com"]
+        for header, body in self.SECTIONS.items():
+            lines += [header] + body
+        self.raw_text = "\n".join(lines)
+
+    def test_split_respects_budget_and_section_headers(self):
+        """Chunks fit the budget, start at a section header and rebuild the text."""
+        chunks = self.service._split_cv_text(self.raw_text)
+
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual("\n".join(chunks), self.raw_text)
+        self.assertTrue(all(len(chunk) <= 200 * llama_service.CHARS_PER_TOKEN for chunk in chunks))
+        first_lines = [chunk.split("\n")[0] for chunk in chunks]
+        self.assertIn("EDUCATION", first_lines)
+        self.assertIn("SKILLS", first_lines)
+
+    def test_short_cv_keeps_single_prompt(self):
+        """Text within the budget is not split."""
+        self.assertEqual(self.service._split_cv_text("Jane Doe\nSKILLS\nPython"), ["Jane Doe\nSKILLS\nPython"])
+
+    def test_chunks_are_structured_and_merged_in_order(self):
+        """Every chunk gets a prompt and the partial documents merge deterministically."""
+        def structure(prompt, use_cache=True):
+            text = prompt.split("CV Text to parse")[1]
+            data = {"contact_info": {"emails": ["jane@example.com"] if "jane@" in text else [], "name": ""},
+                    "skills": ["Python", "SQL"] if "Python, SQL" in text else []}
+            if "Jane Doe" in text:
+                data["contact_info"]["name"] = "Jane Doe"
+            if "Engineer at Acme" in text:
+                data["experience"] = [{"date_range": "2020-2023", "company": "Acme", "details": []}]
+            if "MSc" in text:
+                data["education"] = [{"date_range": "2016-2019", "degree": "MSc", "details": []}]
+            return json.dumps(data)
+
+        chunks = self.service._split_cv_text(self.raw_text)
+        with patch.object(self.service, "generate_llama_content", side_effect=structure) as generate:
+            result = self.service.structure_cv_text(self.raw_text)
+
+        self.assertEqual(generate.call_count, len(chunks))
+        self.assertEqual(result["contact_info"]["name"], "Jane Doe")
+        self.assertEqual(result["contact_info"]["emails"], ["jane@example.com"])
+        self.assertEqual(result["skills"], ["Python", "SQL"])
+        self.assertEqual([exp["company"] for exp in result["experience"]], ["Acme"])
+        self.assertEqual([edu["degree"] for edu in result["education"]], ["MSc"])
+
+
+
+class TestStreamedStructuring(unittest.TestCase):
+    """Test cases for section-by-section parsing of streamed responses."""
+
+    RESPONSE = ('Here is the JSON:\n```json\n{"contact_info": {"name": "Jane {Doe}", "emails": ["jane@example.com"]},\n'
+                '"skills": ["C++", "say \\"hi\\""],\n"experience": [{"role": "Engineer", "details": ["a, b"]}]}\n```')
+
+    def test_sections_are_emitted_as_they_close(self):
+        """Fed one character at a time, each member is returned by the character closing it."""
+        parser = JSONSectionParser()
+        events = []
+        for position, char in enumerate(self.RESPONSE):
+            events += [(name, position) for name, _ in parser.feed(char)]
+
+        self.assertEqual([name for name, _ in events], ["contact_info", "skills", "experience"])
+        self.assertEqual(events[0][1], self.RESPONSE.index(',\n"skills"'))
+        self.assertTrue(parser.done)
+
+    def test_section_values_match_full_parse(self):
+        """Emitted values equal those of the complete document."""
+        parser = JSONSectionParser()
+        sections = dict(parser.feed(self.RESPONSE[:40]) + parser.feed(self.RESPONSE[40:]))
+        document = json.loads(self.RESPONSE[self.RESPONSE.index("{"):self.RESPONSE.rindex("}") + 1])
+
+        self.assertEqual(sections, document)
+
+    def test_stream_sends_sections_before_the_response_ends(self):
+        """structure_cv_text_stream yields a section before the last piece arrives."""
+        service = make_service()
+        received = []
+
+        async def stream(prompt, use_cache=True):
+            split = self.RESPONSE.index('"skills"')
+            for piece in (self.RESPONSE[:split], self.RESPONSE[split:]):
+                received.append(piece)
+                yield piece
+
+        async def collect():
+            events = []
+            async for event in service.structure_cv_text_stream("Jane Doe\njane@example.com\nSKILLS\nC++"):
+                events.append((len(received), event))
+            return events
+
+        with patch.object(service, "generate_llama_content_stream", stream):
+            events = asyncio.run(collect())
+
+        self.assertEqual(events[0], (1, {"section": "contact_info", "data": {
+            "name": "Jane {Doe}", "emails": ["jane@example.com"], "phones": [], "linkedin": "", "address": ""}}))
+        self.assertEqual(events[-1][1]["extracted_data"]["skills"], ["C++", 'say "hi"'])
+        sections = [event["section"] for _, event in events[:-1]]
+        self.assertEqual(len(sections), len(set(sections)))
+
+
+
+class TestProviderRouter(unittest.TestCase):
+    """Test cases for the latency-aware provider router."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.router = ProviderRouter(failure_threshold=2, open_seconds=30, slow_seconds=5)
+        self.router.configure(["together", "huggingface"])
+
+    def call(self, provider, seconds, ok):
+        self.assertTrue(self.router.acquire(provider))
+        self.router.record(provider, seconds, ok)
+
+    def test_circuit_opens_then_recovers_through_one_trial(self):
+        """Consecutive failures open the circuit; after the cooldown one trial call may close it."""
+        self.call("together", 30.0, False)
+        self.assertEqual(self.router.order(), ["together", "huggingface"])
+        self.call("together", 30.0, False)
+        self.assertEqual(self.router.order(), ["huggingface"])
+
+        with patch("provider_router.time.time", return_value=time.time() + 31):
+            self.assertEqual(self.router.order(), ["together", "huggingface"])
+            self.assertTrue(self.router.acquire("together"))
+            self.assertFalse(self.router.acquire("together"))
+            self.router.record("together", 1.0, True)
+
+        self.assertEqual(self.router.order(), ["together", "huggingface"])
+        self.assertEqual(self.router.stats()["providers"]["together"]["error_rate"], 0.0)
+
+    def test_slow_provider_is_demoted_until_its_samples_age_out(self):
+        """A provider whose median latency exceeds slow_seconds goes after healthy ones for window_seconds."""
+        for _ in range(3):
+            self.call("together", 8.0, True)
+            self.call("huggingface", 1.0, True)
+
+        self.assertEqual(self.router.order(), ["huggingface", "together"])
+        stats = self.router.stats()["providers"]["together"]
+        self.assertEqual((stats["state"], stats["healthy"], stats["p50_ms"]), ("closed", False, 8000))
+
+        with patch("provider_router.time.time", return_value=time.time() + self.router.window_seconds + 1):
+            self.assertEqual(self.router.order(), ["together", "huggingface"])
+
+    def test_service_fails_over_and_stops_calling_open_provider(self):
+        """LlamaService moves on to the next provider and skips one whose circuit is open."""
+        service = make_service(HF_API_KEY="hf_test", LLM_ROUTER_FAILURE_THRESHOLD="2")
+        calls = []
+
+        def call_provider(provider, prompt):
+            calls.append(provider)
+            if provider == "together":
+                raise Exception("timeout")
+            return "réponse"
+
+        with patch.object(service, "_call_provider", side_effect=call_provider):
+            responses = [service.generate_llama_content(f"prompt {i}") for i in range(4)]
+
+        self.assertEqual(responses, ["réponse"] * 4)
+        self.assertEqual(calls, ["together", "huggingface", "together", "huggingface", "huggingface", "huggingface"])
+        self.assertEqual(service.router_stats()["order"], ["huggingface"])
+        self.assertEqual(service.router_stats()["providers"]["together"]["state"], "open")
+
+
+
+class TestRequestCoalescing(unittest.TestCase):
+    """Test cases for the coalescing of identical in-flight prompts."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.service = make_service()
+
+    def test_concurrent_threads_share_one_call(self):
+        """Threads generating the same prompt at once trigger a single provider call."""
+        calls = []
+
+        def generate(prompt):
+            calls.append(prompt)
+            time.sleep(0.2)
+            return "together", f"réponse à {prompt}"
+
+        results = []
+        with patch.object(self.service, "_generate", side_effect=generate):
+            threads = [threading.Thread(target=lambda: results.append(self.service.generate_llama_content("même prompt")))
+                       for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.service.generate_llama_content("autre prompt")
+
+        self.assertEqual(calls, ["même prompt", "autre prompt"])
+        self.assertEqual(results, ["réponse à même prompt"] * 5)
+        self.assertEqual(self.service.cache_stats()["inflight"], {"executed": 2, "coalesced": 4, "in_flight": 0})
+
+    def test_concurrent_coroutines_share_one_call_and_its_error(self):
+        """Coroutines awaiting the same prompt share the call, including its exception."""
+        calls = []
+
+        async def generate(prompt):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            if prompt == "en panne":
+                raise Exception("provider down")
+            return "together", "réponse"
+
+        async def burst(prompt):
+            return await asyncio.gather(*(self.service.generate_llama_content_async(prompt) for _ in range(4)),
+                                        return_exceptions=True)
+
+        with patch.object(self.service, "_generate_async", side_effect=generate):
+            responses = asyncio.run(burst("prompt"))
+            errors = asyncio.run(burst("en panne"))
+
+        self.assertEqual(calls, ["prompt", "en panne"])
+        self.assertEqual(responses, ["réponse"] * 4)
+        self.assertTrue(all(str(error) == "provider down" for error in errors))
+
+    def test_sequential_calls_are_not_shared(self):
+        """Once a call has finished, the next one with the same key runs again."""
+        flight = SingleFlight()
+        self.assertEqual([flight.do("key", lambda: len(flight._calls)) for _ in range(2)], [1, 1])
+        self.assertEqual(flight.stats(), {"executed": 2, "coalesced": 0, "in_flight": 0})
+
+
+class TestTolerantJSON(unittest.TestCase):
+    """Test cases for the single-pass tolerant JSON parser."""
+
+    def test_valid_json_is_parsed_without_repairs(self):
+        """Valid JSON wrapped in prose and a code fence parses exactly."""
+        data = {"skills": ["Python", "C\\C++"], "contact_info": {"name": "Chadi \"CK\"", "phones": []},
+                "score": -1.5e3, "active": True, "address": None}
+        response = f"Voici le JSON :\n```json\n{json.dumps(data, indent=2)}\n```\nBonne journée {{}}"
+        self.assertEqual(parse_first_json(response), (data, []))
+        self.assertEqual(parse_first_json("pas de JSON ici"), (None, []))
+
+    def test_common_defects_are_repaired_and_reported(self):
+        """Trailing commas, extra closers and a missing comma are fixed in one pass."""
+        value, repairs = parse_first_json('{"skills": ["Python", "SQL",], "name": "Nour" "age": 30,}]}')
+        self.assertEqual(value, {"skills": ["Python", "SQL"], "name": "Nour", "age": 30})
+        self.assertEqual(len(repairs), 3)
+        self.assertTrue(any("missing comma" in repair for repair in repairs))
+
+        value, repairs = parse_first_json('[{"title": "Data Analyst", "reason": "SQL"]')
+        self.assertEqual(value, [{"title": "Data Analyst", "reason": "SQL"}])
+        self.assertEqual(repairs, ["closed '{' left open at 42"])
+
+    def test_repairs_report_only_what_was_in_the_text(self):
+        """A stray character is not reported as a missing or trailing comma."""
+        self.assertEqual(parse_first_json('{"x": 1.}'), ({"x": 1}, ["skipped unexpected '.' at 7"]))
+        self.assertEqual(parse_first_json('[1 2]'), ([1, 2], ["inserted missing comma at 3"]))
+        self.assertEqual(parse_first_json('[1, 2, ]'), ([1, 2], ["removed trailing comma at 7"]))
+
+    def test_truncated_output_keeps_complete_members(self):
+        """A response cut off by max_tokens keeps everything parsed up to the cut."""
+        value, repairs = parse_first_json('{"skills": ["Python", "Dock', "{")
+        self.assertEqual(value, {"skills": ["Python", "Dock"]})
+        self.assertIn("closed string truncated at end of text", repairs)
+
+        value, _ = parse_first_json('{"name": "Nour", "skills": ["Python"], "education": ')
+        self.assertEqual(value, {"name": "Nour", "skills": ["Python"]})
+
+    def test_service_parses_malformed_cv_structure(self):
+        """LlamaService keeps the members of a truncated CV structure instead of falling back."""
+        service = make_service()
+        response = '```json\n{"contact_info": {"name": "Nour", "emails": ["nour@example.com",]}, "skills": ["Python", "SQL"'
+        structured = service._parse_cv_structure_response(response)
+        self.assertEqual(structured["contact_info"]["name"], "Nour")
+        self.assertEqual(structured["skills"], ["Python", "SQL"])
+        self.assertEqual(service._parse_skills_response('Compétences : ["Python", "SQL",] fin'), ["Python", "SQL"])
+
+
+class TestLocalMicroBatching(unittest.TestCase):
+    """Test cases for the micro-batching of local model prompts."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.service = make_service("local", LLM_LOCAL_BATCH_WAIT_MS="50")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.service.local_batcher.close()
+
+    def submit_concurrently(self, submit, values):
+        results = {}
+        threads = [threading.Thread(target=lambda value=value: results.__setitem__(value, submit(value)))
+                   for value in values]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return [results[value] for value in values]
+
+    def test_concurrent_submissions_share_batches(self):
+        """Concurrent values are run in batches of at most max_batch_size, each caller getting its result."""
+        batches = []
+
+        def run_batch(values):
+            batches.append(list(values))
+            time.sleep(0.05)
+            return [value * 2 for value in values]
+
+        batcher = MicroBatcher(run_batch, max_batch_size=4, max_wait_ms=100)
+        try:
+            self.assertEqual(self.submit_concurrently(batcher.submit, range(10)), [value * 2 for value in range(10)])
+        finally:
+            batcher.close()
+        self.assertLess(len(batches), 10)
+        self.assertTrue(all(len(batch) <= 4 for batch in batches))
+        stats = batcher.stats()
+        self.assertEqual((stats["batches"], stats["items"]), (len(batches), 10))
+        self.assertGreater(stats["mean_batch_size"], 1)
+
+    def test_errors_reach_the_right_callers(self):
+        """A failed batch fails all its callers; an exception result fails only its own."""
+        def run_batch(values):
+            if "panne" in values:
+                raise Exception("generate failed")
+            return [Exception(f"vide: {value}") if value == "vide" else value.upper() for value in values]
+
+        batcher = MicroBatcher(run_batch, max_batch_size=2, max_wait_ms=50)
+        outcomes = []
+
+        def submit(value):
+            try:
+                return batcher.submit(value)
+            except Exception as e:
+                return str(e)
+
+        try:
+            outcomes = self.submit_concurrently(submit, ["ok", "vide"]) + [submit("panne")]
+        finally:
+            batcher.close()
+        self.assertEqual(outcomes, ["OK", "vide: vide", "generate failed"])
+        self.assertEqual(batcher.stats()["failed_batches"], 1)
+
+    def test_local_calls_run_as_one_pipeline_batch(self):
+        """Concurrent local prompts reach the pipeline as one padded batch."""
+        calls = []
+
+        class Pipeline:
+            tokenizer = type("Tokenizer", (), {"eos_token_id": 0})()
+
+            def __call__(self, prompts, batch_size, **kwargs):
+                calls.append((list(prompts), batch_size))
+                return [[{"generated_text": f"{prompt} réponse {i}"}] for i, prompt in enumerate(prompts)]
+
+        self.service.local_pipeline = Pipeline()
+        responses = self.submit_concurrently(self.service._call_local_llama, ["a", "b", "c"])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][1], 3)
+        self.assertEqual(sorted(responses), ["réponse 0", "réponse 1", "réponse 2"])
+        self.assertEqual(self.service.local_batch_stats()["max_seen_batch_size"], 3)
+
+    @unittest.skipUnless(importlib.util.find_spec("torch") and importlib.util.find_spec("transformers"),
+                         "torch and transformers are not installed")
+    def test_tiny_random_model_generates_in_batches(self):
+        """A tiny randomly initialized causal LM on CPU serves concurrent prompts in batches."""
+        import torch
+        from tokenizers import Tokenizer, models, pre_tokenizers
+        from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast, pipeline
+
+        words = ["<pad>", "<unk>", "###", "Human:", "Assistant:", "cv", "python", "sql", "data", "analyste"]
+        backend = Tokenizer(models.WordLevel({word: i for i, word in enumerate(words)}, unk_token="<unk>"))
+        backend.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+        tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, pad_token="<pad>",
+                                            unk_token="<unk>", eos_token="<pad>")
+        tokenizer.padding_side = "left"
+        torch.manual_seed(0)
+        model = GPT2LMHeadModel(GPT2Config(vocab_size=len(words), n_positions=64, n_embd=16, n_layer=1, n_head=2,
+                                           bos_token_id=0, eos_token_id=0))
+        self.service.local_pipeline = pipeline("text-generation", model=model, tokenizer=tokenizer, device=-1)
+
+        prompts = ["cv python", "sql data analyste", "python", "data sql python cv"]
+        with patch.dict(self.service.SAMPLING, {"local": {"max_new_tokens": 4, "do_sample": False}}):
+            responses = self.submit_concurrently(self.service._call_local_llama, prompts)
+        self.assertTrue(all(isinstance(response, str) for response in responses))
+        self.assertGreater(self.service.local_batch_stats()["max_seen_batch_size"], 1)
+
+
+class TestLocalPrefixCache(unittest.TestCase):
+    """Test cases for the reuse of the structuring prompt's key/value cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.service = make_service("local", LLM_LOCAL_BATCH_SIZE="1")
+        self.pipeline_prompts = []
+
+        class Pipeline:
+            tokenizer = type("Tokenizer", (), {"eos_token_id": 0})()
+            model = object()
+
+            def __call__(pipeline, prompts, batch_size, **kwargs):
+                self.pipeline_prompts.extend(prompts)
+                return [[{"generated_text": f"{prompt} pipeline"}] for prompt in prompts]
+
+        self.service.local_pipeline = Pipeline()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.service.local_batcher.close()
+
+    def test_structuring_prompts_use_the_prefix_cache(self):
+        """Prompts starting with the structuring instructions are generated together from the cache."""
+        structuring = [self.service._create_cv_structuring_prompt(text) for text in ("Nour\nPython", "Sami\nSQL")]
+        self.assertTrue(structuring[0].startswith(llama_service.CV_STRUCTURING_INSTRUCTIONS))
+        cache = self.service._local_prefix_cache()
+        self.assertEqual(cache.prefixes[0].text, "### Human: " + llama_service.CV_STRUCTURING_INSTRUCTIONS)
+
+        batches = []
+
+        def generate_batch(texts, **kwargs):
+            batches.append(texts)
+            return [" cache " if cache.match(text) else None for text in texts]
+
+        with patch.object(cache, "generate_batch", side_effect=generate_batch):
+            responses = self.service._run_local_batch([structuring[0], "Recommande des postes", structuring[1]])
+
+        self.assertEqual(responses, ["cache", "pipeline", "cache"])
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(self.pipeline_prompts, ["### Human: Recommande des postes\n### Assistant:"])
+
+    def test_prefix_cache_failure_falls_back_to_pipeline(self):
+        """A prefix cache that fails is disabled and its prompts go through the pipeline."""
+        structuring = self.service._create_cv_structuring_prompt("Nour")
+        cache = self.service._local_prefix_cache()
+        with patch.object(cache, "generate_batch", side_effect=ImportError("no DynamicCache")):
+            self.assertEqual(self.service._run_local_batch([structuring]), ["pipeline"])
+        self.assertIsNone(self.service._local_prefix_cache())
+        self.assertEqual(shared_length([1, 2, 3], [1, 2, 4, 5]), 2)
+
+    @unittest.skipUnless(importlib.util.find_spec("torch") and importlib.util.find_spec("transformers"),
+                         "torch and transformers are not installed")
+    def test_cached_prefix_generates_like_full_prefill(self):
+        """Greedy generation from the cached prefix matches generation from the whole prompt."""
+        import torch
+        from tokenizers import Tokenizer, models, pre_tokenizers
+        from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+        words = ["<pad>", "<unk>", "extract", "the", "cv", "json", "python", "sql", "nour", "data"]
+        backend = Tokenizer(models.WordLevel({word: i for i, word in enumerate(words)}, unk_token="<unk>"))
+        backend.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+        tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, pad_token="<pad>",
+                                            unk_token="<unk>", eos_token="<pad>")
+        torch.manual_seed(0)
+        # Weights large enough for the output to depend on the whole prompt
+        model = GPT2LMHeadModel(GPT2Config(vocab_size=len(words), n_positions=64, n_embd=16, n_layer=2, n_head=2,
+                                           initializer_range=0.5, bos_token_id=0, eos_token_id=0))
+        model.eval()
+        sampling = {"max_new_tokens": 6, "do_sample": False, "pad_token_id": 0}
+
+        def full_prefill(text):
+            input_ids = tokenizer(text, return_tensors="pt")["input_ids"]
+            with torch.no_grad():
+                output = model.generate(input_ids=input_ids, attention_mask=torch.ones_like(input_ids), **sampling)
+            return tokenizer.decode(output[0, input_ids.shape[1]:], skip_special_tokens=True)
+
+        cache = PrefixKVCache(model, tokenizer, ["extract the cv json "])
+        texts = ["extract the cv json nour python sql", "extract the cv json data"]
+        for text in texts:
+            self.assertEqual(cache.generate(text, **sampling), full_prefill(text))
+        self.assertIsNone(cache.generate("python sql", **sampling))
+        self.assertEqual(cache.stats()["reused_tokens"], 8)
+
+        # Suffixes of different lengths generated in one batch from one copy of the cache
+        self.assertEqual(cache.generate_batch(texts + ["python sql"], **sampling),
+                         [full_prefill(text) for text in texts] + [None])
+        self.assertEqual(cache.stats()["reused_tokens"], 16)
+
+        # A prompt that shares only part of the prefix's tokens reuses that part
+        cache = PrefixKVCache(model, tokenizer, ["extract the cv js"])
+        text = "extract the cv json nour"
+        self.assertEqual(cache.generate(text, **sampling), full_prefill(text))
+        self.assertEqual(cache.stats()["reused_tokens"], 3)
+        texts = [text, "extract the cv js"]
+        self.assertEqual(cache.generate_batch(texts, **sampling), [full_prefill(text) for text in texts])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of extracted CV text.
+Entries are keyed by the SHA-256 of the document bytes, its format and the
+extractor version, so a resubmitted CV skips PDF/DOCX parsing entirely.
+A size-bounded on-disk store is shared by every process; an optional
+in-process LRU tier serves repeat hits without touching the disk.
+"""
+
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "raw_text")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 128
+
+_ENTRY_SUFFIX = ".txt"
+
+
+class RawTextCache:
+    """Two-tier LRU cache mapping document content to extracted text."""
+
+    def __init__(self, cache_dir: str, version: str,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._disk_bytes = self._scan_disk_bytes()
+
+    def key(self, content: bytes, ext: str) -> str:
+        """Cache key of a document: its bytes, format and the extractor version."""
+        digest = hashlib.sha256(content).hexdigest()
+        return hashlib.sha256(f"{self.version}:{ext.lower()}:{digest}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text for key, or None on a miss."""
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return text
+
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                text = f.read()
+            # Refresh mtime: the disk tier evicts least recently used first
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store text under key in both tiers, evicting old disk entries if needed."""
+        with self._lock:
+            self._remember(key, text)
+
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".entry-", suffix=_ENTRY_SUFFIX, dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._disk_bytes += size
+            over_budget = self._disk_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _remember(self, key: str, text: str) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_entries(self):
+        """(mtime, size, path) of every disk entry, oldest first."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(_ENTRY_SUFFIX) or name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._disk_entries())
+
+    def evict(self) -> int:
+        """Delete least recently used disk entries until the store fits max_bytes.
+
+        The directory is rescanned so entries written by other worker
+        processes are accounted for. Returns the number of entries removed.
+        """
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._disk_bytes = total
+        return removed
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        for _, _, path in self._disk_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = 0
+
+
+def cache_from_env(version: str) -> Optional[RawTextCache]:
+    """Build the cache configured by CV_TEXT_CACHE_* variables.
+
+    CV_TEXT_CACHE_DIR sets the store location, CV_TEXT_CACHE_MAX_MB its size
+    budget and CV_TEXT_CACHE_MEMORY_ENTRIES the in-process tier (0 disables it).
+    Setting CV_TEXT_CACHE_DIR to an empty string disables caching.
+    """
+    cache_dir = os.getenv("CV_TEXT_CACHE_DIR", DEFAULT_CACHE_DIR)
+    if not cache_dir:
+        return None
+    max_mb = float(os.getenv("CV_TEXT_CACHE_MAX_MB", DEFAULT_MAX_BYTES // (1024 * 1024)))
+    memory_entries = int(os.getenv("CV_TEXT_CACHE_MEMORY_ENTRIES", DEFAULT_MEMORY_ENTRIES))
+    return RawTextCache(cache_dir, version, max_bytes=int(max_mb * 1024 * 1024), memory_entries=memory_entries)